@@ -0,0 +1,344 @@
+"""
+Benchmarks of sqlite3_qt against the built-in sqlite3 module.
+
+As tests/test_match.py does for correctness, every workload runs the same function with both
+modules: its result must match, and the ratio of their run times measures the overhead of the Qt
+layer on that path.
+
+    python benchmarks/bench.py                        # all available Qt bindings
+    python benchmarks/bench.py -b PyQt6 -k insert     # one binding, insert workloads only
+    python benchmarks/bench.py -o results.json        # save machine-readable results
+    python benchmarks/bench.py --baseline results.json --tolerance 0.25
+
+Each binding is benchmarked in its own subprocess, selected with the QT_API environment variable.
+The results are written as JSON, one record per (binding, workload), with the best time of each
+module over the repeats, and their ratio. With --baseline, the ratios are compared to those of a
+previous run, and the exit status is 1 if any of them regressed by more than the tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+BINDINGS = ("PyQt6", "PySide6", "PyQt5", "PySide2")
+
+WORKLOADS = {}
+
+
+def workload(func):
+    """Register a workload.
+
+    func(module, n, path) sets up the database and yields the function to be timed, which returns
+    a result to compare between the modules. The code after the yield cleans up."""
+    WORKLOADS[func.__name__] = func
+    return func
+
+
+def _table(module, path, n):
+    con = module.connect(path)
+    con.execute("CREATE TABLE test(id INTEGER PRIMARY KEY, x REAL, name TEXT)")
+    con.executemany(
+        "INSERT INTO test VALUES(?, ?, ?)", ((i, i * 0.5, f"name{i}") for i in range(n))
+    )
+    con.commit()
+    return con
+
+
+@workload
+def single_insert(module, n, path):
+    con = module.connect(path)
+    con.execute("CREATE TABLE test(x, y)")
+
+    def run():
+        for i in range(n):
+            con.execute("INSERT INTO test VALUES(?, ?)", (i, str(i)))
+        con.commit()
+        return con.execute("SELECT count(*) FROM test").fetchone()
+
+    yield run
+    con.close()
+
+
+@workload
+def executemany_insert(module, n, path):
+    con = module.connect(path)
+    con.execute("CREATE TABLE test(x, y)")
+
+    def run():
+        con.executemany("INSERT INTO test VALUES(?, ?)", ((i, str(i)) for i in range(n)))
+        con.commit()
+        return con.execute("SELECT count(*) FROM test").fetchone()
+
+    yield run
+    con.close()
+
+
+@workload
+def point_lookup(module, n, path):
+    con = _table(module, path, n)
+
+    def run():
+        return [
+            con.execute("SELECT name FROM test WHERE id = ?", (i,)).fetchone()
+            for i in range(0, n, 7)
+        ]
+
+    yield run
+    con.close()
+
+
+@workload
+def scan_fetchall(module, n, path):
+    con = _table(module, path, n)
+
+    def run():
+        return con.execute("SELECT * FROM test").fetchall()
+
+    yield run
+    con.close()
+
+
+@workload
+def scan_fetchmany(module, n, path):
+    con = _table(module, path, n)
+
+    def run():
+        cur = con.execute("SELECT * FROM test")
+        rows = []
+        while True:
+            batch = cur.fetchmany(500)
+            if not batch:
+                return rows
+            rows.extend(batch)
+
+    yield run
+    con.close()
+
+
+@workload
+def scan_iterate(module, n, path):
+    con = _table(module, path, n)
+
+    def run():
+        return [row for row in con.execute("SELECT * FROM test")]
+
+    yield run
+    con.close()
+
+
+@workload
+def row_access(module, n, path):
+    con = _table(module, path, n)
+    con.row_factory = module.Row
+
+    def run():
+        return [
+            (row["id"], row["name"], row[1], tuple(row))
+            for row in con.execute("SELECT * FROM test")
+        ]
+
+    yield run
+    con.close()
+
+
+@workload
+def blob_roundtrip(module, n, path):
+    con = module.connect(path)
+    con.execute("CREATE TABLE test(b BLOB)")
+    data = bytes(range(256)) * 64  # 16 KiB
+
+    def run():
+        for _ in range(max(n // 100, 1)):
+            rowid = con.execute("INSERT INTO test VALUES(?)", (data,)).lastrowid
+            blob = con.execute("SELECT b FROM test WHERE rowid = ?", (rowid,)).fetchone()[0]
+            with con.blobopen("test", "b", rowid) as f:
+                f.write(blob[::-1])
+                chunks = [f.read(4096) for _ in range(4)]
+        con.commit()
+        return bytes(blob), chunks
+
+    yield run
+    con.close()
+
+
+@workload
+def blob_chunked_write(module, n, path):
+    con = module.connect(path)
+    con.execute("CREATE TABLE test(b BLOB)")
+    size = n * 1024  # 10 MiB with the default n
+    chunk = bytes(range(256)) * 16  # 4 KiB
+
+    def run():
+        rowid = con.execute("INSERT INTO test VALUES(zeroblob(?))", (size,)).lastrowid
+        with con.blobopen("test", "b", rowid) as f:
+            for _ in range(size // len(chunk)):
+                f.write(chunk)
+        con.commit()
+        with con.blobopen("test", "b", rowid, readonly=True) as f:
+            f.seek(-len(chunk), os.SEEK_END)
+            return len(f), f.read()
+
+    yield run
+    con.close()
+
+
+@workload
+def open_close(module, n, path):
+    module.connect(path).close()
+
+    def run():
+        for _ in range(max(n // 100, 1)):
+            con = module.connect(path)
+            con.execute("SELECT 1").fetchone()
+            con.close()
+
+    yield run
+
+
+def _time(module, func, n, repeat):
+    """Return the best time of the workload and the result of its first run"""
+    best = float("inf")
+    result = None
+    for i in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            gen = func(module, n, os.path.join(tmp, "bench.db"))
+            run = next(gen)
+            t0 = time.perf_counter()
+            res = run()
+            best = min(best, time.perf_counter() - t0)
+            next(gen, None)
+        if i == 0:
+            result = res
+    return best, result
+
+
+def run_workloads(names, n, repeat):
+    """Benchmark the workloads with the Qt binding selected in this process"""
+    import sqlite3_qt
+    from sqlite3_qt import qt_compat
+
+    # QSqlDatabase requires an application instance
+    app = qt_compat.QtCore.QCoreApplication.instance() or qt_compat.QtCore.QCoreApplication([])
+
+    records = []
+    for name in names:
+        func = WORKLOADS[name]
+        t_std, res_std = _time(sqlite3, func, n, repeat)
+        t_qt, res_qt = _time(sqlite3_qt, func, n, repeat)
+        if res_std != res_qt:
+            raise AssertionError(f"{name}: sqlite3 and sqlite3_qt results differ")
+        records.append(
+            {
+                "binding": sqlite3_qt.QT_API,
+                "qt_version": qt_compat.QtCore.qVersion(),
+                "workload": name,
+                "n": n,
+                "repeat": repeat,
+                "sqlite3": t_std,
+                "sqlite3_qt": t_qt,
+                "ratio": t_qt / t_std,
+            }
+        )
+    return records
+
+
+def available_bindings():
+    return [b for b in BINDINGS if importlib.util.find_spec(b) is not None]
+
+
+def run_binding(binding, args):
+    """Benchmark in a subprocess using the given Qt binding"""
+    cmd = [sys.executable, __file__, "--child", "-n", str(args.n), "-r", str(args.repeat)]
+    for k in args.workloads:
+        cmd += ["-k", k]
+    env = dict(os.environ, QT_API=binding)
+    out = subprocess.run(cmd, env=env, check=True, stdout=subprocess.PIPE, text=True).stdout
+    return json.loads(out)
+
+
+def compare(records, baseline, tolerance):
+    """Report the workloads whose ratio regressed beyond tolerance from the baseline records"""
+    base = {(r["binding"], r["workload"]): r["ratio"] for r in baseline}
+    regressions = []
+    for r in records:
+        ratio = base.get((r["binding"], r["workload"]))
+        if ratio is not None and r["ratio"] > ratio * (1 + tolerance):
+            regressions.append((r["binding"], r["workload"], ratio, r["ratio"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "-b", "--binding", action="append", choices=BINDINGS, help="Qt binding(s) to benchmark"
+    )
+    parser.add_argument(
+        "-k",
+        "--workload",
+        dest="workloads",
+        action="append",
+        default=[],
+        help="run the workloads whose name contains this string",
+    )
+    parser.add_argument("-n", type=int, default=10000, help="number of rows (default: 10000)")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="repeats (default: 5)")
+    parser.add_argument("-o", "--output", help="write the JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare to")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative increase of the ratios over the baseline (default: 0.2)",
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    names = [w for w in WORKLOADS if not args.workloads or any(k in w for k in args.workloads)]
+    if args.child:
+        json.dump(run_workloads(names, args.n, args.repeat), sys.stdout)
+        return 0
+
+    bindings = args.binding or available_bindings()
+    if not bindings:
+        parser.error("no Qt binding is installed")
+    records = []
+    for binding in bindings:
+        records.extend(run_binding(binding, args))
+
+    print(f"{'binding':8} {'workload':20} {'sqlite3':>10} {'sqlite3_qt':>10} {'ratio':>7}")
+    for r in records:
+        print(
+            f"{r['binding']:8} {r['workload']:20} {r['sqlite3']:10.4f} {r['sqlite3_qt']:10.4f}"
+            f" {r['ratio']:7.2f}"
+        )
+
+    results = {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "results": records,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(records, json.load(f)["results"], args.tolerance)
+        for binding, name, old, new in regressions:
+            print(f"regression: {binding} {name} ratio {old:.2f} -> {new:.2f}", file=sys.stderr)
+        return int(bool(regressions))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -33,6 +33,7 @@ its execute() method to perform SQL queries:
 __version__ = '0.1.0'
 
 from .dbapi2 import *
+from . import dbapi2 as _dbapi2
 
 
 
@@ -47,4 +48,8 @@ def __getattr__(name):
         """)
         warnings.warn(msg, DeprecationWarning, stacklevel=2)
         return str
+    # resolved on first use, to defer loading Qt
+    if name in ("sqlite_version", "sqlite_version_info", *_dbapi2._QT_ATTRS):
+        value = globals()[name] = getattr(_dbapi2, name)
+        return value
     raise AttributeError(f"module 'sqlite3' has no attribute '{name}'")
@@ -0,0 +1,365 @@
+"""
+Access to the SQLite C API behind the connections of the QSQLITE driver, through ctypes.
+
+QSqlDriver.handle() gives the sqlite3* handle of a connection, but the functions to operate on it
+must come from the very SQLite library the QSQLITE plugin uses. They are looked up in the plugin
+and its dependencies, so they are found when Qt is built to use the system SQLite library (e.g.,
+Linux distributions and conda), but not when the plugin embeds its own copy without exporting it
+(e.g., the PyQt and PySide wheels). PySide does not expose QSqlDriver.handle().
+"""
+
+from __future__ import annotations
+
+import ctypes
+from ctypes import (
+    CFUNCTYPE,
+    POINTER,
+    c_char_p,
+    c_double,
+    c_int,
+    c_int64,
+    c_void_p,
+)
+import glob
+from itertools import count
+import os
+from sqlite3 import OperationalError
+
+from typing_extensions import Any, Callable, Dict
+
+from . import qt_compat
+
+SQLITE_OK = 0
+SQLITE_UTF8 = 1
+SQLITE_DETERMINISTIC = 0x800
+
+SQLITE_INTEGER = 1
+SQLITE_FLOAT = 2
+SQLITE_TEXT = 3
+SQLITE_BLOB = 4
+SQLITE_NULL = 5
+
+SQLITE_TRANSIENT = c_void_p(-1)
+
+_xFunc = CFUNCTYPE(None, c_void_p, c_int, POINTER(c_void_p))
+_xFinal = CFUNCTYPE(None, c_void_p)
+_xCompare = CFUNCTYPE(c_int, c_void_p, c_int, c_void_p, c_int, c_void_p)
+_xProgress = CFUNCTYPE(c_int, c_void_p)
+
+
+def _find_library() -> ctypes.CDLL | None:
+    """Return the loaded QSQLITE plugin if the SQLite C API can be resolved through it"""
+    for path in qt_compat.QtCore.QCoreApplication.libraryPaths():
+        for file in glob.glob(os.path.join(path, "sqldrivers", "*qsqlite*")):
+            try:
+                lib = ctypes.CDLL(file)
+            except OSError:
+                continue
+            if hasattr(lib, "sqlite3_create_function_v2"):
+                return lib
+    return None
+
+
+_api: SQLiteAPI | None = None
+_api_resolved = False
+
+
+def api() -> SQLiteAPI | None:
+    """Return the SQLite C API of the QSQLITE driver, or None if it cannot be accessed"""
+    global _api, _api_resolved
+    if not _api_resolved:
+        _api_resolved = True
+        if qt_compat.QT_API in (qt_compat.QT_API_PYQT6, qt_compat.QT_API_PYQT5):
+            lib = _find_library()
+            if lib is not None:
+                _api = SQLiteAPI(lib)
+    return _api
+
+
+def _address(h: Any) -> int | None:
+    if hasattr(h, "value") and not isinstance(h, int):  # QVariant
+        h = h.value()
+    return int(h) if h else None
+
+
+def handle(database: qt_compat.QtSql.QSqlDatabase) -> int | None:
+    """Return the address of the sqlite3 structure of an open Qt connection"""
+    return _address(database.driver().handle())
+
+
+def statement_handle(query: qt_compat.QtSql.QSqlQuery) -> int | None:
+    """Return the address of the sqlite3_stmt structure of a prepared Qt query"""
+    result = query.result()
+    return None if result is None else _address(result.handle())
+
+
+class SQLiteAPI:
+    """The functions of the SQLite C API used to register user-defined functions, and to interrupt
+    statements"""
+
+    def __init__(self, lib: ctypes.CDLL):
+        self._lib = lib
+
+        def bind(name, restype, *argtypes):
+            f = getattr(lib, name)
+            f.restype = restype
+            f.argtypes = argtypes
+            return f
+
+        # db, name, narg, flags, user data, callbacks..., destructor
+        function_args = (c_void_p, c_char_p, c_int, c_int, c_void_p)
+        bind("sqlite3_create_function_v2", c_int, *function_args, _xFunc, _xFunc, _xFinal, c_void_p)
+        bind(
+            "sqlite3_create_window_function",
+            c_int,
+            *function_args,
+            *(_xFunc, _xFinal, _xFinal, _xFunc, c_void_p),
+        )
+        bind(
+            "sqlite3_create_collation_v2",
+            c_int,
+            *(c_void_p, c_char_p, c_int, c_void_p, _xCompare, c_void_p),
+        )
+        bind("sqlite3_errmsg", c_char_p, c_void_p)
+        bind("sqlite3_column_decltype", c_char_p, c_void_p, c_int)
+        bind("sqlite3_interrupt", None, c_void_p)
+        bind("sqlite3_progress_handler", None, c_void_p, c_int, _xProgress, c_void_p)
+        bind("sqlite3_aggregate_context", c_void_p, c_void_p, c_int)
+        bind("sqlite3_value_type", c_int, c_void_p)
+        bind("sqlite3_value_int64", c_int64, c_void_p)
+        bind("sqlite3_value_double", c_double, c_void_p)
+        bind("sqlite3_value_text", c_void_p, c_void_p)
+        bind("sqlite3_value_blob", c_void_p, c_void_p)
+        bind("sqlite3_value_bytes", c_int, c_void_p)
+        bind("sqlite3_result_null", None, c_void_p)
+        bind("sqlite3_result_int64", None, c_void_p, c_int64)
+        bind("sqlite3_result_double", None, c_void_p, c_double)
+        bind("sqlite3_result_text", None, c_void_p, c_char_p, c_int, c_void_p)
+        bind("sqlite3_result_blob", None, c_void_p, c_char_p, c_int, c_void_p)
+        bind("sqlite3_result_error", None, c_void_p, c_char_p, c_int)
+
+        self._instances: Dict[int, Any] = {}  # aggregate instances by context key
+        self._keys = count(1)
+
+    def column_decltypes(self, stmt: int, ncols: int) -> tuple:
+        """Return the declared type of each result column of a statement, or None"""
+        decltype = self._lib.sqlite3_column_decltype
+        types = (decltype(stmt, i) for i in range(ncols))
+        return tuple(None if t is None else t.decode() for t in types)
+
+    def interrupt(self, db: int):
+        """Abort the statements running on a connection, from any thread"""
+        self._lib.sqlite3_interrupt(db)
+
+    def set_progress_handler(
+        self, db: int, n: int, handler: Callable[[], bool] | None
+    ) -> tuple | None:
+        """Set the progress handler, called every n virtual machine instructions, and return the
+        callbacks to keep alive. The statement is interrupted if handler returns True."""
+        if handler is None:
+            self._lib.sqlite3_progress_handler(db, 0, _xProgress(), None)
+            return None
+        x_progress = _xProgress(lambda _: 1 if handler() else 0)
+        self._lib.sqlite3_progress_handler(db, n, x_progress, None)
+        return (x_progress,)
+
+    def _args(self, argc: int, argv) -> list:
+        lib = self._lib
+        args = []
+        for i in range(argc):
+            v = argv[i]
+            t = lib.sqlite3_value_type(v)
+            if t == SQLITE_INTEGER:
+                args.append(lib.sqlite3_value_int64(v))
+            elif t == SQLITE_FLOAT:
+                args.append(lib.sqlite3_value_double(v))
+            elif t == SQLITE_TEXT:
+                p = lib.sqlite3_value_text(v)
+                args.append(ctypes.string_at(p, lib.sqlite3_value_bytes(v)).decode())
+            elif t == SQLITE_BLOB:
+                n = lib.sqlite3_value_bytes(v)
+                args.append(ctypes.string_at(lib.sqlite3_value_blob(v), n) if n else b"")
+            else:
+                args.append(None)
+        return args
+
+    def _result(self, ctx: int, value: Any):
+        lib = self._lib
+        if value is None:
+            lib.sqlite3_result_null(ctx)
+        elif isinstance(value, int):
+            lib.sqlite3_result_int64(ctx, value)
+        elif isinstance(value, float):
+            lib.sqlite3_result_double(ctx, value)
+        elif isinstance(value, str):
+            data = value.encode()
+            lib.sqlite3_result_text(ctx, data, len(data), SQLITE_TRANSIENT)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            data = bytes(value)
+            lib.sqlite3_result_blob(ctx, data, len(data), SQLITE_TRANSIENT)
+        else:
+            raise TypeError(f"unsupported return type: {type(value).__name__}")
+
+    def _error(self, ctx: int, msg: str, report: Callable[[], None]):
+        report()
+        self._lib.sqlite3_result_error(ctx, msg.encode(), -1)
+
+    def _check(self, db: int, rc: int):
+        if rc != SQLITE_OK:
+            raise OperationalError(self._lib.sqlite3_errmsg(db).decode())
+
+    def _instance(self, ctx: int, factory: Callable[[], Any] | None) -> tuple[int, Any]:
+        """Return the key and the aggregate instance of a context, creating it if factory is
+        given, or (0, None)"""
+        p = self._lib.sqlite3_aggregate_context(ctx, 8 if factory else 0)
+        if not p:
+            return 0, None
+        slot = ctypes.cast(p, POINTER(c_int64))
+        key = slot[0]
+        if not key:
+            if factory is None:
+                return 0, None
+            key = slot[0] = next(self._keys)
+            self._instances[key] = factory()
+        return key, self._instances[key]
+
+    def create_function(
+        self,
+        db: int,
+        name: str,
+        narg: int,
+        func: Callable | None,
+        deterministic: bool,
+        report: Callable[[], None],
+    ) -> tuple | None:
+        """Register a scalar function, and return the callbacks to keep alive"""
+        flags = SQLITE_UTF8 | (SQLITE_DETERMINISTIC if deterministic else 0)
+        x_func = _xFunc()
+        if func is not None:
+
+            def call(ctx, argc, argv):
+                try:
+                    self._result(ctx, func(*self._args(argc, argv)))
+                except BaseException:
+                    self._error(ctx, "user-defined function raised exception", report)
+
+            x_func = _xFunc(call)
+        rc = self._lib.sqlite3_create_function_v2(
+            db, name.encode(), narg, flags, None, x_func, _xFunc(), _xFinal(), None
+        )
+        self._check(db, rc)
+        return None if func is None else (x_func,)
+
+    def _aggregate_callbacks(self, aggregate_class: Callable, report: Callable[[], None]):
+        def factory():
+            try:
+                return aggregate_class()
+            except BaseException:
+                report()
+                return None
+
+        def step(ctx, argc, argv):
+            _, obj = self._instance(ctx, factory)
+            if obj is None:
+                self._error(ctx, "user-defined aggregate's '__init__' method raised error", report)
+                return
+            try:
+                obj.step(*self._args(argc, argv))
+            except BaseException:
+                self._error(ctx, "user-defined aggregate's 'step' method raised error", report)
+
+        def inverse(ctx, argc, argv):
+            _, obj = self._instance(ctx, factory)
+            try:
+                obj.inverse(*self._args(argc, argv))
+            except BaseException:
+                self._error(ctx, "user-defined aggregate's 'inverse' method raised error", report)
+
+        def value(ctx):
+            _, obj = self._instance(ctx, factory)
+            try:
+                self._result(ctx, obj.value())
+            except BaseException:
+                self._error(ctx, "user-defined aggregate's 'value' method raised error", report)
+
+        def final(ctx):
+            key, obj = self._instance(ctx, None)
+            if not key:  # no row, e.g., of an empty table
+                obj = factory()
+            else:
+                del self._instances[key]
+            if obj is None:
+                self._error(ctx, "user-defined aggregate's '__init__' method raised error", report)
+                return
+            try:
+                self._result(ctx, obj.finalize())
+            except BaseException:
+                self._error(ctx, "user-defined aggregate's 'finalize' method raised error", report)
+
+        return step, inverse, value, final
+
+    def create_aggregate(
+        self,
+        db: int,
+        name: str,
+        narg: int,
+        aggregate_class: Callable | None,
+        deterministic: bool,
+        report: Callable[[], None],
+    ) -> tuple | None:
+        """Register an aggregate function, and return the callbacks to keep alive"""
+        flags = SQLITE_UTF8 | (SQLITE_DETERMINISTIC if deterministic else 0)
+        callbacks = (_xFunc(), _xFinal())
+        if aggregate_class is not None:
+            step, _, _, final = self._aggregate_callbacks(aggregate_class, report)
+            callbacks = (_xFunc(step), _xFinal(final))
+        rc = self._lib.sqlite3_create_function_v2(
+            db, name.encode(), narg, flags, None, _xFunc(), *callbacks, None
+        )
+        self._check(db, rc)
+        return None if aggregate_class is None else callbacks
+
+    def create_window_function(
+        self,
+        db: int,
+        name: str,
+        narg: int,
+        aggregate_class: Callable | None,
+        deterministic: bool,
+        report: Callable[[], None],
+    ) -> tuple | None:
+        """Register an aggregate window function, and return the callbacks to keep alive"""
+        flags = SQLITE_UTF8 | (SQLITE_DETERMINISTIC if deterministic else 0)
+        callbacks = (_xFunc(), _xFinal(), _xFinal(), _xFunc())
+        if aggregate_class is not None:
+            step, inverse, value, final = self._aggregate_callbacks(aggregate_class, report)
+            callbacks = (_xFunc(step), _xFinal(final), _xFinal(value), _xFunc(inverse))
+        rc = self._lib.sqlite3_create_window_function(
+            db, name.encode(), narg, flags, None, *callbacks, None
+        )
+        self._check(db, rc)
+        return None if aggregate_class is None else callbacks
+
+    def create_collation(
+        self, db: int, name: str, callback: Callable | None, report: Callable[[], None]
+    ) -> tuple | None:
+        """Register a collation, and return the callbacks to keep alive"""
+        x_compare = _xCompare()
+        if callback is not None:
+
+            def compare(_, n1, p1, n2, p2):
+                a = ctypes.string_at(p1, n1).decode()
+                b = ctypes.string_at(p2, n2).decode()
+                try:
+                    res = callback(a, b)
+                    return 1 if res > 0 else -1 if res < 0 else 0
+                except BaseException:
+                    report()
+                    return 0
+
+            x_compare = _xCompare(compare)
+        rc = self._lib.sqlite3_create_collation_v2(
+            db, name.encode(), SQLITE_UTF8, None, x_compare, None
+        )
+        self._check(db, rc)
+        return None if callback is None else (x_compare,)
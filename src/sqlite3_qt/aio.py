@@ -0,0 +1,295 @@
+"""
+asyncio interface to sqlite3_qt.
+
+Each AsyncConnection owns a dedicated worker thread, which opens the underlying Connection (and
+its QSqlDatabase) and runs every operation on it in submission order. Coroutines awaiting the
+same connection thus pipeline their requests through the worker without blocking the event loop:
+
+    from sqlite3_qt import aio
+
+    async def main():
+        con = await aio.connect("data.db")
+        cur = await con.execute("SELECT x, y FROM points")
+        async for row in cur:  # rows are fetched from the worker in batches
+            ...
+        await con.close()
+
+The Qt objects of a connection may only be used and freed in the thread of the connection. The
+underlying Connection and Cursor objects are thus only referenced through a box, emptied by the
+worker thread when they are closed or their wrapper is garbage-collected, so they are freed there.
+An AsyncConnection which is not closed is closed in the same way, and its worker thread stopped,
+when it is garbage-collected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from typing_extensions import Any, Callable, Iterable, List, Optional, Self, TextIO
+
+from . import dbapi2
+from .dbapi2 import Connection, Cursor, ProgrammingError
+
+__all__ = ["connect", "AsyncConnection", "AsyncCursor"]
+
+
+async def connect(database: Any, *args, **kwargs) -> AsyncConnection:
+    """Open a connection to an SQLite database in a new worker thread.
+
+    Takes the same arguments as sqlite3_qt.connect().
+
+    :return: opened database connection
+    :rtype: AsyncConnection
+    """
+    executor = ThreadPoolExecutor(1, thread_name_prefix="sqlite3_qt.aio")
+    loop = asyncio.get_running_loop()
+    try:
+        con = await loop.run_in_executor(
+            executor, partial(dbapi2.connect, database, *args, **kwargs)
+        )
+    except BaseException:
+        executor.shutdown(wait=False)
+        raise
+    return AsyncConnection(executor, con)
+
+
+def _remove_connection(ref: list):
+    """Close the connection in ref in the worker thread, and free it there"""
+    ref.pop()._remove()
+
+
+def _release_cursor(ref: list):
+    """Close the cursor in ref in the worker thread, and free it there"""
+    ref.pop().close()
+
+
+def _call_cursor(ref: list, method: str, *args) -> Any:
+    """Call the method of the cursor in ref in the worker thread and snapshot its attributes"""
+    cur = ref[0]
+    res = getattr(cur, method)(*args)
+    if res is cur:
+        res = None  # only referenced from the worker thread
+    return res, cur.description, cur.rowcount, cur.lastrowid
+
+
+def _finalize_connection(executor: ThreadPoolExecutor, ref: list):
+    try:
+        if ref:
+            executor.submit(_remove_connection, ref)
+    except RuntimeError:
+        pass  # the interpreter is exiting
+    executor.shutdown(wait=False)
+
+
+def _finalize_cursor(executor: ThreadPoolExecutor, ref: list):
+    try:
+        executor.submit(_release_cursor, ref)
+    except RuntimeError:
+        pass  # the connection is closed, and the worker thread stopped
+
+
+class AsyncConnection:
+    """Asynchronous wrapper of a Connection running in its own worker thread.
+
+    Use connect() to create an instance."""
+
+    def __init__(self, executor: ThreadPoolExecutor, connection: Connection):
+        self._executor = executor
+        self._ref = [connection]
+        self._closed = False
+        self._finalizer = weakref.finalize(self, _finalize_connection, executor, self._ref)
+
+    async def _run(self, func: Callable, *args) -> Any:
+        if self._closed:
+            raise ProgrammingError("Cannot operate on a closed database.")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args))
+
+    @property
+    def connection(self) -> Connection:
+        """The underlying Connection. It may only be used from the worker thread, e.g., in a
+        function passed to run()."""
+        if not self._ref:
+            raise ProgrammingError("Cannot operate on a closed database.")
+        return self._ref[0]
+
+    async def run(self, func: Callable[[Connection], Any]) -> Any:
+        """Call func with the underlying Connection in the worker thread, and return its result."""
+        return await self._run(func, self.connection)
+
+    async def cursor(self) -> AsyncCursor:
+        """Create and return an AsyncCursor object."""
+        return AsyncCursor(self, await self._run(self.connection.cursor))
+
+    async def execute(self, sql: str, parameters: Any = None) -> AsyncCursor:
+        """Create a new cursor and call execute() on it with the given sql and parameters.
+
+        Return the new cursor object."""
+        cursor = await self.cursor()
+        await cursor.execute(sql, parameters)
+        return cursor
+
+    async def executemany(self, sql: str, parameters: Iterable[Any]) -> AsyncCursor:
+        """Create a new cursor and call executemany() on it with the given sql and parameters.
+
+        Return the new cursor object."""
+        cursor = await self.cursor()
+        await cursor.executemany(sql, parameters)
+        return cursor
+
+    async def executescript(self, sql_script: str | TextIO) -> AsyncCursor:
+        """Create a new cursor and call executescript() on it with the given sql_script.
+
+        Return the new cursor object."""
+        cursor = await self.cursor()
+        await cursor.executescript(sql_script)
+        return cursor
+
+    async def commit(self):
+        """Commit any pending transaction to the database."""
+        await self._run(self.connection.commit)
+
+    async def rollback(self):
+        """Roll back to the start of any pending transaction."""
+        await self._run(self.connection.rollback)
+
+    async def close(self):
+        """Close the database connection and stop the worker thread."""
+        if self._closed:
+            return
+        try:
+            await self._run(_remove_connection, self._ref)
+        finally:
+            self._closed = True
+            self._finalizer()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        if type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+        return False
+
+
+class AsyncCursor:
+    """Asynchronous wrapper of a Cursor.
+
+    Iterating with ``async for`` fetches prefetch rows at a time from the worker thread."""
+
+    prefetch: int = 256
+    """The number of rows fetched from the worker thread at once by ``async for``"""
+
+    def __init__(self, conn: AsyncConnection, cursor: Cursor):
+        self._conn = conn
+        self._ref = [cursor]
+        self._rows = deque()  # prefetched rows
+        self._description = None
+        self._rowcount = -1
+        self._lastrowid = None
+        weakref.finalize(self, _finalize_cursor, conn._executor, self._ref)
+
+    @property
+    def _cursor(self) -> Cursor:
+        return self._ref[0]
+
+    async def _call(self, method: str, *args) -> Any:
+        res, self._description, self._rowcount, self._lastrowid = await self._conn._run(
+            _call_cursor, self._ref, method, *args
+        )
+        return res
+
+    @property
+    def connection(self) -> AsyncConnection:
+        """The AsyncConnection the cursor belongs to"""
+        return self._conn
+
+    @property
+    def arraysize(self) -> int:
+        """The number of rows fetched by fetchmany() by default"""
+        return self._cursor.arraysize
+
+    @arraysize.setter
+    def arraysize(self, value: int):
+        self._cursor.arraysize = value
+
+    @property
+    def description(self) -> tuple | None:
+        """The column names of the last query (see Cursor.description)"""
+        return self._description
+
+    @property
+    def rowcount(self) -> int:
+        """The number of modified rows (see Cursor.rowcount)"""
+        return self._rowcount
+
+    @property
+    def lastrowid(self) -> int | None:
+        """The row id of the last inserted row (see Cursor.lastrowid)"""
+        return self._lastrowid
+
+    async def execute(self, sql: str, parameters: Any = None) -> Self:
+        """Execute a single SQL statement in the worker thread (see Cursor.execute())"""
+        self._rows.clear()
+        await self._call("execute", sql, parameters)
+        return self
+
+    async def executemany(self, sql: str, seq_of_parameters: Iterable[Any]) -> Self:
+        """Execute a DML statement for every item of seq_of_parameters in the worker thread (see
+        Cursor.executemany())"""
+        self._rows.clear()
+        await self._call("executemany", sql, seq_of_parameters)
+        return self
+
+    async def executescript(self, sql_script: str | TextIO) -> Self:
+        """Execute the SQL statements in sql_script in the worker thread (see
+        Cursor.executescript())"""
+        self._rows.clear()
+        await self._call("executescript", sql_script)
+        return self
+
+    async def fetchone(self) -> Any:
+        """Return the next row, or None if no more data is available."""
+        if self._rows:
+            return self._rows.popleft()
+        return await self._call("fetchone")
+
+    async def fetchmany(self, size: Optional[int] = 0) -> List[Any]:
+        """Return the next set of rows as a list (see Cursor.fetchmany())"""
+        if not size or size <= 0:
+            size = self.arraysize
+        rows = self._take(size)
+        if len(rows) < size:
+            rows.extend(await self._call("fetchmany", size - len(rows)))
+        return rows
+
+    async def fetchall(self) -> List[Any]:
+        """Return all (remaining) rows as a list."""
+        rows = self._take(len(self._rows))
+        rows.extend(await self._call("fetchall"))
+        return rows
+
+    def _take(self, n: int) -> List[Any]:
+        rows = self._rows
+        return [rows.popleft() for _ in range(min(n, len(rows)))]
+
+    async def close(self):
+        """Close the cursor."""
+        self._rows.clear()
+        await self._call("close")
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> Any:
+        if not self._rows:
+            self._rows.extend(await self._call("fetchmany", self.prefetch))
+            if not self._rows:
+                raise StopAsyncIteration
+        return self._rows.popleft()
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
 from sqlite3.dbapi2 import *
-from sqlite3.dbapi2 import connect as _connect
+from sqlite3.dbapi2 import connect as _connect, adapters, converters, PrepareProtocol
+import os
 from os import PathLike
-from functools import lru_cache
-
-from .qt_compat import QtSql, QT_API, QtCore
+from functools import partial
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from itertools import count, islice
+import threading
+import re
+import sys
+from time import perf_counter, sleep as _sleep
+import tempfile
+import traceback
+
+from . import _capi, qt_compat
 
 from typing_extensions import (
     Self,
@@ -20,6 +30,7 @@ from typing_extensions import (
     Iterator,
     Sequence,
     Mapping,
+    TextIO,
 )
 
 # version_info: tuple[int, int, int]
@@ -37,34 +48,546 @@ class Cursor:
     ...
 
 
-def getattr(name):
-    if name in ("sqlite_version_info"):
-        return _sqlite_version(info=True)
-    elif name in ("sqlite_version"):
-        return _sqlite_version()
-    raise AttributeError(f"module '{name}' has no attribute '{name}'")
+StatementCacheInfo = namedtuple(
+    "StatementCacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
 
+StatementEvent = namedtuple(
+    "StatementEvent",
+    ["sql", "nparams", "prepare_time", "exec_time", "fetch_time", "rows", "qt_api"],
+)
+StatementEvent.__doc__ = """Execution profile of an SQL statement, passed to the callback set with
+Connection.set_statement_callback().
+
+nparams is the number of parameter values bound (over all the parameter sets of executemany()).
+The times are in seconds: prepare_time is spent getting the prepared statement (near zero on a
+statement cache hit), exec_time executing it (including its preparation for the statements of
+executescript()), and fetch_time in the fetch methods of the cursor.
+rows is the number of rows fetched from a query, or the rowcount of any other statement. qt_api
+is the Qt binding in use."""
+
+try:
+    LEGACY_TRANSACTION_CONTROL
+except NameError:  # Python < 3.12
+    LEGACY_TRANSACTION_CONTROL = -1
+
+_ISOLATION_LEVELS = ("", "DEFERRED", "IMMEDIATE", "EXCLUSIVE")
+
+PRAGMA_PROFILES: dict[str, dict[str, Any]] = {
+    # fast writes of data which can be reloaded if lost: no syncing, large cache
+    "bulk-load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -262144,  # KiB
+        "temp_store": "MEMORY",
+    },
+    # concurrent readers with a writer: WAL, memory-mapped I/O
+    "read-heavy": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+    },
+    # small page cache, no memory-mapped I/O, temporary tables on disk
+    "low-memory": {
+        "cache_size": -1024,
+        "mmap_size": 0,
+        "temp_store": "FILE",
+    },
+}
+"""The PRAGMA settings applied by the profile argument of connect(), by profile name. Profiles may
+be added or modified."""
+
+# the keyword values of PRAGMAs reading back as integers, in the order of their integer values
+_PRAGMA_KEYWORDS = {
+    "synchronous": ("OFF", "NORMAL", "FULL", "EXTRA"),
+    "temp_store": ("DEFAULT", "FILE", "MEMORY"),
+    "auto_vacuum": ("NONE", "FULL", "INCREMENTAL"),
+    "secure_delete": ("OFF", "ON", "FAST"),
+}
+_PRAGMA_BOOLEANS = {"ON": 1, "TRUE": 1, "YES": 1, "OFF": 0, "FALSE": 0, "NO": 0}
+
+# the first keyword of a statement, after any leading whitespace and comments
+_verb_re = re.compile(r"(?:\s|--[^\n]*(?:\n|$)|/\*.*?(?:\*/|$))*(\w+)", re.DOTALL)
+
+_DML_VERBS = frozenset(("INSERT", "UPDATE", "DELETE", "REPLACE"))
+_TRANSACTION_VERBS = frozenset(("BEGIN", "COMMIT", "END", "ROLLBACK", "SAVEPOINT", "RELEASE"))
+_DDL_VERBS = frozenset(("CREATE", "ALTER", "DROP"))
+
+# the type in a column name such as 'x [timestamp]', and the name of a declared type
+_colname_type_re = re.compile(r"\[([^\[\]]*)\]")
+_decltype_re = re.compile(r"[^ (]*")
+
+# TO and the savepoint name of SAVEPOINT, RELEASE, and ROLLBACK statements
+_savepoint_re = re.compile(
+    r"(?:\s|--[^\n]*(?:\n|$)|/\*.*?(?:\*/|$))*\w+(?:\s+TRANSACTION\b)?(\s+TO\b)?"
+    r"(?:\s+SAVEPOINT\b)?\s*(\"(?:[^\"]|\"\")*\"|`(?:[^`]|``)*`|\[[^\]]*\]|'(?:[^']|'')*'|\w+)?",
+    re.IGNORECASE | re.DOTALL,
+)
 
-@lru_cache(maxsize=None)
-def _sqlite_version(info: bool = False):
-    def query():
-        con = QtSql.QSqlDatabase.addDatabase("QSQLITE", "ver")
-        con.setDatabaseName(":memory:")
-        if not con.open():
-            raise Exception("failed to open")
+
+def _statement_verb(sql: str) -> str:
+    m = _verb_re.match(sql)
+    return m.group(1).upper() if m else ""
+
+
+def _savepoint_name(name: str) -> str:
+    """Unquote a savepoint name and fold its case, as SQLite compares them case-insensitively"""
+    if name[0] in "\"`'":
+        name = name[1:-1].replace(name[0] * 2, name[0])
+    elif name[0] == "[":
+        name = name[1:-1]
+    return name.lower()
+
+
+# parameter placeholders, outside of string literals, identifiers (which may contain $), and
+# comments
+_placeholder_re = re.compile(
+    r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`(?:[^`]|``)*`|\[[^\]]*\]|--[^\n]*|/\*.*?(?:\*/|$)"
+    r"|\w[\w$]*|(\?\d*|[:@$]\w+)",
+    re.DOTALL,
+)
+
+_MAX_VARIABLE_NUMBER = 32766
+
+# QSql.Location values of QSqlQuery.at()
+_BEFORE_FIRST_ROW = -1
+_AFTER_LAST_ROW = -2
+
+
+def _parse_placeholders(sql: str) -> Tuple[str, tuple | None, tuple]:
+    """Parse the parameter placeholders (?, ?NNN, :name, @name, and $name) of sql, numbering the
+    parameters as SQLite does.
+
+    :return: sql with each placeholder replaced by ?, the parameter index of each placeholder in
+             order (None if they are 0, 1, 2...), and the name of each parameter by index,
+             including its prefix (None for a numbered parameter)
+    """
+    positions = []
+    names = []
+    indices = {}
+
+    def substitute(m: re.Match) -> str:
+        p = m.group(1)
+        if p is None:
+            return m.group()
+        if p == "?":
+            i = len(names)
+        elif p[0] == "?":
+            i = int(p[1:]) - 1
+            if not 0 <= i < _MAX_VARIABLE_NUMBER:
+                raise OperationalError(
+                    f"variable number must be between ?1 and ?{_MAX_VARIABLE_NUMBER}"
+                )
+        else:
+            i = indices.get(p)
+            if i is None:
+                i = indices[p] = len(names)
+                names.append(p)
+        names.extend([None] * (i + 1 - len(names)))
+        positions.append(i)
+        return "?"
+
+    qt_sql = _placeholder_re.sub(substitute, sql)
+    if positions == list(range(len(positions))):
+        return qt_sql, None, tuple(names)
+    return qt_sql, tuple(positions), tuple(names)
+
+
+def _parameter_values(names: Sequence[str | None], parameters: Any) -> Sequence:
+    """Return the values of the parameters of a statement by index, checked as sqlite3 does.
+
+    :param names: the names of the parameters by index, from _parse_placeholders()
+    :param parameters: a sequence of values by index, or a mapping of values by name
+    """
+    if isinstance(parameters, Mapping):
+        values = []
+        for i, name in enumerate(names):
+            if name is None:
+                raise ProgrammingError(
+                    f"Binding {i + 1} has no name, but you supplied a dictionary "
+                    "(which has only names)."
+                )
+            try:
+                values.append(parameters[name[1:]])
+            except KeyError:
+                raise ProgrammingError(
+                    f"You did not supply a value for binding parameter {name}."
+                ) from None
+        return values
+    if parameters is None:
+        parameters = ()
+    elif not isinstance(parameters, Sequence):
+        raise ProgrammingError("parameters are of unsupported type")
+    if len(parameters) != len(names):
+        raise ProgrammingError(
+            f"Incorrect number of bindings supplied. The current statement uses {len(names)}, "
+            f"and there are {len(parameters)} supplied."
+        )
+    return parameters
+
+
+def _sql_literal(value: Any) -> str:
+    """Format a bound value as an SQL literal"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "x'" + bytes(value).hex() + "'"
+
+
+def _expand_sql(sql: str, values: Sequence | Mapping) -> str:
+    """Substitute the bound values for the parameter placeholders of sql, as sqlite3_expanded_sql()
+
+    values are the bound values by position, or by name (without the placeholder prefix).
+    Placeholders are numbered as SQLite does, and unbound ones are expanded to NULL.
+    """
+    indices = {}
+    last = 0
+
+    def substitute(m: re.Match) -> str:
+        nonlocal last
+        p = m.group(1)
+        if p is None:
+            return m.group()
+        if p == "?":
+            last += 1
+            i = last
+        elif p[0] == "?":
+            i = int(p[1:])
+            last = max(last, i)
+        else:
+            i = indices.get(p)
+            if i is None:
+                last += 1
+                i = indices[p] = last
+        if isinstance(values, Mapping):
+            value = values.get(p[1:])
+        else:
+            value = values[i - 1] if 0 < i <= len(values) else None
+        return _sql_literal(value)
+
+    return _placeholder_re.sub(substitute, sql)
+
+
+_SCRIPT_CHUNK_SIZE = 1 << 16
+
+# the tokens of an SQL script which may hide or end a statement, and what closes them
+_script_token_re = re.compile(r"[;'\"`\[]|--|/\*")
+_script_token_ends = {"'": "'", '"': '"', "`": "`", "[": "]", "--": "\n", "/*": "*/"}
+
+_blank_re = re.compile(r"(?:\s|--[^\n]*(?:\n|$)|/\*.*?(?:\*/|$))*", re.DOTALL)
+
+
+def _is_blank(sql: str, start: int, end: int) -> bool:
+    """True if sql[start:end] only holds whitespace and comments"""
+    # not fullmatch(), which would extend a comment over the text following it
+    return _blank_re.match(sql, start, end).end() == end
+
+
+def _split_script(
+    script: str | TextIO, chunk_size: int = _SCRIPT_CHUNK_SIZE
+) -> Iterator[str]:
+    """Split an SQL script into its statements.
+
+    A statement ends with a semicolon outside of any string literal, quoted identifier, or
+    comment, which completes it according to complete_statement(), so the statements of a
+    trigger body do not end the CREATE TRIGGER statement. The last statement does not need a
+    terminating semicolon. Blank and comment-only statements are skipped.
+
+    A text file is read chunk_size characters at a time, holding no more than the current
+    statement and one chunk in memory.
+    """
+    if isinstance(script, str):
+        chunks = iter((script,))
+    else:
+        chunks = iter(partial(script.read, chunk_size), "")
+
+    buf = ""
+    start = pos = 0  # start of the current statement and of the text left to scan
+    while True:
+        m = _script_token_re.search(buf, pos)
+        if m is not None:
+            token = m.group()
+            if token == ";":
+                pos = m.end()
+                statement = buf[start:pos]
+                if complete_statement(statement):
+                    if not _is_blank(statement, 0, len(statement) - 1):
+                        yield statement
+                    start = pos
+                continue
+            end = buf.find(_script_token_ends[token], m.end())
+            if end >= 0:
+                pos = end + len(_script_token_ends[token])
+                continue
+            pos = m.start()  # rescan the token once its end is read
+        else:
+            pos = max(pos, len(buf) - 1)  # "-" or "/" may start a comment
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        buf = buf[start:] + chunk
+        pos -= start
+        start = 0
+
+    if not _is_blank(buf, start, len(buf)):
+        yield buf[start:]
+
+
+_COLUMN_CHUNK_SIZE = 1024
+
+
+def _count_row(row: Any) -> int:
+    return row is not None
+
+
+def _count_column_rows(cols: List[Any] | dict[str, Any]) -> int:
+    if isinstance(cols, dict):
+        cols = list(cols.values())
+    return len(cols[0]) if cols else 0
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "NumPy is required for the columnar fetch: pip install sqlite3-qt[numpy]"
+        ) from e
+    return numpy
+
+
+def _store_column_value(np, q, cols, kinds, i, n, v, capacity):
+    """Store a value which does not match the column array type, promoting the array if needed"""
+
+    if isinstance(v, qt_compat.QtCore.QByteArray):
+        v = v.data()
+    elif v == "" and q.isNull(i):
+        v = None
+
+    a, kind = cols[i], kinds[i]
+    if kind is None:
+        # first row: pick the array type
+        kind = type(v) if type(v) in (int, float) else object
+        a = np.empty(capacity, dtype={int: np.int64, float: np.float64}.get(kind, object))
+    elif kind is float and (v is None or type(v) is int):
+        v = np.nan if v is None else v
+    elif kind is int and type(v) is float:
+        a, kind = a.astype(np.float64), float
+    elif kind is not object:
+        a, kind = a.astype(object), object
+
+    a[n] = v
+    cols[i], kinds[i] = a, kind
+
+
+def _unsupported_param(value):
+    raise ProgrammingError(f"type '{type(value).__name__}' is not supported")
+
+
+def _to_qt_value(value):
+    """Convert an (adapted) parameter value to a value which the Qt binding binds as is"""
+    t = type(value)
+    if value is None or t is int or t is float or t is str:
+        return value
+    if t is bytes or t is bytearray:
+        return qt_compat.QtCore.QByteArray(value)
+    for base in (int, float, str):
+        if isinstance(value, base):
+            return base(value)
+    try:
+        value = memoryview(value)
+    except TypeError:
+        _unsupported_param(value)
+    return qt_compat._buffer_to_qbytearray(value)
+
+
+def _make_param_converter(t: type) -> Callable[[Any], Any] | None:
+    """Return the converter of parameter values of type t, or None if no conversion is needed"""
+
+    key = (t, PrepareProtocol)
+    if key in adapters:
+        # look up the adapter at call time in case it gets replaced
+        return lambda value: _to_qt_value(adapters[key](value))
+    if t is int or t is float or t is str or t is type(None):
+        return None
+    if t is bytes or t is bytearray:
+        return qt_compat.QtCore.QByteArray
+    if t is memoryview:
+        return qt_compat._buffer_to_qbytearray
+    if hasattr(t, "__conform__"):
+
+        def conform(value):
+            adapted = value.__conform__(PrepareProtocol)
+            return _to_qt_value(value if adapted is None else adapted)
+
+        return conform
+    return _to_qt_value
+
+
+# type -> parameter converter table, rebuilt whenever an adapter is registered
+_param_converters: dict[type, Callable[[Any], Any] | None] = {}
+_param_converters_nadapters = 0
+
+
+def _adapt_params(params: Iterable[Any]) -> List[Any]:
+    """Convert parameter values to the values to be bound to a QSqlQuery.
+
+    Values are dispatched on their exact type. The adapters registered with register_adapter()
+    take precedence. int, float, str, and None are passed as is, and bytes-like values are
+    converted to QByteArray.
+    """
+
+    global _param_converters_nadapters
+    converters = _param_converters
+    if len(adapters) != _param_converters_nadapters:
+        converters.clear()
+        _param_converters_nadapters = len(adapters)
+
+    values = []
+    append = values.append
+    for i, v in enumerate(params):
+        t = type(v)
         try:
-            query = QtSql.QSqlQuery("SELECT sqlite_version()", con)
-            if not query.first():
-                raise Exception("sqlite_version() failed to run")
-            return query.value(0)
-        finally:
-            con.close()
+            conv = converters[t]
+        except KeyError:
+            conv = converters[t] = _make_param_converter(t)
+        if conv is None:
+            append(v)
+            continue
+        try:
+            append(conv(v))
+        except ProgrammingError as e:
+            raise ProgrammingError(f"Error binding parameter {i + 1}: {e}") from None
+    return values
+
+
+class _Statement:
+    """A prepared QSqlQuery together with the metadata derived from its SQL text"""
+
+    __slots__ = ("sql", "query", "verb", "is_dml", "positions", "names", "columns")
+
+    def __init__(self, database: qt_compat.QtSql.QSqlDatabase, sql: str):
+        # Qt only sees ? placeholders, which are bound by position
+        qt_sql, self.positions, self.names = _parse_placeholders(sql)
+        q = qt_compat.QtSql.QSqlQuery(database)
+        if not q.prepare(qt_sql):
+            raise ProgrammingError(q.lastError().text())
+        self.sql = sql
+        self.query = q
+        self.verb = _statement_verb(sql)
+        self.is_dml = self.verb in _DML_VERBS
+        self.positions: tuple | None  # the parameter index of each placeholder, if not in order
+        self.names: tuple  # the name of each parameter by index, or None
+        # (schema generation, names, declared types) of the result columns, with detect_types
+        self.columns: tuple | None = None
+
+    @property
+    def in_use(self) -> bool:
+        return self.query.isActive()
+
+    def bind(self, values: Sequence):
+        """Bind the values of the parameters by index"""
+        q = self.query
+        if self.positions is None:
+            for i, v in enumerate(values):
+                q.bindValue(i, v)
+        else:
+            for pos, i in enumerate(self.positions):
+                q.bindValue(pos, values[i])
+
 
-    ver = query()
-    QtSql.QSqlDatabase.removeDatabase("ver")
+class _StatementCache:
+    """LRU cache of prepared statements of a connection, keyed by SQL text.
+
+    A cached statement which is still in use by another cursor (i.e., its query is active) is not
+    shared. A new uncached statement is prepared instead, and the lookup counts as a miss.
+    """
+
+    def __init__(self, database: qt_compat.QtSql.QSqlDatabase, maxsize: int = 128):
+        self._database = database
+        self._statements: OrderedDict[str, _Statement] = OrderedDict()
+        self.maxsize = max(int(maxsize), 0)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def get(self, sql: str) -> _Statement:
+        """Return a prepared statement for sql, preparing a new one if needed"""
+
+        statements = self._statements
+        st = statements.get(sql)
+        if st is not None and not st.in_use:
+            statements.move_to_end(sql)
+            self.hits += 1
+            return st
+
+        self.misses += 1
+        st = _Statement(self._database, sql)
+        if sql not in statements and self.maxsize:
+            statements[sql] = st
+            if len(statements) > self.maxsize:
+                statements.popitem(last=False)
+                self.evictions += 1
+        return st
+
+    def clear(self):
+        """Release all the cached statements"""
+        for st in self._statements.values():
+            st.query.finish()
+        self._statements.clear()
+
+    def info(self) -> StatementCacheInfo:
+        return StatementCacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self._statements)
+        )
 
-    if info:
-        return tuple(int(s) for s in ver.split("."))
+
+# the version of the SQLite library linked to the QSQLITE driver, not to the sqlite3 module
+del sqlite_version, sqlite_version_info
+
+# module attributes which require loading Qt
+_QT_ATTRS = ("QT_API", "QtCore", "QtSql")
+
+
+def __getattr__(name):
+    if name in ("sqlite_version", "sqlite_version_info"):
+        version = _sqlite_version()
+        globals().update(
+            sqlite_version=version, sqlite_version_info=tuple(map(int, version.split(".")))
+        )
+        return globals()[name]
+    if name in _QT_ATTRS:
+        return getattr(qt_compat, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _sqlite_version() -> str:
+    """Query the version of the SQLite library used by the QSQLITE driver"""
+    name = "sqlite3_qt_version"
+    con = qt_compat.QtSql.QSqlDatabase.addDatabase("QSQLITE", name)
+    try:
+        con.setDatabaseName(":memory:")
+        if not con.open():
+            raise OperationalError(con.lastError().text())
+        query = qt_compat.QtSql.QSqlQuery("SELECT sqlite_version()", con)
+        if not query.first():
+            raise OperationalError(query.lastError().text())
+        version = query.value(0)
+        del query
+        con.close()
+    finally:
+        del con
+        qt_compat.QtSql.QSqlDatabase.removeDatabase(name)
+    return version
 
 
 def connect(database: PathLike, *args, **kwargs) -> Connection:
@@ -74,7 +597,7 @@ def connect(database: PathLike, *args, **kwargs) -> Connection:
     :type database: PathLike
     :param timeout: How many seconds the connection should wait before raising an OperationalError when a table is locked. If another connection opens a transaction to modify a table, that table will be locked until the transaction is committed. Defaults to 5 seconds
     :type timeout: float, optional
-    :param detect_types: Control whether and how data types not natively supported by SQLite are looked up to be converted to Python types, using the converters registered with register_converter(). Set it to any combination (using , bitwise or) of PARSE_DECLTYPES and PARSE_COLNAMES to enable this. Column names takes precedence over declared types if both flags are set. Types cannot be detected for generated fields (for example max(data)), even when the detect_types parameter is set; str will be returned instead. By default (0), type detection is disabled
+    :param detect_types: Control whether and how data types not natively supported by SQLite are looked up to be converted to Python types, using the converters registered with register_converter(). Set it to any combination (using , bitwise or) of PARSE_DECLTYPES and PARSE_COLNAMES to enable this. Column names takes precedence over declared types if both flags are set. Types cannot be detected for generated fields (for example max(data)), even when the detect_types parameter is set; str will be returned instead. By default (0), type detection is disabled. The declared types are given by sqlite3_column_decltype() when the SQLite C API of the QSQLITE driver is accessible. Otherwise, the declared type of a column is looked up by its table and name, so renamed columns (for example x AS y) have none
     :type detect_types: int, optional
     :param isolation_level: Control legacy transaction handling behaviour. See Connection.isolation_level and Transaction control via the isolation_level attribute for more information. Can be "DEFERRED" (default), "EXCLUSIVE" or "IMMEDIATE"; or None to disable opening transactions implicitly. Has no effect unless Connection.autocommit is set to LEGACY_TRANSACTION_CONTROL (the default).
     :type isolation_level: str  None, optional
@@ -86,6 +609,10 @@ def connect(database: PathLike, *args, **kwargs) -> Connection:
     :type cached_statements: int, optional
     :param uri: If set to True, database is interpreted as a URI with a file path and an optional query string. The scheme part must be "file:", and the path can be relative or absolute. The query string allows passing parameters to SQLite, enabling various How to work with SQLite URIs.
     :type uri: bool, optional
+    :param profile: The name of a set of PRAGMA settings in PRAGMA_PROFILES ("bulk-load", "read-heavy", or "low-memory") to apply after the database is opened. Defaults to None
+    :type profile: str | None, optional
+    :param pragmas: PRAGMA settings by name to apply after the database is opened, overriding those of the profile. Each setting is read back, and the connection fails with OperationalError if any did not take effect. Defaults to None
+    :type pragmas: Mapping[str, Any] | None, optional
     :return: opened database connection
     :rtype: Connection
     """
@@ -96,99 +623,893 @@ def connect(database: PathLike, *args, **kwargs) -> Connection:
     return _connect(database, *args, **kwargs)
 
 
+_callback_tracebacks = False
+
+
 def enable_callback_tracebacks(enable: bool):
-    """Enable or disable callback tracebacks. Not supported."""
-    raise NotImplementedError()
+    """Enable or disable callback tracebacks.
 
+    By default you will not get any tracebacks in user-defined callbacks. If enable is True, the
+    tracebacks of the exceptions raised in the callbacks are printed to sys.stderr.
+    """
+    global _callback_tracebacks
+    _callback_tracebacks = bool(enable)
 
-class Blob:
-    def __init__(self):
-        raise NotImplementedError()
 
-    # def close(self):
-    #     ...
+def _report_callback_error():
+    """Print the traceback of the exception raised by a user-defined callback, if enabled"""
+    if _callback_tracebacks:
+        traceback.print_exc(file=sys.stderr)
+
+
+def _call_back(callback: Callable, *args):
+    """Call a user-defined callback, ignoring any exception it raises"""
+    try:
+        callback(*args)
+    except Exception:
+        _report_callback_error()
+
 
-    # def read(self, length: int = -1) -> bytes:
-    #     ...
+def _quote(identifier: str) -> str:
+    """Quote an SQL identifier"""
+    return '"' + identifier.replace('"', '""') + '"'
 
-    # def write(self, data: ReadableBuffer):
-    #     ...
 
-    # def tell(self) -> int:
-    #     ...
+# the tokens of an SQL statement: literals, quoted identifiers, comments, words, and symbols
+_token_re = re.compile(
+    r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`(?:[^`]|``)*`|\[[^\]]*\]|--[^\n]*|/\*.*?(?:\*/|$)"
+    r"|\w[\w$]*|\S",
+    re.DOTALL,
+)
+
+# the keywords which may be followed by a column name which is not an alias
+_COLUMN_KEYWORDS = frozenset(
+    (
+        "ALL AND ASC BETWEEN BY CASE CAST COLLATE DESC DISTINCT ELSE ESCAPE EXCEPT EXISTS FROM "
+        "GLOB GROUP HAVING IN INTERSECT INTO IS JOIN LIKE LIMIT MATCH NOT OFFSET ON OR ORDER OVER "
+        "PARTITION RECURSIVE REGEXP RETURNING SELECT SET THEN UNION USING VALUES WHEN WHERE "
+        "WINDOW WITH"
+    ).split()
+)
+
+# the keywords which are not names
+_NOT_ALIASES = _COLUMN_KEYWORDS | {"AS", "END", "NULL"}
+
+
+def _aliases(sql: str) -> set:
+    """Return the names given with or without AS in sql (of columns or tables), in lower case.
+
+    Each word which follows AS, a literal, a closing parenthesis, or a word other than a keyword
+    which may precede a column name is an alias.
+    """
+    aliases = set()
+    prev = None
+    for tok in _token_re.findall(sql):
+        if tok[:2] in ("--", "/*"):
+            continue
+        quoted = tok[0] in "\"`["
+        if quoted or (tok[0].isalpha() or tok[0] == "_") and tok.upper() not in _NOT_ALIASES:
+            name = tok[1:-1] if quoted else tok
+            if prev is not None and (
+                prev.upper() == "AS"
+                or prev == ")"
+                or prev[0] in "'\"`[0123456789"
+                or (prev[0].isalpha() or prev[0] == "_") and prev.upper() not in _COLUMN_KEYWORDS
+            ):
+                aliases.add(name.lower())
+        prev = tok
+    return aliases
+
+
+def _has_returning(sql: str) -> bool:
+    """Tell whether sql has a RETURNING clause, outside of literals, identifiers, and comments"""
+    return "RETURNING" in sql.upper() and any(
+        tok.upper() == "RETURNING" for tok in _token_re.findall(sql)
+    )
+
+
+def _result_columns(conn: Connection, st: _Statement, record) -> tuple:
+    """Return the names and the declared types of the result columns of a statement.
+
+    The declared types are given by sqlite3_column_decltype() if the SQLite C API is accessible.
+    Otherwise, a declared type is looked up by the table and the name of a result column reported
+    by the driver, only if the name is not an alias in the statement, so it is None for
+    expressions and renamed columns. The result is kept with the statement until the schema is
+    changed through the connection.
+    """
+    columns = st.columns
+    if columns is not None and columns[0] == conn._schema_generation:
+        return columns[1:]
+    ncols = record.count()
+    names = tuple(record.fieldName(i) for i in range(ncols))
+    api = _capi.api()
+    stmt = None if api is None else _capi.statement_handle(st.query)
+    if stmt:
+        decltypes = api.column_decltypes(stmt, ncols)
+    else:
+        tables = conn._decltypes
+        aliases = None
+        decltypes = []
+        for i, name in enumerate(names):
+            table = record.field(i).tableName()
+            decltype = None
+            if table:
+                if aliases is None:
+                    aliases = _aliases(st.sql)
+                if name.lower() not in aliases:
+                    if table not in tables:
+                        rows = _run(
+                            conn.qt_database, "SELECT name, type FROM pragma_table_xinfo(?)", table
+                        )
+                        tables[table] = {n.lower(): t for n, t in rows}
+                    decltype = tables[table].get(name.lower())
+            decltypes.append(decltype or None)
+    st.columns = (conn._schema_generation, names, tuple(decltypes))
+    return st.columns[1:]
+
+
+def _column_converters(
+    detect_types: int, names: Sequence[str], decltypes: Sequence[str | None]
+) -> tuple:
+    """Return the converter of each column registered with register_converter(), or None"""
+    convs = []
+    for name, decltype in zip(names, decltypes):
+        conv = None
+        if detect_types & PARSE_COLNAMES:
+            m = _colname_type_re.search(name)
+            if m:
+                conv = converters.get(m.group(1).upper())
+        if conv is None and decltype and detect_types & PARSE_DECLTYPES:
+            conv = converters.get(_decltype_re.match(decltype).group().upper())
+        convs.append(conv)
+    return tuple(convs)
+
+
+def _convert_value(conv: Callable[[bytes], Any], v: Any) -> Any:
+    """Pass a decoded non-NULL value to a converter, as bytes"""
+    return conv(v if type(v) is bytes else str(v).encode())
+
+
+def _converting_decoder(decode: Callable[[], tuple], convs: tuple) -> Callable[[], tuple]:
+    """Return a row decoder passing the non-NULL values of the columns with a converter to it, as
+    bytes. Columns without a converter are left as decoded."""
+    pipeline = [(i, conv) for i, conv in enumerate(convs) if conv is not None]
+    if not pipeline:
+        return decode
+
+    def convert():
+        row = list(decode())
+        for i, conv in pipeline:
+            v = row[i]
+            if v is not None:
+                row[i] = _convert_value(conv, v)
+        return tuple(row)
+
+    return convert
+
+
+def _description_name(name: str) -> str:
+    """Strip the type of a column name, as sqlite3 does with PARSE_COLNAMES"""
+    pos = name.find("[")
+    if pos > 0 and name[pos - 1] == " ":
+        pos -= 1
+    return name if pos < 0 else name[:pos]
+
+
+def _run(db: qt_compat.QtSql.QSqlDatabase, sql: str, *params: Any) -> List[tuple]:
+    """Execute an internal SQL statement on a Qt connection and return all its rows"""
+    q = qt_compat.QtSql.QSqlQuery(db)
+    q.setForwardOnly(True)
+    if not q.prepare(sql):
+        raise OperationalError(q.lastError().text())
+    for i, v in enumerate(params):
+        q.bindValue(i, v)
+    if not q.exec():
+        raise OperationalError(q.lastError().text())
+    n = q.record().count()
+    rows = []
+    while q.next():
+        rows.append(tuple(q.value(i) for i in range(n)))
+    error = q.lastError()
+    q.finish()
+    if error.isValid():
+        raise OperationalError(error.text())
+    return rows
+
+
+_SQLITE_OK = 0
+_SQLITE_DONE = 101
+
+# the leading keywords of a CREATE statement in sqlite_master, followed by the object name
+_create_re = re.compile(
+    r"(CREATE\s+(?:UNIQUE\s+)?(?:VIRTUAL\s+)?(?:TABLE|INDEX|VIEW|TRIGGER)\s+)", re.IGNORECASE
+)
+
+
+def _database_file(db: qt_compat.QtSql.QSqlDatabase, name: str) -> str:
+    """Return the file of the database name of a Qt connection, "" if in memory or temporary"""
+    for _, schema, file in _run(db, "PRAGMA database_list"):
+        if schema.lower() == name.lower():
+            return file
+    raise OperationalError(f"unknown database {name}")
+
+
+def _pragma_sql(name: str, value: Any) -> str:
+    """Return the PRAGMA statement setting name to value"""
+    if not re.fullmatch(r"\w+", name):
+        raise ProgrammingError(f"invalid PRAGMA name: {name!r}")
+    if isinstance(value, bool):
+        value = int(value)
+    if not (isinstance(value, str) and re.fullmatch(r"\w+", value)):
+        value = _sql_literal(value)
+    return f"PRAGMA {name} = {value}"
+
+
+def _pragma_applied(name: str, value: Any, effective: Any) -> bool:
+    """Return True if the value of a PRAGMA read back matches the value set"""
+    if isinstance(value, str) and isinstance(effective, int):
+        key = value.upper()
+        keywords = _PRAGMA_KEYWORDS.get(name.lower(), ())
+        if key in keywords:
+            return keywords.index(key) == effective
+        if key in _PRAGMA_BOOLEANS:
+            return _PRAGMA_BOOLEANS[key] == effective
+    if isinstance(effective, str):
+        return str(value).lower() == effective.lower()
+    try:
+        return float(value) == float(effective)
+    except (TypeError, ValueError):
+        return False
+
+
+def _used_pages(db: qt_compat.QtSql.QSqlDatabase, name: str) -> int:
+    name = _quote(name)
+    pages = _run(db, f"PRAGMA {name}.page_count")[0][0]
+    return pages - _run(db, f"PRAGMA {name}.freelist_count")[0][0]
+
+
+def _primary_key(
+    db: qt_compat.QtSql.QSqlDatabase, schema: str, table: str
+) -> List[Tuple[str, str]]:
+    """Return the names and the collations of the primary key columns of a WITHOUT ROWID table,
+    as in its primary key index"""
+    qschema = _quote(schema)
+    for _, index, _, origin, *_ in _run(db, f"PRAGMA {qschema}.index_list({_quote(table)})"):
+        if origin == "pk":
+            xinfo = _run(db, f"PRAGMA {qschema}.index_xinfo({_quote(index)})")
+            return [(name, coll) for _, _, name, _, coll, key in xinfo if key]
+    raise OperationalError(f"no primary key index: {table}")
+
+
+def _copy_database(
+    db: qt_compat.QtSql.QSqlDatabase,
+    src: str,
+    dst: str,
+    pages: int = -1,
+    progress: Callable[[int, int, int], object] | None = None,
+    sleep: float = 0.25,
+    changed: Callable[[], bool] | None = None,
+):
+    """Replace the content of the database dst of a Qt connection by a copy of the database src.
+
+    Tables are copied by INSERT ... SELECT statements, each copying a range of rowids (or primary
+    keys, for WITHOUT ROWID tables) estimated to fill about the given number of pages (all the rows at once if pages is not positive), so that
+    src is not locked between the steps. Indexes, views, and triggers are created after the rows
+    are copied. The contents of virtual tables are not copied.
+
+    progress is called after each step with (status, remaining, total) as for sqlite3_backup_step:
+    status is SQLITE_OK, or SQLITE_DONE after the last step, and remaining and total are numbers of
+    pages. A step on a locked database is retried after sleep seconds. If changed is given, it is
+    called before each step, and the copy starts over if it returns True (changed is then expected
+    to compare with the state at that call).
+    """
+
+    qsrc, qdst = _quote(src), _quote(dst)
+
+    def step(sql: str, *params: Any) -> List[tuple]:
+        while True:
+            try:
+                return _run(db, sql, *params)
+            except OperationalError as e:
+                if "locked" not in str(e) and "busy" not in str(e):
+                    raise
+            _sleep(sleep)
+
+    def create(sql: str):
+        _run(db, _create_re.sub(lambda m: m[1] + qdst + ".", sql, 1))
+
+    foreign_keys = _run(db, "PRAGMA foreign_keys")[0][0]
+    _run(db, "PRAGMA foreign_keys = OFF")
+    try:
+        while True:
+            if changed is not None:
+                changed()  # from now on
+            schema = _run(
+                db,
+                f"SELECT type, name, sql FROM {qsrc}.sqlite_master "
+                "WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' ORDER BY rowid",
+            )
+            has_sequence = bool(
+                _run(db, f"SELECT 1 FROM {qsrc}.sqlite_master WHERE name = 'sqlite_sequence'")
+            )
+            user_version = _run(db, f"PRAGMA {qsrc}.user_version")[0][0]
+            application_id = _run(db, f"PRAGMA {qsrc}.application_id")[0][0]
+            total = _run(db, f"PRAGMA {qsrc}.page_count")[0][0]
+
+            # drop the tables and views along with their indexes and triggers
+            for type_, name in _run(
+                db,
+                f"SELECT type, name FROM {qdst}.sqlite_master "
+                "WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%'",
+            ):
+                _run(db, f"DROP {type_.upper()} IF EXISTS {qdst}.{_quote(name)}")
+            if _run(db, f"SELECT 1 FROM {qdst}.sqlite_master WHERE name = 'sqlite_sequence'"):
+                _run(db, f"DELETE FROM {qdst}.sqlite_sequence")
+
+            tables = [(name, sql) for type_, name, sql in schema if type_ == "table"]
+            for _, sql in tables:
+                create(sql)
+
+            base = _used_pages(db, dst)
+            rows_per_page = 1.0
+            restart = False
+            for name, sql in tables:
+                if re.match(r"CREATE\s+VIRTUAL\b", sql, re.IGNORECASE):
+                    continue
+                cols = [_quote(r[1]) for r in _run(db, f"PRAGMA {qsrc}.table_info({_quote(name)})")]
+                table = _quote(name)
+                without_rowid = re.search(r"\bWITHOUT\s+ROWID\s*$", sql, re.IGNORECASE)
+                if without_rowid:
+                    key = _primary_key(db, src, name)
+                    order = ", ".join(f"{_quote(k)} COLLATE {_quote(c)}" for k, c in key)
+                    after = f"WHERE ({order}) > ({', '.join('?' * len(key))})"
+                    # the greatest key copied so far, found by the primary key index of dst
+                    names = ", ".join(_quote(k) for k, _ in key)
+                    desc = ", ".join(f"{_quote(k)} COLLATE {_quote(c)} DESC" for k, c in key)
+                    greatest = f"SELECT {names} FROM {qdst}.{table} ORDER BY {desc} LIMIT 1"
+                else:
+                    cols.insert(0, "rowid")
+                cols = ", ".join(cols)
+                insert = f"INSERT INTO {qdst}.{table}({cols}) SELECT {cols} FROM {qsrc}.{table}"
+                if changed is not None and changed():
+                    restart = True
+                    break
+                if pages <= 0:
+                    step(insert)
+                    continue
+
+                last = None  # the last rowid (or primary key) copied
+                while True:
+                    used = _used_pages(db, dst)
+                    limit = max(int(pages * rows_per_page), 1)
+                    if without_rowid:
+                        params = () if last is None else last
+                        where = "" if last is None else after
+                        step(f"{insert} {where} ORDER BY {order} LIMIT ?", *params, limit)
+                        n = _run(db, "SELECT changes()")[0][0]
+                        if n:
+                            last = _run(db, greatest)[0]
+                    else:
+                        after = "" if last is None else "rowid > ? AND"
+                        params = () if last is None else (last,)
+                        n, end = step(
+                            f"SELECT count(*), max(rowid) FROM (SELECT rowid FROM {qsrc}.{table} "
+                            f"WHERE {after} 1 ORDER BY rowid LIMIT ?)",
+                            *params,
+                            limit,
+                        )[0]
+                        if n:
+                            step(f"{insert} WHERE {after} rowid <= ?", *params, end)
+                            last = end
+                    grown = _used_pages(db, dst) - used
+                    if n and grown > 0:
+                        rows_per_page = n / grown
+                    elif n:
+                        rows_per_page *= 2
+                    if n < limit:
+                        break
+                    if progress is not None:
+                        progress(_SQLITE_OK, max(total - (_used_pages(db, dst) - base), 0), total)
+                    if changed is not None and changed():
+                        restart = True
+                        break
+                if restart:
+                    break
+            if restart:
+                continue
+
+            if has_sequence:
+                # replacing the values set by the rows inserted
+                _run(db, f"DELETE FROM {qdst}.sqlite_sequence")
+                _run(
+                    db,
+                    f"INSERT INTO {qdst}.sqlite_sequence SELECT * FROM {qsrc}.sqlite_sequence",
+                )
+            for type_, name, sql in schema:
+                if type_ != "table":
+                    create(sql)
+            _run(db, f"PRAGMA {qdst}.user_version = {int(user_version)}")
+            _run(db, f"PRAGMA {qdst}.application_id = {int(application_id)}")
+            break
+    finally:
+        _run(db, f"PRAGMA foreign_keys = {int(foreign_keys)}")
+
+    if progress is not None:
+        progress(_SQLITE_DONE, 0, total)
+
+
+class _Snapshot:
+    """Temporary database file attached to a Qt connection, removed when detached"""
+
+    def __init__(self, db: qt_compat.QtSql.QSqlDatabase, file: str | None = None):
+        self._db = db
+        self.alias = f"sqlite3_qt_{id(self):x}"
+        self.file = file
+        self._remove = file is None
+        if file is None:
+            fd, self.file = tempfile.mkstemp(suffix=".sqlite3")
+            os.close(fd)
+
+    def attach(self) -> str:
+        """Attach the file to the connection and return its database name"""
+        _run(self._db, f"ATTACH ? AS {_quote(self.alias)}", self.file)
+        return self.alias
+
+    def close(self):
+        try:
+            if self.alias in (r[1] for r in _run(self._db, "PRAGMA database_list")):
+                _run(self._db, f"DETACH {_quote(self.alias)}")
+        finally:
+            if self._remove:
+                os.remove(self.file)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, type: object, val: object, tb: object) -> Literal[False]:
+        self.close()
+        return False
+
+
+def _iterdump(
+    connection: Connection, filter: str | None = None, batchsize: int = 1
+) -> Iterator[str]:
+    """Generate the SQL statements of the dump of a connection's main database, as sqlite3.
+
+    The rows of each table are formatted to SQL literals by SQLite, and streamed by a forward-only
+    cursor. batchsize rows are inserted by each INSERT statement.
+    """
+
+    batchsize = max(int(batchsize), 1)
+    where_name = "" if filter is None else 'AND "name" LIKE ?'
+    params = () if filter is None else (filter,)
+    writable_schema = False
+    cu = connection.cursor()
+    yield "BEGIN TRANSACTION;"
+
+    tables = cu.execute(
+        'SELECT "name", "sql" FROM "sqlite_master" '
+        f"WHERE \"sql\" NOT NULL AND \"type\" == 'table' {where_name} ORDER BY \"name\"",
+        params,
+    ).fetchall()
+    sqlite_sequence = []
+    for table_name, sql in tables:
+        if table_name == "sqlite_sequence":
+            rows = cu.execute('SELECT * FROM "sqlite_sequence"').fetchall()
+            sqlite_sequence = ['DELETE FROM "sqlite_sequence"']
+            sqlite_sequence += [
+                f'INSERT INTO "sqlite_sequence" VALUES({_sql_literal(name)},{seq})'
+                for name, seq in rows
+            ]
+            continue
+        elif table_name == "sqlite_stat1":
+            yield 'ANALYZE "sqlite_master";'
+        elif table_name.startswith("sqlite_"):
+            continue
+        elif sql.startswith("CREATE VIRTUAL TABLE"):
+            if not writable_schema:
+                writable_schema = True
+                yield "PRAGMA writable_schema=ON;"
+            yield (
+                "INSERT INTO sqlite_master(type,name,tbl_name,rootpage,sql)"
+                f"VALUES('table',{_sql_literal(table_name)},{_sql_literal(table_name)},0,"
+                f"{_sql_literal(sql)});"
+            )
+        else:
+            yield f"{sql};"
+
+        # the values of each row formatted by SQLite, fetched row by row
+        table = _quote(table_name)
+        columns = cu.execute(f"PRAGMA table_info({table})").fetchall()
+        values = ",".join(f"'||quote({_quote(str(c[1]))})||'" for c in columns)
+        rows = connection.cursor()
+        rows.execute(f"SELECT '({values})' FROM {table}")
+        insert = f"INSERT INTO {table} VALUES"
+        while True:
+            batch = rows.fetchmany(batchsize)
+            if not batch:
+                break
+            yield insert + ",".join([row[0] for row in batch]) + ";"
+        rows.close()
+
+    for (sql,) in cu.execute(
+        'SELECT "sql" FROM "sqlite_master" '
+        f"WHERE \"sql\" NOT NULL AND \"type\" IN ('index', 'trigger', 'view') {where_name}",
+        params,
+    ).fetchall():
+        yield f"{sql};"
+
+    if writable_schema:
+        yield "PRAGMA writable_schema=OFF;"
+
+    # the statements of sqlite_sequence at the end of the transaction (gh-79009)
+    for sql in sqlite_sequence:
+        yield f"{sql};"
+
+    yield "COMMIT;"
+
+
+class Blob:
+    """Blob handle to an existing BLOB, returned by Connection.blobopen().
+
+    Use its methods to read and write the BLOB in windows, without loading the whole BLOB into
+    memory. As with sqlite3, the size of the BLOB cannot be changed.
+
+    The QSQLITE driver does not expose SQLite's incremental BLOB I/O, so each read is an SQL
+    statement selecting a window of the BLOB with ``substr()``. Each write is an UPDATE splicing
+    the data into the BLOB, which rewrites the whole BLOB at a cost proportional to its size, not
+    to the size of the data. Writes are thus buffered: consecutive writes are collected and
+    written at once when the buffer reaches write_buffer_size, when the blob is read, flushed, or
+    closed, or when the next write is not contiguous. Close the blob (e.g., by using it as a
+    context manager) before committing the transaction which should include its writes.
+    """
 
-    # # whence must be one of os.SEEK_SET, os.SEEK_CUR, os.SEEK_END
-    # def seek(self, offset: int, origin: int = 0):
-    #     ...
+    default_chunk_size: int = 1 << 20
+    """The default window size of chunks(), in bytes"""
 
-    # def __len__(self) -> int:
-    #     ...
+    write_buffer_size: int = 16 << 20
+    """The size in bytes from which buffered writes are written to the BLOB"""
 
-    # def __enter__(self) -> Self:
-    #     ...
+    def __init__(
+        self,
+        conn: Connection,
+        table: str,
+        column: str,
+        row: int,
+        readonly: bool = False,
+        name: str = "main",
+    ):
+        db = conn.qt_database
+        value = f"CAST({_quote(column)} AS BLOB)"
+        where = f"FROM {_quote(name)}.{_quote(table)} WHERE rowid = ?"
+
+        q = qt_compat.QtSql.QSqlQuery(db)
+        q.setForwardOnly(True)
+        if not q.prepare(f"SELECT length({value}) {where}"):
+            raise OperationalError(q.lastError().text())
+        q.bindValue(0, row)
+        if not q.exec():
+            raise OperationalError(q.lastError().text())
+        if not q.next():
+            raise OperationalError(f"no such rowid: {row}")
+        self._length: int = q.value(0) or 0
+        q.finish()
+
+        self._read_query = q
+        if not q.prepare(f"SELECT substr({value}, ?, ?) {where}"):
+            raise OperationalError(q.lastError().text())
+
+        self._write_query = None
+        if not readonly:
+            self._write_query = w = qt_compat.QtSql.QSqlQuery(db)
+            if not w.prepare(
+                f"UPDATE {_quote(name)}.{_quote(table)} SET {_quote(column)} = "
+                f"CAST(substr({value}, 1, ?) || ? || substr({value}, ?) AS BLOB) WHERE rowid = ?"
+            ):
+                raise OperationalError(w.lastError().text())
+
+        self._row = row
+        self._offset = 0
+        self._closed = False
+        # the data written at _pending_offset, not yet written to the BLOB
+        self._pending = bytearray()
+        self._pending_offset = 0
+
+    def _check(self):
+        if self._closed:
+            raise ProgrammingError("Cannot operate on a closed blob.")
+
+    def _read(self, offset: int, length: int) -> bytes:
+        self.flush()
+        q = self._read_query
+        for i, v in enumerate((offset + 1, length, self._row)):
+            q.bindValue(i, v)
+        if not q.exec():
+            raise OperationalError(q.lastError().text())
+        data = q.value(0).data() if q.next() else None
+        q.finish()
+        if data is None:
+            raise OperationalError(f"no such rowid: {self._row}")
+        return data
+
+    def _write(self, offset: int, data: bytes):
+        q = self._write_query
+        if q is None:
+            raise OperationalError("attempt to write a readonly database")
+        for i, v in enumerate(
+            (offset, qt_compat.QtCore.QByteArray(data), offset + len(data) + 1, self._row)
+        ):
+            q.bindValue(i, v)
+        if not q.exec():
+            raise OperationalError(q.lastError().text())
+        q.finish()
+
+    def _buffer(self, offset: int, data: bytes):
+        """Buffer data to write at offset, following the buffered data if contiguous"""
+        if self._write_query is None:
+            raise OperationalError("attempt to write a readonly database")
+        pending = self._pending
+        if pending and offset != self._pending_offset + len(pending):
+            self.flush()
+        if not pending:
+            self._pending_offset = offset
+        pending += data
+        if len(pending) >= self.write_buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered writes to the BLOB."""
+        pending = self._pending
+        if pending:
+            self._write(self._pending_offset, bytes(pending))
+            pending.clear()
 
-    # def __exit__(self, type: object, val: object, tb: object) -> Literal[False]:
-    #     ...
+    def close(self):
+        """Close the blob, after writing the buffered writes to the BLOB.
+
+        The blob will be unusable from this point onward. An Error (or subclass) exception will be
+        raised if any further operation is attempted with the blob."""
+        if not self._closed:
+            try:
+                self.flush()
+            finally:
+                self._pending.clear()
+                self._read_query.finish()
+                self._closed = True
+
+    def read(self, length: int = -1) -> bytes:
+        """Read length bytes of data from the blob at the current offset position.
+
+        If the end of the blob is reached, the data up to EOF will be returned. When length is not
+        specified, or is negative, read() will read until the end of the blob.
+        """
+        self._check()
+        remaining = self._length - self._offset
+        if length < 0 or length > remaining:
+            length = remaining
+        if length <= 0:
+            return b""
+        data = self._read(self._offset, length)
+        self._offset += len(data)
+        return data
+
+    def write(self, data: bytes | bytearray | memoryview):
+        """Write data to the blob at the current offset.
+
+        This function cannot change the blob length. Writing beyond the end of the blob will raise
+        ValueError. The data is buffered, see Blob."""
+        self._check()
+        data = bytes(data)
+        if len(data) > self._length - self._offset:
+            raise ValueError("data longer than blob length")
+        self._buffer(self._offset, data)
+        self._offset += len(data)
+
+    def tell(self) -> int:
+        """Return the current access position of the blob."""
+        self._check()
+        return self._offset
+
+    def seek(self, offset: int, origin: int = os.SEEK_SET):
+        """Set the current access position of the blob to offset.
+
+        The origin argument defaults to os.SEEK_SET (absolute blob positioning). Other values for
+        origin are os.SEEK_CUR (seek relative to the current position) and os.SEEK_END (seek
+        relative to the blob's end)."""
+        self._check()
+        if origin == os.SEEK_CUR:
+            offset += self._offset
+        elif origin == os.SEEK_END:
+            offset += self._length
+        elif origin != os.SEEK_SET:
+            raise ValueError("'origin' should be os.SEEK_SET, os.SEEK_CUR, or os.SEEK_END")
+        if not 0 <= offset <= self._length:
+            raise ValueError("offset out of blob range")
+        self._offset = offset
+
+    def chunks(self, size: int | None = None) -> Iterator[bytes]:
+        """Iterate over the blob from the current offset in chunks of (at most) size bytes.
+
+        :param size: chunk size in bytes, defaults to default_chunk_size
+        :type size: int | None, optional
+        :yield: chunk of the blob
+        :rtype: Iterator[bytes]
+        """
+        size = size or self.default_chunk_size
+        while True:
+            data = self.read(size)
+            if not data:
+                return
+            yield data
 
-    # def __getitem__(self, key: SupportsIndex | slice) -> int:
-    #     ...
+    def __len__(self) -> int:
+        self._check()
+        return self._length
 
-    # def __setitem__(self, key: SupportsIndex | slice, value: int):
-    #     ...
+    def __enter__(self) -> Self:
+        self._check()
+        return self
+
+    def __exit__(self, type: object, val: object, tb: object) -> Literal[False]:
+        self.close()
+        return False
+
+    def __getitem__(self, key: int | slice) -> int | bytes:
+        self._check()
+        if isinstance(key, slice):
+            r = range(*key.indices(self._length))
+            if not r:
+                return b""
+            if r.step == 1:
+                return self._read(r.start, len(r))
+            lo, hi = min(r[0], r[-1]), max(r[0], r[-1])
+            data = self._read(lo, hi - lo + 1)
+            return bytes(data[i - lo] for i in r)
+
+        i = key.__index__()
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError("Blob index out of range")
+        return self._read(i, 1)[0]
+
+    def __setitem__(self, key: int | slice, value: int | bytes):
+        self._check()
+        if isinstance(key, slice):
+            r = range(*key.indices(self._length))
+            value = bytes(value)
+            if len(value) != len(r):
+                raise IndexError("Blob slice assignment is wrong size")
+            if not r:
+                return
+            if r.step == 1:
+                self._buffer(r.start, value)
+                return
+            lo, hi = min(r[0], r[-1]), max(r[0], r[-1])
+            data = bytearray(self._read(lo, hi - lo + 1))
+            for i, v in zip(r, value):
+                data[i - lo] = v
+            self._buffer(lo, bytes(data))
+            return
+
+        i = key.__index__()
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError("Blob index out of range")
+        if not 0 <= value < 256:
+            raise ValueError("byte must be in range(0, 256)")
+        self._buffer(i, bytes((value,)))
+
+
+class _RowSchema:
+    """Column names of a result set, shared by all of its Row objects"""
+
+    __slots__ = ("keys", "index")
+
+    def __init__(self, keys: Tuple[str, ...]):
+        self.keys = keys
+
+        # column name -> column index map. A name is looked up case-insensitively, and the first
+        # matching column wins as in sqlite3.Row. Both the original and lowercased names are
+        # stored to avoid lowercasing the key in the common case.
+        index = {}
+        for i, key in enumerate(keys):
+            index.setdefault(key, index.setdefault(key.lower(), i))
+        self.index = index
 
 
 class Row:
-    def __init__(self, cursor: Cursor, row: Tuple[Any]):
-        self.qt_record = cursor.qt_query.record()
+    """A Row instance serves as a highly optimized row_factory for Connection objects. It supports
+    iteration, equality testing, len(), and mapping access by column name and index.
+
+    Two Row objects compare equal if they have identical column names and values.
+    """
+
+    __slots__ = ("_data", "_schema")
+
+    def __init__(self, cursor: Cursor, data: Tuple[Any, ...]):
+        if not isinstance(data, tuple):
+            raise TypeError("tuple required for second argument")
+        self._data = data
+        self._schema = cursor._row_schema()
+
+    def keys(self) -> List[str]:
+        """Return a list of column names as strings.
 
-    def __keys__(self) -> List[str]:
-        r = self.qt_record
-        return [r.fieldName(k) for k in range(r.count())]
+        Immediately after a query, it is the first member of each tuple in Cursor.description."""
+        return list(self._schema.keys)
 
     def __getitem__(self, key: int | str | slice) -> Any:
-        r = self.qt_record
-        return [r.value(i) for i in key] if isinstance(key, slice) else r.value(key)
+        if isinstance(key, str):
+            index = self._schema.index
+            i = index.get(key)
+            if i is None:
+                i = index.get(key.lower())
+                if i is None:
+                    raise IndexError("No item with that key")
+            return self._data[i]
+        return self._data[key]
 
     def __hash__(self) -> int:
-        # PyObject_Hash(self->description) ^ PyObject_Hash(self->data)
-        ...
+        return hash(self._schema.keys) ^ hash(self._data)
 
     def __iter__(self) -> Iterator[Any]:
-        return self.keys()
+        return iter(self._data)
 
     def __len__(self) -> int:
-        return self.qt_record.count()
+        return len(self._data)
 
     # These return NotImplemented for anything that is not a Row.
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Row):
             return NotImplemented
-        return all(key in other and self[key] == other[key] for key in self.keys())
-
-    def __ge__(self, other: object) -> bool:
-        return NotImplemented
-
-    def __gt__(self, other: object) -> bool:
-        return NotImplemented
-
-    def __le__(self, other: object) -> bool:
-        return NotImplemented
-
-    def __lt__(self, other: object) -> bool:
-        return NotImplemented
+        return self._data == other._data and (
+            self._schema is other._schema or self._schema.keys == other._schema.keys
+        )
 
-    def _ne_(self, other: object) -> bool:
+    def __ne__(self, other: object) -> bool:
         if not isinstance(other, Row):
             return NotImplemented
-        return any(key not in other or self[key] != other[key] for key in self.keys())
+        return not self == other
 
 
 class Cursor(Iterator):
-    def __init__(self, conn: Connection):
+    forward_only: bool = True
+    """If True (default), query results are streamed: each row can only be fetched once, and a
+    result set is released as soon as its last row is fetched. Set to False before executing a
+    query to keep Qt's scrollable result."""
+
+    batchsize: int = 10000
+    """The maximum number of parameter sets consumed at once from the iterable by executemany(),
+    which bounds the memory it uses. An interruption or the progress handler is checked before
+    each batch."""
+
+    def __init__(self, conn: Connection, forward_only: bool = True):
         self._conn = conn
-        self.qt_query = QtSql.QSqlQuery(conn.qt_database)
+        # the query of the cursor between result sets, as a finished statement may be handed to
+        # another cursor by the statement cache
+        self._idle_query = self.qt_query = qt_compat.QtSql.QSqlQuery(conn.qt_database)
         self.row_factory: None | Callable = conn.row_factory
         self.arraysize: int = 1
+        self.forward_only = forward_only
+        self._rowcount: int = -1
+        self._lastrowid: int | None = None
+        self._record: qt_compat.QtSql.QSqlRecord | None = None
+        self._description: tuple | None = None
+        self._columns: tuple | None = None  # names and declared types, with detect_types
+        self._schema: _RowSchema | None = None
+        self._decode: Callable[[], tuple] = tuple
+        self._active = False  # qt_query holds the result set of this cursor
+        self._event: list | None = None  # profile of the statement, with a statement callback
+
+    def __del__(self):
+        # a pending result set keeps a read lock on the database
+        if self.__dict__.get("_active"):
+            self.qt_query.finish()
+            self._conn._leave()
+        if self.__dict__.get("_event") is not None:
+            self._emit_event()
 
     def __iter__(self) -> Self:
         return self
@@ -199,24 +1520,6 @@ class Cursor(Iterator):
             raise StopIteration()
         return out
 
-    @staticmethod
-    def _flag(v):
-        flag = QtSql.QSql.ParamTypeFlag.InOut
-        try:
-            v = QtCore.QByteArray(bytes(memoryview(v)))
-            flag = flag | QtSql.QSql.ParamTypeFlag.Binary
-        finally:
-            return v, flag
-
-    @staticmethod
-    def _sflag(seq):
-        flag = QtSql.QSql.ParamTypeFlag.InOut
-        try:
-            seq = [QtCore.QByteArray(bytes(memoryview(v))) for v in seq]
-            flag = flag | QtSql.QSql.ParamTypeFlag.Binary
-        finally:
-            return seq, flag
-
     def execute(
         self, sql: str, parameters: Optional[Sequence | Mapping] = None
     ) -> Self:
@@ -231,17 +1534,55 @@ class Cursor(Iterator):
         :return: cursor
         :rtype: Self
         """
-        q = self.qt_query
-        if not q.prepare(sql):
-            raise ProgrammingError(q.lastError().text())
-        if isinstance(parameters, Sequence):
-            for i, v in enumerate(parameters):
-                q.bindValue(i, *self._flag(v))  # TODO add adapter
-        elif isinstance(parameters, Mapping):
-            for k, v in parameters.items():
-                q.bindValue(f":{k}", *self._flag(v))  # TODO add adapter
-        if not q.exec():
-            raise DatabaseError(q.lastError().text())
+        conn = self._conn
+        st = self._prepare(sql)
+        q = st.query
+        if st.is_dml:
+            conn._begin_implicit()
+        values = _adapt_params(_parameter_values(st.names, parameters))
+        st.bind(values)
+
+        if conn._trace_callback is not None:
+            _call_back(conn._trace_callback, _expand_sql(sql, values))
+        event = self._event
+        if event is not None:
+            event[1] = len(values)
+            t0 = perf_counter()
+        conn._enter()
+        if conn._interrupted or not q.exec():
+            self._event = None
+            error = conn._error(q)
+            conn._leave()
+            raise error
+        if q.isSelect():
+            self._active = True  # the statement is in progress until its result set is released
+        else:
+            conn._leave()
+        if event is not None:
+            event[3] = perf_counter() - t0
+        if st.verb in _TRANSACTION_VERBS:
+            conn._track_transaction(st.verb, sql)
+        elif st.verb in _DDL_VERBS:
+            conn._schema_changed()
+
+        self._lastrowid = q.lastInsertId()
+        self._rowcount = q.numRowsAffected() if st.is_dml else -1
+        if q.isSelect():
+            # column info is available from the statement without fetching any row
+            self._record = q.record()
+            self._decode = qt_compat._row_decoder(q, self._record.count())
+            if conn._detect_types:
+                self._columns = _result_columns(conn, st, self._record)
+                convs = _column_converters(conn._detect_types, *self._columns)
+                self._decode = _converting_decoder(self._decode, convs)
+            if conn._watch and conn._on_step():
+                raise self._abort()
+        else:
+            # release the statement so it can be reused from the cache
+            q.finish()
+            if event is not None:
+                event[5] = self._rowcount
+                self._emit_event()
 
         return self
 
@@ -257,91 +1598,212 @@ class Cursor(Iterator):
         :param sql: A single SQL DML statement.
         :type sql: str
         :param seq_of_parameters: An iterable of parameters to bind with the placeholders in sql.
+                                  It may be a generator or any other iterable of unknown length;
+                                  it is consumed batchsize items at a time.
         :type seq_of_parameters: Optional[Iterable[Sequence  |  Mapping]], optional
-        :raises ProgrammingError: If sql contains more than one SQL statement, or is not a DML.
+        :raises ProgrammingError: If sql contains more than one SQL statement, is not a DML
+                                  statement, or returns rows.
         :return: cursor
         :rtype: Self
         """
-        q = self.qt_query
-        if not q.prepare(sql):
-            # TODO - check Programming or Database error
-            raise ProgrammingError(q.lastError().text())
+        conn = self._conn
+        st = self._prepare(sql)
+        q = st.query
+        if not st.is_dml or _has_returning(sql):
+            raise ProgrammingError("executemany() can only execute DML statements.")
+
+        conn._begin_implicit()
+        # the parameter sets are executed one at a time, as execBatch() only reports the number of
+        # rows changed by the last one, and total_changes also counts the changes of triggers
+        rowcount = 0
+        names = st.names
+        bind = st.bind
+        trace = conn._trace_callback
+        event = self._event
+        it = iter(seq_of_parameters or ())
+        batchsize = max(int(self.batchsize), 1)
+        conn._enter()
+        try:
+            while True:
+                batch = list(islice(it, batchsize))
+                if not batch:
+                    break
+                if conn._watch and conn._on_step(len(batch)):
+                    raise self._abort()
+                if event is not None:
+                    event[1] += len(batch) * len(names)
+                    t0 = perf_counter()
+                for parameters in batch:
+                    values = _adapt_params(_parameter_values(names, parameters))
+                    if trace is not None:
+                        _call_back(trace, _expand_sql(sql, values))
+                    bind(values)
+                    if not q.exec():
+                        self._event = None
+                        raise conn._error(q)
+                    rowcount += q.numRowsAffected()
+                if event is not None:
+                    event[3] += perf_counter() - t0
+        finally:
+            conn._leave()
 
-        if len(seq_of_parameters):
-            if isinstance(seq_of_parameters[0], Sequence):
-                for i, v in enumerate(list(t) for t in zip(*seq_of_parameters)):
-                    q.bindValue(i, *self._sflag(v))  # TODO add adapter
-            elif isinstance(seq_of_parameters[0], Mapping):
-                for k in seq_of_parameters[0].keys():
-                    q.bindValue(
-                        f":{k}",
-                        *self._sflag([v[k] for v in seq_of_parameters]),
-                    )
-                    # TODO add adapter
-        if not q.execBatch():
-            raise DatabaseError(q.lastError().text())
+        self._rowcount = rowcount
+        q.finish()
+        if event is not None:
+            event[5] = self._rowcount
+            self._emit_event()
 
         return self
 
-    def executescript(self, sql_script: str) -> Cursor:
+    def executescript(self, sql_script: str | TextIO) -> Cursor:
         """Execute the SQL statements in sql_script.
 
         If the autocommit is LEGACY_TRANSACTION_CONTROL and there is a pending transaction, an
         implicit COMMIT statement is executed first. No other implicit transaction control is
         performed; any transaction control must be added to sql_script.
 
-        :param sql_script: SQL script
-        :type sql_script: str
-        :raises DatabaseError: _description_
-        :return: _description_
+        The script is split into statements as it is read, and they are executed one at a time, so
+        a script read from a text file is never held in memory as a whole. As with sqlite3, each
+        statement is committed on its own unless a transaction is open, e.g., started by the script
+        with BEGIN.
+
+        :param sql_script: SQL script, or a text file object to read it from
+        :type sql_script: str | TextIO
+        :raises DatabaseError: If a statement fails. The statements following it are not executed.
+        :return: cursor
         :rtype: Cursor
         """
-        iter_lines = (readLine for readLine in sql_script.splitlines())
-        q = self.qt_query
-        try:
-            while True:
-                lines = []
-                finished = False
-
-                while not finished:
-                    readLine = next(iter_lines)
-                    cleanedLine = readLine.strip()
-                    # remove comments at end of line
-                    cleanedLine = cleanedLine.split("--", 1)[0]
-
-                    # remove lines with only comment, and DROP lines
-                    if not (
-                        cleanedLine.startsWith("--") or cleanedLine.startsWith("DROP")
-                    ) and len(cleanedLine):
-                        lines.append(cleanedLine)
-
-                    if cleanedLine.endsWith(";"):
-                        break
 
-                    if cleanedLine.startsWith("COMMIT"):
-                        finished = True
+        # script statements are not cached
+        conn = self._conn
+        conn._check_thread()
+        self._release()
+        if conn._autocommit == LEGACY_TRANSACTION_CONTROL and conn.in_transaction:
+            conn.commit()
+        q = self.qt_query = qt_compat.QtSql.QSqlQuery(conn.qt_database)
 
-                line = " ".join(lines)
-                if len(line):
-                    if not q.exec(line):
-                        raise DatabaseError(q.lastError().text())
-
-        except StopIteration:
-            pass
+        conn._enter()
+        try:
+            for statement in _split_script(sql_script):
+                if conn._watch and conn._on_step():
+                    raise conn._interruption()
+                verb = _statement_verb(statement)
+                if conn._trace_callback is not None:
+                    _call_back(conn._trace_callback, _expand_sql(statement, ()))
+                t0 = perf_counter()
+                if not q.exec(statement):
+                    raise conn._error(q)
+                if conn._statement_callback is not None:
+                    # a script statement is prepared and executed at once
+                    rows = q.numRowsAffected() if verb in _DML_VERBS else -1
+                    dt = perf_counter() - t0
+                    event = (statement, 0, 0.0, dt, 0.0, rows, qt_compat.QT_API)
+                    _call_back(conn._statement_callback, StatementEvent(*event))
+                if verb in _TRANSACTION_VERBS:
+                    conn._track_transaction(verb, statement)
+                elif verb in _DDL_VERBS:
+                    conn._schema_changed()
+        finally:
+            q.finish()
+            conn._leave()
 
         return self
 
-    def _fetch_tuple(self):
-        q = self.qt_query
-        n = q.record().count()
-        return tuple(q.value(i) for i in range(n))
+    def _prepare(self, sql: str) -> _Statement:
+        """Release the current statement and get a prepared one for sql from the cache"""
+        conn = self._conn
+        conn._check_thread()
+        self._release()
+        if conn._statement_callback is None:
+            st = conn._statements.get(sql)
+        else:
+            t0 = perf_counter()
+            st = conn._statements.get(sql)
+            self._event = [sql, 0, perf_counter() - t0, 0.0, 0.0, 0]
+        q = self.qt_query = st.query
+        if q.isForwardOnly() != self.forward_only:
+            q.setForwardOnly(self.forward_only)
+        return st
+
+    def _release(self):
+        # qt_query may have been handed to another cursor since this one finished it
+        if self._active:
+            self._active = False
+            self.qt_query.finish()
+            self._conn._leave()
+        self.qt_query = self._idle_query
+        if self._event is not None:
+            self._emit_event()
+        self._record = None
+        self._description = None
+        self._columns = None
+        self._schema = None
+        self._decode = tuple
+
+    def _exhausted(self):
+        """Release a forward-only result set once all its rows have been fetched, or raise
+        OperationalError if the step was interrupted instead"""
+        if self._conn._interrupted:
+            raise self._abort()
+        if self.forward_only:
+            self._active = False
+            self.qt_query.finish()
+            self.qt_query = self._idle_query
+            self._conn._leave()
+
+    def _abort(self) -> OperationalError:
+        """Release the current statement, interrupted by Connection.interrupt() or the progress
+        handler, and return the exception to raise"""
+        self._release()
+        return self._conn._interruption()
+
+    def _emit_event(self):
+        """Pass the profile of the last statement to the statement callback"""
+        event, self._event = self._event, None
+        callback = self._conn._statement_callback
+        if callback is not None:
+            _call_back(callback, StatementEvent(*event, qt_compat.QT_API))
+
+    def _timed_fetch(self, nrows: Callable[[Any], int], fetch: Callable, *args) -> Any:
+        """Call a fetch method and add its time and number of rows to the statement profile"""
+        event = self._event
+        t0 = perf_counter()
+        res = fetch(self, *args)
+        event[4] += perf_counter() - t0
+        event[5] += nrows(res)
+        if not self._active:
+            self._emit_event()
+        return res
+
+    def _row_schema(self) -> _RowSchema:
+        """Column names of the current result set, shared by its Row objects"""
+        if self._schema is None:
+            desc = self.description or ()
+            self._schema = _RowSchema(tuple(d[0] for d in desc))
+        return self._schema
+
+    def _fetch_row(self):
+        row = self._decode()
+        row_factory = self.row_factory
+        return row if row_factory is None else row_factory(self, row)
 
     def fetchone(self) -> Any:
         """If row_factory is None, return the next row query result set as a tuple. Else, pass it to
         the row factory and return its result. Return None if no more data is available.
         """
+        if self._event is not None:
+            return self._timed_fetch(_count_row, Cursor._fetchone)
+        return self._fetchone()
+
+    def _fetchone(self) -> Any:
+        if not self._active:
+            return None
+        conn = self._conn
+        if conn._watch and conn._on_step():
+            raise self._abort()
         if self.qt_query.next():
-            return self._fetch_tuple()
+            return self._fetch_row()
+        self._exhausted()
 
     def fetchmany(self, size: int | None = 0) -> List[Any]:
         """Return the next set of rows of a query result as a list.
@@ -363,29 +1825,244 @@ class Cursor(Iterator):
 
         if size <= 0:
             size = self.arraysize
-
-        q = self.qt_query
-
-        def fetch():
-            i = 0
-            while q.next() and i < size:
-                yield self._fetch_tuple()
-                i += 1
-
-        return [row for row in fetch()]
+        if self._event is not None:
+            return self._timed_fetch(len, Cursor._fetchmany, size)
+        return self._fetchmany(size)
+
+    def _fetchmany(self, size: int) -> List[Any]:
+        if not self._active:
+            return []
+        conn = self._conn
+        next_row = self.qt_query.next
+        decode = self._decode
+        row_factory = self.row_factory
+        rows = []
+        append = rows.append
+        for _ in range(size):
+            if conn._watch and conn._on_step():
+                raise self._abort()
+            if not next_row():
+                self._exhausted()
+                break
+            row = decode()
+            append(row if row_factory is None else row_factory(self, row))
+
+        return rows
 
     def fetchall(self) -> List[Any]:
         """Return all (remaining) rows of a query result as a list.
 
         Return an empty list if no rows are available.
         """
-        q = self.qt_query
+        if self._event is not None:
+            return self._timed_fetch(len, Cursor._fetchall)
+        return self._fetchall()
+
+    def _fetchall(self) -> List[Any]:
+        if not self._active:
+            return []
+        conn = self._conn
+        next_row = self.qt_query.next
+        decode = self._decode
+        row_factory = self.row_factory
+        rows = []
+        append = rows.append
+        if row_factory is None:
+            while True:
+                if conn._watch and conn._on_step():
+                    raise self._abort()
+                if not next_row():
+                    break
+                append(decode())
+        else:
+            while True:
+                if conn._watch and conn._on_step():
+                    raise self._abort()
+                if not next_row():
+                    break
+                append(row_factory(self, decode()))
+
+        self._exhausted()
+        return rows
+
+    def fetchmany_columns(
+        self, size: int | None = 0, as_dict: bool = False
+    ) -> List[Any] | dict[str, Any]:
+        """Return the next set of rows of a query result as NumPy arrays, one per column.
+
+        Requires NumPy. A column of integers is returned as an int64 array and a column of floats
+        as a float64 array (NULLs are converted to NaN). All the other columns, including
+        integer columns containing NULLs, are returned as object arrays. With detect_types, a column
+        with a converter is returned as an object array of the converted values, as fetchall()
+        returns them.
+
+        :param size: The number of rows to fetch. If not given, arraysize determines the number of
+                     rows to be fetched. If fewer than size rows are available, as many rows as are
+                     available are returned.
+        :type size: int | None, optional
+        :param as_dict: True to return a dict of arrays keyed by the column names, defaults to False
+        :type as_dict: bool, optional
+        :return: list of column arrays or dict of column name-array pairs
+        :rtype: list[numpy.ndarray] | dict[str, numpy.ndarray]
+        """
+        if not size or size <= 0:
+            size = self.arraysize
+        return self._fetch_columns(size, as_dict)
+
+    def fetch_columns(self, as_dict: bool = False) -> List[Any] | dict[str, Any]:
+        """Return all (remaining) rows of a query result as NumPy arrays, one per column.
+
+        Requires NumPy. The arrays are filled in place and grown geometrically as the rows are
+        fetched. See fetchmany_columns() for the array data types.
+
+        :param as_dict: True to return a dict of arrays keyed by the column names, defaults to False
+        :type as_dict: bool, optional
+        :return: list of column arrays or dict of column name-array pairs
+        :rtype: list[numpy.ndarray] | dict[str, numpy.ndarray]
+        """
+        return self._fetch_columns(None, as_dict)
+
+    def _fetch_columns(self, size: int | None, as_dict: bool) -> List[Any] | dict[str, Any]:
+        if self._event is not None:
+            return self._timed_fetch(_count_column_rows, Cursor._fetch_column_arrays, size, as_dict)
+        return self._fetch_column_arrays(size, as_dict)
+
+    def _fetch_column_arrays(
+        self, size: int | None, as_dict: bool
+    ) -> List[Any] | dict[str, Any]:
+        np = _import_numpy()
 
-        def fetch():
-            while q.next():
-                yield self._fetch_tuple()
+        r = self._record
+        n = 0 if r is None else r.count()
+        q = self.qt_query
+        value = q.value
+        capacity = _COLUMN_CHUNK_SIZE if size is None else size
+        cols = [None] * n
+        kinds = [None] * n
+
+        names = [d[0] for d in self.description] if n and as_dict else []
+        conn = self._conn
+        plain = range(n)
+        converted = []
+        if self._columns is not None:
+            convs = _column_converters(conn._detect_types, *self._columns)
+            plain = [i for i, conv in enumerate(convs) if conv is None]
+            converted = [(i, conv) for i, conv in enumerate(convs) if conv is not None]
+            for i, _ in converted:
+                cols[i], kinds[i] = np.empty(capacity, dtype=object), object
+        is_null = q.isNull
+        QByteArray = qt_compat.QtCore.QByteArray
+
+        nrows = 0
+        while n and self._active and (size is None or nrows < size):
+            if conn._watch and conn._on_step():
+                raise self._abort()
+            if not q.next():
+                self._exhausted()
+                break
+            if nrows == capacity:
+                capacity *= 2
+                for a in cols:
+                    a.resize(capacity, refcheck=False)
+            for i in plain:
+                v = value(i)
+                if type(v) is kinds[i]:
+                    cols[i][nrows] = v
+                else:
+                    _store_column_value(np, q, cols, kinds, i, nrows, v, capacity)
+            # decoded as by fetchall(), and converted
+            for i, conv in converted:
+                v = value(i)
+                if type(v) is QByteArray:
+                    v = v.data()
+                elif v == "" and is_null(i):
+                    v = None
+                cols[i][nrows] = None if v is None else _convert_value(conv, v)
+            nrows += 1
+
+        for i, a in enumerate(cols):
+            if a is None:
+                cols[i] = np.empty(0, dtype=object)
+            else:
+                a.resize(nrows, refcheck=False)
+
+        if as_dict:
+            return dict(zip(names, cols))
+        return cols
+
+    def scroll(self, value: int, mode: Literal["relative", "absolute"] = "relative"):
+        """Scroll the cursor in the result set to a new position (DB API extension).
+
+        The new position is the index of the next row to fetch, from 0 to the number of rows (after
+        the last row). A scrollable cursor (forward_only False) is moved with Qt's random access
+        to the result set, without executing the query again. A forward-only cursor can only move
+        forward, skipping the rows without decoding them.
+
+        :param value: the number of rows to move by, or the new position
+        :type value: int
+        :param mode: "relative" to move from the current position, or "absolute", defaults to
+                     "relative"
+        :type mode: str, optional
+        :raises ProgrammingError: If there is no result set, or mode is unknown.
+        :raises IndexError: If the new position is out of the result set. A forward-only result set
+                            is then released.
+        :raises NotSupportedError: To move a forward-only cursor backwards.
+        """
+        if mode not in ("relative", "absolute"):
+            raise ProgrammingError(f"unknown scroll mode: {mode!r}")
+        if self._record is None:
+            raise ProgrammingError("no result set to scroll")
+        current = self.rownumber
+        if current is None:  # all the rows of a forward-only result set were fetched
+            raise IndexError("scroll destination out of the result set")
+        target = current + value if mode == "relative" else value
+        if target == current:
+            return
+        if self.forward_only and target < current:
+            raise NotSupportedError("a forward-only cursor cannot scroll backwards")
 
-        return [row for row in fetch()]
+        q = self.qt_query
+        at = q.at()
+        # rows are fetched by moving to the next one, so stay just before the target row
+        if target > 0 and q.seek(target - 1):
+            return
+        if target == 0:
+            q.seek(_BEFORE_FIRST_ROW)
+            return
+        if self.forward_only:
+            self._exhausted()
+        elif at >= 0:
+            q.seek(at)
+        elif at == _BEFORE_FIRST_ROW:
+            q.seek(_BEFORE_FIRST_ROW)
+        else:
+            q.last()
+            q.next()
+        raise IndexError("scroll destination out of the result set")
+
+    def fetch_window(self, start: int, count: int) -> List[Any]:
+        """Return count rows of a query result from the row at index start, as fetchmany().
+
+        The window may be fewer than count rows at the end of the result set, and it is empty past
+        its end. Windows of a scrollable cursor (forward_only False) can be fetched in any order,
+        without executing the query again. With a forward-only cursor, start must not be before
+        rownumber.
+
+        :param start: index of the first row, from 0
+        :type start: int
+        :param count: maximum number of rows
+        :type count: int
+        :raises NotSupportedError: If the cursor is forward-only and start is before rownumber.
+        :return: fetched rows
+        :rtype: list[Any]
+        """
+        if start < 0 or count < 0:
+            raise ValueError("start and count must not be negative")
+        try:
+            self.scroll(start, "absolute")
+        except IndexError:
+            return []
+        return self.fetchmany(count) if count else []
 
     def close(self):
         """Close the cursor now (rather than whenever __del__ is called).
@@ -395,7 +2072,7 @@ class Cursor(Iterator):
 
         """
 
-        self.qt_query.finish()
+        self._release()
 
     @property
     def connection(self) -> Connection:
@@ -419,25 +2096,28 @@ class Cursor(Iterator):
 
         To remain compatible with the Python DB API, it returns a 7-tuple for each column where the
         last six items of each tuple are None. It is set for SELECT statements without any matching
-        rows as well."""
-
-        q = self.qt_query
-        i = q.at()
-        if i in (QtSql.QSql.BeforeFirstRow, QtSql.QSql.AfterLastRow) and not q.last():
-            raise DatabaseError("No rows returned by the last query")
-
-        r = q.record()
-        res = tuple(
-            (r.fieldName(k), None, None, None, None, None, None)
-            for k in range(r.count())
-        )
-
-        if i == QtSql.QSql.BeforeFirstRow:
-            q.seek(-1)
-        elif i == QtSql.QSql.AfterLastRow:
-            q.seek(1, True)
-
-        return res
+        rows as well. It is None if the last query returned no result set.
+
+        The column names are taken from the record of the prepared statement, so the cursor
+        position is not affected. If the connection detects types, the second item of each tuple
+        (type_code) is the declared type of the column, or None, and with PARSE_COLNAMES, the
+        column names are stripped of their types."""
+
+        if self._description is None and self._columns is not None:
+            names, decltypes = self._columns
+            if self._conn._detect_types & PARSE_COLNAMES:
+                names = map(_description_name, names)
+            self._description = tuple(
+                (name, decltype, None, None, None, None, None)
+                for name, decltype in zip(names, decltypes)
+            )
+        elif self._description is None and self._record is not None:
+            r = self._record
+            self._description = tuple(
+                (r.fieldName(k), None, None, None, None, None, None)
+                for k in range(r.count())
+            )
+        return self._description
 
     @property
     def lastrowid(self) -> int | None:
@@ -448,8 +2128,7 @@ class Cursor(Iterator):
         the value of lastrowid is left unchanged. The initial value of lastrowid is None.
         """
 
-        # TODO - create a private property to store these results after execution
-        return self.qt_query.lastInsertId()
+        return self._lastrowid
 
     @property
     def rowcount(self) -> int | None:
@@ -460,8 +2139,28 @@ class Cursor(Iterator):
         to completion. This means that any resulting rows must be fetched in order for rowcount to
         be updated.
         """
-        # TODO - create a private property to store these results after execution
-        return self.qt_query.size()
+        return self._rowcount
+
+    @property
+    def rownumber(self) -> int | None:
+        """Read-only attribute that provides the index of the cursor in the result set, i.e., the
+        index of the next row to fetch, from 0 (DB API extension).
+
+        It is None if there is no result set, and once all the rows of a forward-only result set
+        have been fetched, as it is then released.
+        """
+        if not self._active:
+            return None
+        q = self.qt_query
+        at = q.at()
+        if at == _BEFORE_FIRST_ROW:
+            return 0
+        if at == _AFTER_LAST_ROW:
+            # the number of rows of a scrollable result set
+            n = q.at() + 1 if q.last() else 0
+            q.next()
+            return n
+        return at + 1
 
 
 class Connection:
@@ -487,13 +2186,50 @@ class Connection:
         """This read-only attribute corresponds to the low-level SQLite autocommit mode.
 
         True if a transaction is active (there are uncommitted changes), False otherwise.
+
+        The QSQLITE driver does not expose sqlite3_get_autocommit(), so the state is tracked from
+        the transaction control statements executed on the connection.
         """
-        raise NotImplementedError()
+        return self._begun or bool(self._savepoints)
+
+    @property
+    def isolation_level(self) -> str | None:
+        """Controls the legacy transaction handling mode. If set to None, transactions are never
+        implicitly opened. If set to one of "DEFERRED", "IMMEDIATE", or "EXCLUSIVE", corresponding
+        to the underlying SQLite transaction behaviour, implicit transaction management is
+        performed: a BEGIN statement is executed before INSERT, UPDATE, DELETE, and REPLACE
+        statements if no transaction is open.
+
+        If not overridden by the isolation_level parameter of connect(), the default is "", which
+        is an alias for "DEFERRED". Setting it to None commits any pending transaction.
+
+        This attribute has no effect unless autocommit is LEGACY_TRANSACTION_CONTROL.
+        """
+        return self._isolation_level
+
+    @isolation_level.setter
+    def isolation_level(self, value: str | None):
+        if value is None:
+            if self._autocommit == LEGACY_TRANSACTION_CONTROL and self.in_transaction:
+                self._control("COMMIT")
+        elif not isinstance(value, str):
+            raise TypeError("isolation_level must be str or None")
+        elif value.upper() not in _ISOLATION_LEVELS:
+            raise ValueError(
+                "isolation_level string must be '', 'DEFERRED', 'IMMEDIATE', or 'EXCLUSIVE'"
+            )
+        else:
+            value = value.upper()
+        self._isolation_level = value
+        self._update_begin()
 
     @property
     def total_changes(self) -> int:
         """Return the total number of database rows that have been modified, inserted, or deleted since the database connection was opened."""
-        raise NotImplementedError()
+        q = qt_compat.QtSql.QSqlQuery("SELECT total_changes()", self.qt_database)
+        if not q.next():
+            raise DatabaseError(q.lastError().text())
+        return q.value(0)
 
     @property
     def autocommit(self) -> int:
@@ -511,38 +2247,69 @@ class Connection:
 
         Changing autocommit to False will open a new transaction, and changing it to True will commit any pending transaction.
         """
-        return True
+        return self._autocommit
 
     @autocommit.setter
     def autocommit(self, val: int):
-        raise NotImplementedError()
-
-    _cnt: int = 0
+        self._check_thread()
+        if val is not True and val is not False and val != LEGACY_TRANSACTION_CONTROL:
+            raise ValueError(
+                "autocommit must be True, False, or sqlite3.LEGACY_TRANSACTION_CONTROL"
+            )
+        if val is False:
+            if not self.in_transaction:
+                self._control("BEGIN")
+        elif val is True:
+            if self.in_transaction:
+                self._control("COMMIT")
+        self._autocommit = val
+        self._update_begin()
+
+    _ids = count()
 
     def __init__(
         self,
         database: PathLike,
         timeout: float = 5.0,
         detect_types: int = 0,
-        isolation_level: str | None = "DEFERRED",
+        isolation_level: str | None = "",
         check_same_thread: bool = True,
         factory: type[Connection] | None = Connection,
         cached_statements: int = 128,
         uri: bool = False,
         *,
-        autocommit: bool = True,
+        autocommit: bool = LEGACY_TRANSACTION_CONTROL,
+        profile: str | None = None,
+        pragmas: Mapping[str, Any] | None = None,
     ):
-        self.isolation_level: str | None = (
-            isolation_level  # one of '', 'DEFERRED', 'IMMEDIATE' or 'EXCLUSIVE'
-        )
-
-        name = f"con{self._cnt}"
-        Connection._cnt += 1
-        con = QtSql.QSqlDatabase.addDatabase("QSQLITE", name)
+        if autocommit is not True and autocommit is not False:
+            if autocommit != LEGACY_TRANSACTION_CONTROL:
+                raise ValueError(
+                    "autocommit must be True, False, or sqlite3.LEGACY_TRANSACTION_CONTROL"
+                )
+        self._autocommit = autocommit
+        self._detect_types = int(detect_types)
+        self._schema_generation = 0  # incremented by the schema changes through the connection
+        self._decltypes = {}  # declared types of the columns by table, for detect_types
+        self._trace_callback = None
+        self._statement_callback = None
+        self._callbacks = {}  # ctypes callbacks of the user-defined functions and collations
+        self._interrupted = False  # set by interrupt()
+        self._running = 0  # the number of statements executing or holding a pending result set
+        self._progress_handler = None
+        self._progress_steps = 0  # the number of steps between calls of the progress handler
+        self._countdown = 0  # the number of steps left before the next call
+        self._watch = False  # check for an interruption at each step
+        self._begun = False  # BEGIN executed
+        self._savepoints = []  # names of the open savepoints, outermost first
+        self._thread = None
+        self.isolation_level = isolation_level
+
+        name = f"con{next(self._ids)}"
+        con = qt_compat.QtSql.QSqlDatabase.addDatabase("QSQLITE", name)
         con.setDatabaseName(str(database))
-
-        if not (autocommit or con.transaction()):
-            raise DatabaseError("QtSQL does not support transactions")
+        self._statements = _StatementCache(con, cached_statements)
+        self._controls = {}  # transaction control statements
 
         opts = {
             "QSQLITE_BUSY_TIMEOUT": round(timeout * 1000),
@@ -551,46 +2318,180 @@ class Connection:
         con.setConnectOptions(";".join([f"{k}={v}" for k, v in opts.items()]))
 
         if not con.open():
+            del con, self._statements  # QSqlDatabase references
+            qt_compat.QtSql.QSqlDatabase.removeDatabase(name)
             raise DatabaseError(f"{database} failed to open.")
+        # the sqlite3 handle, for interrupt() from other threads
+        api = _capi.api()
+        self._handle = None if api is None else _capi.handle(con)
+        del con
 
         self.qt_name = name
+        self._thread = threading.get_ident() if check_same_thread else None
+
+        settings = {}
+        if profile is not None:
+            try:
+                settings.update(PRAGMA_PROFILES[profile])
+            except KeyError:
+                self._remove()
+                raise ValueError(f"unknown profile: {profile!r}") from None
+        settings.update(pragmas or {})
+        self.profile = profile
+        self._pragmas = settings
+        try:
+            self._apply_pragmas(settings)
+        except Error:
+            self._remove()
+            raise
+
+        if autocommit is False:
+            self._control("BEGIN")
+
+    def _apply_pragmas(self, settings: Mapping[str, Any]):
+        """Set the PRAGMAs, and check them by reading them back"""
+        db = self.qt_database
+        in_memory = not _database_file(db, "main")
+        for name, value in settings.items():
+            _run(db, _pragma_sql(name, value))
+        for name, value in settings.items():
+            rows = _run(db, f"PRAGMA {name}")
+            if not rows:
+                continue  # not applicable, e.g., mmap_size of an in-memory database
+            effective = rows[0][0]
+            if in_memory and name.lower() == "journal_mode" and effective == "memory":
+                continue  # the only journal mode of an in-memory database, besides OFF
+            if not _pragma_applied(name, value, effective):
+                raise OperationalError(
+                    f"PRAGMA {name} is {effective!r} after setting it to {value!r}"
+                )
+
+    @property
+    def pragmas(self) -> dict[str, Any]:
+        """The current values of the PRAGMAs set by the profile and pragmas arguments of connect(),
+        as read back from SQLite (None if not applicable to the database)."""
+        db = self.qt_database
+        values = {}
+        for name in self._pragmas:
+            rows = _run(db, f"PRAGMA {name}")
+            values[name] = rows[0][0] if rows else None
+        return values
+
+    def _update_begin(self):
+        """Set the statement to open a transaction implicitly before DML statements, if any"""
+        self._implicit_begin = (
+            None
+            if self._autocommit != LEGACY_TRANSACTION_CONTROL or self._isolation_level is None
+            else f"BEGIN {self._isolation_level}"
+        )
+
+    def _begin_implicit(self):
+        """Open a transaction before a DML statement according to isolation_level"""
+        if self._implicit_begin and not self.in_transaction:
+            self._control(self._implicit_begin)
+
+    def _control(self, sql: str):
+        """Execute a transaction control statement, prepared aside of the statement cache"""
+        if self._trace_callback is not None:
+            _call_back(self._trace_callback, sql)
+        t0 = perf_counter()
+        st = self._controls.get(sql)
+        if st is None:
+            if len(self._controls) >= 32:  # only savepoints with custom names add up
+                self._controls.clear()
+            st = self._controls[sql] = _Statement(self.qt_database, sql)
+        q = st.query
+        t1 = perf_counter()
+        if not q.exec():
+            msg = q.lastError().text()
+            if "no transaction is active" not in msg:
+                raise OperationalError(msg)
+            # the transaction was already rolled back by SQLite, e.g., by ON CONFLICT ROLLBACK
+        q.finish()
+        if self._statement_callback is not None:
+            event = (sql, 0, t1 - t0, perf_counter() - t1, 0.0, -1, qt_compat.QT_API)
+            _call_back(self._statement_callback, StatementEvent(*event))
+        self._track_transaction(st.verb, sql)
+
+    def _track_transaction(self, verb: str, sql: str):
+        """Update in_transaction after a transaction control statement succeeded"""
+        if verb == "ROLLBACK":
+            self._schema_changed()  # the rollback may have reverted schema changes
+        if verb == "BEGIN":
+            self._begun = True
+        elif verb in ("COMMIT", "END"):
+            self._begun = False
+            self._savepoints.clear()
+        else:
+            m = _savepoint_re.match(sql)
+            to, name = m.groups() if m else (None, None)
+            name = name and _savepoint_name(name)
+            savepoints = self._savepoints
+            if verb == "SAVEPOINT":
+                if name:
+                    savepoints.append(name)
+            elif verb == "ROLLBACK" and not to:
+                self._begun = False
+                savepoints.clear()
+            elif name in savepoints:
+                # RELEASE or ROLLBACK TO the innermost savepoint with the name
+                i = len(savepoints) - 1 - savepoints[::-1].index(name)
+                del savepoints[i if verb == "RELEASE" else i + 1 :]
+
+    def _schema_changed(self):
+        """Forget the declared types of the columns looked up for detect_types"""
+        self._schema_generation += 1
+        self._decltypes.clear()
+
+    def _check_thread(self):
+        if self._thread is not None and self._thread != threading.get_ident():
+            raise ProgrammingError(
+                "SQLite objects created in a thread can only be used in that same thread. "
+                f"The object was created in thread id {self._thread} and this is thread id "
+                f"{threading.get_ident()}."
+            )
 
     @property
-    def qt_database(self) -> QtSql.QSqlDatabase:
-        return QtSql.QSqlDatabase.database(self.qt_name)
+    def qt_database(self) -> qt_compat.QtSql.QSqlDatabase:
+        return qt_compat.QtSql.QSqlDatabase.database(self.qt_name)
 
     def cursor(self, factory=Cursor) -> Cursor:
         """Create and return a Cursor object.
 
         The cursor method accepts a single optional parameter factory. If supplied, this must be a
         callable returning an instance of Cursor or its subclasses."""
+        self._check_thread()
         return factory(self)
 
     def blobopen(
         self,
         table: str,
         column: str,
-        row: str,
+        row: int,
         *,
         readonly: bool = False,
         name: str = "main",
     ) -> Blob:
         """Open a Blob handle to an existing BLOB.
 
+        Reading costs a query per read, but writing the BLOB rewrites it as a whole, so writes are
+        buffered until the blob is read, flushed, or closed (see Blob).
+
         :param table: The name of the table where the blob is located.
         :type table: str
         :param column: The name of the column where the blob is located.
         :type column: str
-        :param row: The name of the row where the blob is located.
-        :type row: str
+        :param row: The rowid of the row where the blob is located.
+        :type row: int
         :param readonly: Set to True if the blob should be opened without write permissions. Defaults to False.
         :type readonly: bool, optional
         :param name: The name of the database where the blob is located. Defaults to "main".
         :type name: str, optional
+        :raises OperationalError: When trying to open a blob in a WITHOUT ROWID table.
         :return: Blob handle
         :rtype: Blob
         """
-        raise NotImplementedError()
+        return Blob(self, table, column, row, readonly, name)
 
     def commit(self):
         """Commit any pending transaction to the database.
@@ -599,8 +2500,11 @@ class Connection:
         If autocommit is False, a new transaction is implicitly opened if a pending transaction was
         committed by this method."""
 
-        if self.qt_database.transaction() and not self.qt_database.commit():
-            raise DatabaseError(self.qt_database.lastError().text())
+        self._check_thread()
+        if self._autocommit is not True and self.in_transaction:
+            self._control("COMMIT")
+            if self._autocommit is False:
+                self._control("BEGIN")
 
     def rollback(self):
         """Roll back to the start of any pending transaction.
@@ -609,8 +2513,37 @@ class Connection:
         autocommit is False, a new transaction is implicitly opened if a pending transaction was
         rolled back by this method."""
 
-        if self.qt_database.transaction() and not self.qt_database.rollback():
-            raise DatabaseError(self.qt_database.lastError().text())
+        self._check_thread()
+        if self._autocommit is not True and self.in_transaction:
+            self._control("ROLLBACK")
+            if self._autocommit is False:
+                self._control("BEGIN")
+
+    @contextmanager
+    def savepoint(self, name: str | None = None) -> Iterator[str]:
+        """Context manager running its block within a SAVEPOINT.
+
+        The savepoint is released on exit, or rolled back to and released if the block raises an
+        exception. Savepoints nest, and may be used whether or not a transaction is open. Outside
+        of a transaction, releasing the outermost savepoint commits its changes.
+
+        :param name: The name of the savepoint, defaults to a name unique to its nesting level
+        :type name: str | None, optional
+        :return: The name of the savepoint
+        :rtype: str
+        """
+        self._check_thread()
+        if name is None:
+            name = f"_sqlite3_qt_sp{len(self._savepoints)}"
+        quoted = _quote(name)
+        self._control(f"SAVEPOINT {quoted}")
+        try:
+            yield name
+        except BaseException:
+            self._control(f"ROLLBACK TO {quoted}")
+            self._control(f"RELEASE {quoted}")
+            raise
+        self._control(f"RELEASE {quoted}")
 
     def close(self):
         """Close the database connection.
@@ -619,7 +2552,32 @@ class Connection:
         True or LEGACY_TRANSACTION_CONTROL, no implicit transaction control is executed. Make sure
         to commit() before closing to avoid losing pending changes."""
 
+        self._check_thread()
+        if self._autocommit is False and self.in_transaction and self.qt_database.isOpen():
+            self._control("ROLLBACK")
+        self._statements.clear()
+        self._controls.clear()
+        self._handle = None
         self.qt_database.close()
+        self._begun = False
+        self._savepoints.clear()
+
+    def _remove(self):
+        """Close the connection and remove its QSqlDatabase connection from Qt's registry.
+
+        The connection is unusable afterwards. Must be called from the thread which opened it."""
+        self.close()
+        del self._statements  # holds a QSqlDatabase reference
+        qt_compat.QtSql.QSqlDatabase.removeDatabase(self.qt_name)
+
+    def statement_cache_info(self) -> StatementCacheInfo:
+        """Report the prepared statement cache statistics.
+
+        :return: named tuple of hits, misses, evictions, maxsize (``cached_statements``), and
+                 currsize (the number of statements currently cached)
+        :rtype: StatementCacheInfo
+        """
+        return self._statements.info()
 
     def execute(self, sql: str, parameters: Any = None) -> Cursor:
         """Create a new Cursor object and call execute() on it with the given sql and parameters.
@@ -637,7 +2595,7 @@ class Connection:
         cursor.executemany(sql, parameters)
         return cursor
 
-    def executescript(self, sql_script: str) -> Cursor:
+    def executescript(self, sql_script: str | TextIO) -> Cursor:
         """Create a new Cursor object and call executescript() on it with the given sql_script.
 
         Return the new cursor object."""
@@ -645,6 +2603,25 @@ class Connection:
         cursor.executescript(sql_script)
         return cursor
 
+    def _native(self) -> tuple[_capi.SQLiteAPI, int]:
+        """Return the SQLite C API and the handle of the connection"""
+        self._check_thread()
+        api = _capi.api()
+        handle = self._handle
+        if api is None or handle is None:
+            raise NotSupportedError(
+                f"the SQLite C API of the QSQLITE driver is not accessible with {qt_compat.QT_API} "
+                "(a PyQt binding and a Qt build using a shared SQLite library are required)"
+            )
+        return api, handle
+
+    def _keep(self, key: tuple, callbacks: tuple | None):
+        """Keep the ctypes callbacks registered with SQLite alive, replacing those of key"""
+        if callbacks is None:
+            self._callbacks.pop(key, None)
+        else:
+            self._callbacks[key] = callbacks
+
     def create_function(
         self,
         name: str,
@@ -653,36 +2630,236 @@ class Connection:
         *,
         deterministic: bool = False,
     ):
-        """Create or remove a user-defined SQL function."""
-        raise NotImplementedError()
+        """Create or remove a user-defined SQL function.
+
+        The function is registered on the sqlite3 handle of the QSQLITE driver through ctypes,
+        which requires a PyQt binding and a QSQLITE plugin exporting the SQLite C API, i.e., a Qt
+        built against a shared system SQLite library (as provided by Linux distributions or
+        conda). The Qt of the PyQt6/PySide6 wheels installed by pip links SQLite statically, so
+        with a standard install this method (as create_aggregate(), create_window_function(), and
+        create_collation()) raises NotSupportedError.
+
+        :param name: The name of the SQL function.
+        :type name: str
+        :param narg: The number of arguments the SQL function can accept. If -1, it may take any
+                     number of arguments.
+        :type narg: int
+        :param func: A callable that is called when the SQL function is invoked. The callable
+                     must return a type natively supported by SQLite. Set to None to remove an
+                     existing SQL function.
+        :type func: Callable | None
+        :param deterministic: If True, the created SQL function is marked as deterministic, which
+                              allows SQLite to perform additional optimizations, e.g., to use it
+                              in indexes. Defaults to False.
+        :type deterministic: bool, optional
+        """
+        api, handle = self._native()
+        callbacks = api.create_function(
+            handle, name, narg, func, deterministic, _report_callback_error
+        )
+        self._keep(("function", name.lower(), narg), callbacks)
 
     def create_aggregate(self, name: str, n_arg: int, aggregate_class: Callable | None):
-        """Create or remove a user-defined SQL aggregate function."""
-        raise NotImplementedError()
+        """Create or remove a user-defined SQL aggregate function.
+
+        See create_function() for the requirements.
+
+        :param name: The name of the SQL aggregate function.
+        :type name: str
+        :param n_arg: The number of arguments the SQL aggregate function can accept. If -1, it may
+                      take any number of arguments.
+        :type n_arg: int
+        :param aggregate_class: A class with a step() method, which accepts n_arg arguments, and a
+                                finalize() method, which returns the final result of the
+                                aggregate. Set to None to remove an existing SQL aggregate
+                                function.
+        :type aggregate_class: Callable | None
+        """
+        api, handle = self._native()
+        callbacks = api.create_aggregate(
+            handle, name, n_arg, aggregate_class, False, _report_callback_error
+        )
+        self._keep(("function", name.lower(), n_arg), callbacks)
 
     def create_window_function(
-        self, name: str, num_params: Literal[1], aggregate_class: Callable | None
+        self, name: str, num_params: int, aggregate_class: Callable | None
     ):
-        """Create or remove a user-defined aggregate window function."""
-        raise NotImplementedError()
+        """Create or remove a user-defined aggregate window function.
+
+        See create_function() for the requirements.
+
+        :param name: The name of the SQL aggregate window function to create or remove.
+        :type name: str
+        :param num_params: The number of arguments the SQL aggregate window function can accept.
+                           If -1, it may take any number of arguments.
+        :type num_params: int
+        :param aggregate_class: A class with the methods step(), value(), inverse(), and
+                                finalize(), or None to remove an existing SQL aggregate window
+                                function.
+        :type aggregate_class: Callable | None
+        """
+        api, handle = self._native()
+        callbacks = api.create_window_function(
+            handle, name, num_params, aggregate_class, False, _report_callback_error
+        )
+        self._keep(("function", name.lower(), num_params), callbacks)
 
     def create_collation(self, name: str, callback: Callable | None):
-        """Create a collation named name using the collating function callable."""
-        raise NotImplementedError()
+        """Create a collation named name using the collating function callable.
+
+        callback is passed two string arguments, and it should return an integer: 1 if the first
+        is ordered higher than the second, -1 if the first is ordered lower than the second, or 0
+        if they are ordered equal. See create_function() for the requirements.
+
+        :param name: The name of the collation.
+        :type name: str
+        :param callback: The collating function, or None to remove the collation.
+        :type callback: Callable | None
+        """
+        api, handle = self._native()
+        callbacks = api.create_collation(handle, name, callback, _report_callback_error)
+        self._keep(("collation", name.lower()), callbacks)
+
+    def _on_step(self, steps: int = 1) -> bool:
+        """Account for steps of the statements of the connection, and return True if the statement
+        is to be interrupted"""
+        if self._interrupted:
+            return True
+        handler = self._progress_handler
+        if handler is None:
+            self._watch = False
+            return False
+        self._countdown -= steps
+        if self._countdown > 0:
+            return False
+        self._countdown = self._progress_steps
+        try:
+            return bool(handler())
+        except Exception:
+            if _callback_tracebacks:
+                traceback.print_exc(file=sys.stderr)
+            return True
+
+    def _enter(self):
+        """Account for a statement starting"""
+        if not self._running and self._interrupted:
+            # requested while no statement was in progress
+            self._interruption()
+        self._running += 1
+
+    def _leave(self):
+        """Account for a statement done, and drop the interruption request once no statement is in
+        progress, as SQLite does"""
+        self._running -= 1
+        if not self._running and self._interrupted:
+            self._interruption()
+
+    def _interruption(self) -> OperationalError:
+        """Clear the interruption request, and return the exception to raise for it"""
+        self._interrupted = False
+        self._watch = self._progress_handler is not None
+        return OperationalError("interrupted")
+
+    def _error(self, q: qt_compat.QtSql.QSqlQuery) -> DatabaseError:
+        """Return the exception to raise for a failed statement"""
+        if self._interrupted:
+            return self._interruption()
+        return DatabaseError(q.lastError().text())
 
     def interrupt(self):
         """Call this method from a different thread to abort any queries that might be executing on
-        the connection. Aborted queries will raise an OperationalError."""
-        raise NotImplementedError()
+        the connection. Aborted queries will raise an OperationalError.
+
+        If the SQLite C API of the QSQLITE driver is accessible, the running step is aborted with
+        sqlite3_interrupt(). In any case, the request is also checked by the cursors of the
+        connection before each step of a statement: before each row is fetched, each parameter
+        batch of executemany() is executed, and each statement of executescript() is executed.
+
+        As with sqlite3, only the statements in progress are aborted: those executing, or with
+        rows pending to be fetched, and those started before all of them are done. The request has
+        no effect if no statement is in progress.
+        """
+        if not self._running:
+            return
+        self._interrupted = True
+        self._watch = True
+        handle = self._handle
+        if handle is not None:
+            _capi.api().interrupt(handle)
 
     def set_authorizer(self, authorizer_callback: Callable | None):
         raise NotImplementedError()
 
-    def set_progress_handler(self, progress_handler: Callable | None, n: int):
-        raise NotImplementedError()
+    def set_progress_handler(self, progress_handler: Callable[[], object] | None, n: int):
+        """Register callable progress_handler to be invoked for every n steps of the statements of
+        the connection.
 
-    def set_trace_callback(self, trace_callback: Callable | None):
-        raise NotImplementedError()
+        This is useful if you want to get called during long-running operations, e.g. to update a
+        GUI. If the callable returns a true value (or raises an exception), the statement is
+        aborted with OperationalError.
+
+        If the SQLite C API of the QSQLITE driver is accessible, the handler is registered with
+        sqlite3_progress_handler(), and n counts SQLite's virtual machine instructions. Otherwise,
+        the steps are counted by the cursors instead: one per row fetched, parameter set of
+        executemany(), or statement of executescript(), and a single long step cannot be aborted.
+
+        :param progress_handler: The callable to invoke, or None to clear the handler.
+        :type progress_handler: Callable[[], object] | None
+        :param n: The number of steps between the invocations. The handler is cleared if n is not
+                  positive.
+        :type n: int
+        """
+        if progress_handler is None or n <= 0:
+            progress_handler = None
+        api, handle = _capi.api(), self._handle
+        if api is not None and handle is not None:
+            self._check_thread()
+
+            def progress() -> bool:
+                try:
+                    stop = bool(progress_handler())
+                except Exception:
+                    _report_callback_error()
+                    stop = True
+                if stop:
+                    self._interrupted = True  # raised as OperationalError("interrupted")
+                return stop
+
+            handler = None if progress_handler is None else progress
+            self._keep(("progress",), api.set_progress_handler(handle, int(n), handler))
+            progress_handler = None
+        self._progress_handler = progress_handler
+        if progress_handler is not None:
+            self._progress_steps = self._countdown = int(n)
+        self._watch = self._interrupted or self._progress_handler is not None
+
+    def set_trace_callback(self, trace_callback: Callable[[str], object] | None):
+        """Register callable trace_callback to be invoked for each SQL statement executed.
+
+        The only argument passed to the callback is the statement (as str) being executed, with
+        the bound parameters expanded as SQL literals. Statements are traced as Cursor.execute(),
+        executemany() (once per parameter set), and executescript() (once per statement) pass them
+        to Qt, together with the transaction control statements executed implicitly. The
+        statements run internally, e.g., by Blob, are not traced.
+
+        Passing None as trace_callback will disable the trace callback. Exceptions raised in the
+        callback are ignored; use enable_callback_tracebacks() to print them.
+        """
+        self._trace_callback = trace_callback
+
+    def set_statement_callback(self, callback: Callable[[StatementEvent], object] | None):
+        """Register callable callback to be invoked with the profile of each SQL statement executed.
+
+        The callback is passed a StatementEvent, once the statement completes. A query completes
+        when all its rows are fetched, or when its cursor is closed, executes another statement,
+        or is garbage-collected. The statements are those passed to set_trace_callback(). As only
+        the time spent in the cursor methods is accounted for, the events of a query fetched
+        incrementally can be used as latency samples.
+
+        Passing None as callback will disable it. Exceptions raised in the callback are ignored;
+        use enable_callback_tracebacks() to print them.
+        """
+        self._statement_callback = callback
 
     def enable_load_extension(self, enable: bool):
         raise NotImplementedError()
@@ -690,8 +2867,25 @@ class Connection:
     def load_extension(self, name: str):
         raise NotImplementedError()
 
-    def iterdump(self) -> Generator:
-        raise NotImplementedError()
+    def iterdump(self, *, filter: str | None = None, batchsize: int = 1) -> Generator:
+        """Return an iterator to dump the database as SQL source code.
+
+        Useful when saving an in-memory database for later restoration. Similar to the .dump
+        command in the sqlite3 shell.
+
+        The statements are generated lazily, and the rows of each table are read by a forward-only
+        cursor, so that the memory used does not depend on the size of the database.
+
+        :param filter: An optional LIKE pattern for database objects to dump, e.g. prefix_%.
+                       If None (the default), all database objects will be included.
+        :type filter: str | None, optional
+        :param batchsize: The number of rows inserted by each INSERT statement. Defaults to 1.
+        :type batchsize: int, optional
+        :return: the SQL statements
+        :rtype: Generator
+        """
+        self._check_thread()
+        return _iterdump(self, filter, batchsize)
 
     def backup(
         self,
@@ -702,7 +2896,60 @@ class Connection:
         name: str = "main",
         sleep: float = 0.25,
     ):
-        raise NotImplementedError()
+        """Create a backup of an SQLite database.
+
+        Works even if the database is being accessed by other clients or concurrently by the same
+        connection.
+
+        The QSQLITE driver does not expose the SQLite backup API, so target attaches the database
+        file and copies it with SQL statements, starting over if the database is modified by any
+        connection meanwhile. A database in memory is first written to a temporary file with
+        VACUUM INTO, which cannot run within a transaction. Uncommitted changes are not copied.
+
+        :param target: The database connection to save the backup to.
+        :type target: Connection
+        :param pages: The number of pages to copy at a time. If equal to or less than 0, the
+                      entire database is copied in a single step. Defaults to -1.
+        :type pages: int, optional
+        :param progress: If set to a callable, it is invoked with three integer arguments for every
+                         backup iteration: the status of the last iteration, the remaining number
+                         of pages still to be copied, and the total number of pages. Defaults to
+                         None.
+        :type progress: Callable | None, optional
+        :param name: The name of the database to back up. Either "main" (the default) for the main
+                     database, "temp" for the temporary database, or the name of a custom database
+                     as attached using the ATTACH DATABASE SQL statement.
+        :type name: str, optional
+        :param sleep: The number of seconds to sleep between successive attempts to back up
+                      remaining pages. Defaults to 0.25.
+        :type sleep: float, optional
+        """
+        self._check_thread()
+        if not isinstance(target, Connection):
+            raise TypeError("target is not a Connection")
+        if target is self:
+            raise ValueError("target cannot be the same connection instance")
+        if progress is not None and not callable(progress):
+            raise TypeError("progress argument must be a callable")
+        target._check_thread()
+
+        db = target.qt_database
+        file = _database_file(self.qt_database, name)
+        target._statements.clear()
+        with _Snapshot(db, file or None) as snapshot:
+            changed = None
+            if file:
+                data_version = f"PRAGMA {_quote(snapshot.alias)}.data_version"
+                version = None
+
+                def changed() -> bool:
+                    nonlocal version
+                    last, version = version, _run(db, data_version)[0][0]
+                    return last is not None and last != version
+
+            else:
+                _run(self.qt_database, f"VACUUM {_quote(name)} INTO ?", snapshot.file)
+            _copy_database(db, snapshot.attach(), "main", pages, progress, sleep, changed)
 
     def setlimit(self, category: int, limit: int) -> int:
         raise NotImplementedError()
@@ -717,10 +2964,58 @@ class Connection:
         raise NotImplementedError()
 
     def serialize(self, *, name: str = "main") -> bytes:
-        raise NotImplementedError()
+        """Serialize a database into a bytes object.
 
-    def deserialize(self, data, *, name: str = "main"):
-        raise NotImplementedError()
+        For an ordinary on-disk database file, the serialization is just a copy of the disk file.
+        For an in-memory database or a "temp" database, the serialization is the same sequence of
+        bytes which would be written to disk if that database were backed up to disk.
+
+        The QSQLITE driver does not expose sqlite3_serialize(), so the database is written to a
+        temporary file with VACUUM INTO, which cannot run within a transaction.
+
+        :param name: The database name to be serialized. Defaults to "main".
+        :type name: str, optional
+        :return: the database image
+        :rtype: bytes
+        """
+        self._check_thread()
+        _database_file(self.qt_database, name)  # raises if no such database
+        with _Snapshot(self.qt_database) as snapshot:
+            _run(self.qt_database, f"VACUUM {_quote(name)} INTO ?", snapshot.file)
+            with open(snapshot.file, "rb") as f:
+                return f.read()
+
+    def deserialize(self, data: bytes | bytearray | memoryview, *, name: str = "main"):
+        """Deserialize a serialized database into a Connection.
+
+        The content of database name is replaced by the database serialized in data, e.g., by
+        serialize().
+
+        The QSQLITE driver does not expose sqlite3_deserialize(), so data is written to a temporary
+        file, which is attached and copied into the database name, replacing its content. This
+        cannot run within a transaction.
+
+        :param data: A serialized database.
+        :type data: bytes | bytearray | memoryview
+        :param name: The database name to deserialize into. Defaults to "main".
+        :type name: str, optional
+        :raises OperationalError: If the database connection is currently involved in a
+                                  transaction.
+        :raises DatabaseError: If data does not contain a valid SQLite database.
+        """
+        self._check_thread()
+        data = memoryview(data)
+        _database_file(self.qt_database, name)
+        self._statements.clear()
+        with _Snapshot(self.qt_database) as snapshot:
+            with open(snapshot.file, "wb") as f:
+                f.write(data)
+            try:
+                src = snapshot.attach()
+                _run(self.qt_database, f"SELECT count(*) FROM {_quote(src)}.sqlite_master")
+            except OperationalError as e:
+                raise DatabaseError(str(e)) from None
+            _copy_database(self.qt_database, src, name)
 
     def __call__(self, sql: str):
         raise NotImplementedError()
@@ -729,5 +3024,8 @@ class Connection:
         return self
 
     def __exit__(self, type, value, traceback):
-        self.commit()
+        if type is None:
+            self.commit()
+        else:
+            self.rollback()
         return False
@@ -0,0 +1,183 @@
+"""
+Background query executor for Qt UI frontends.
+
+A QueryExecutor opens its own connection in a QThread and runs the statements submitted with
+execute() there, in submission order. The rows of a query are delivered in batches through the
+rowsReady signal, queued to the thread of the executor (typically the GUI thread), so a view can
+be filled progressively while the event loop keeps running:
+
+    from sqlite3_qt.executor import QueryExecutor
+
+    executor = QueryExecutor("data.db", batch_size=500)
+    executor.rowsReady.connect(model.append_rows)
+    executor.finished.connect(lambda n: status.showMessage(f"{n} rows"))
+    executor.error.connect(status.showMessage)
+    executor.execute("SELECT * FROM data WHERE x > ?", (0,))
+    ...
+    executor.cancel()  # stop the running and pending queries
+    executor.close()
+"""
+
+from __future__ import annotations
+
+from typing_extensions import Any, Optional
+
+from . import dbapi2
+from .qt_compat import QtCore, Signal, Slot
+
+__all__ = ["QueryExecutor"]
+
+
+class _Worker(QtCore.QObject):
+    """Owns the connection of a QueryExecutor and runs its statements in the executor thread"""
+
+    rowsReady = Signal(object)
+    finished = Signal(int)
+    error = Signal(str)
+
+    def __init__(self, executor: QueryExecutor, database: Any, args: tuple, kwargs: dict):
+        super().__init__()
+        self._executor = executor
+        self._connect_args = (database, *args)
+        self._connect_kwargs = kwargs
+        self._con: dbapi2.Connection | None = None
+        self._request = 0  # the request in flight, or 0
+
+    @Slot()
+    def open(self):
+        try:
+            self._con = dbapi2.connect(*self._connect_args, **self._connect_kwargs)
+        except dbapi2.Error as e:
+            self.error.emit(str(e))
+
+    @Slot(int, str, object)
+    def run(self, request: int, sql: str, parameters: Any):
+        executor = self._executor
+        if executor._is_cancelled(request):
+            self.error.emit("interrupted")
+            return
+        if self._con is None:
+            self.error.emit("Cannot operate on a closed database.")
+            return
+
+        self._request = request
+        try:
+            cur = self._con.execute(sql, parameters)
+            if cur.description is None:
+                self.finished.emit(cur.rowcount)
+                return
+
+            nrows = 0
+            while True:
+                if executor._is_cancelled(request):
+                    cur.close()
+                    self.error.emit("interrupted")
+                    return
+                rows = cur.fetchmany(executor.batch_size)
+                if not rows:
+                    break
+                nrows += len(rows)
+                self.rowsReady.emit(rows)
+            self.finished.emit(nrows)
+        except dbapi2.Error as e:
+            self.error.emit(str(e))
+        finally:
+            self._request = 0
+
+    @Slot()
+    def close(self):
+        if self._con is not None:
+            self._con._remove()
+            self._con = None
+        QtCore.QThread.currentThread().quit()
+
+
+class QueryExecutor(QtCore.QObject):
+    """Runs SQL statements on its own connection in a background QThread.
+
+    Takes the same arguments as sqlite3_qt.connect() to open the connection, in addition to
+    batch_size and parent.
+
+    :param batch_size: The number of rows emitted per rowsReady signal, defaults to 500
+    :type batch_size: int, optional
+    :param parent: parent QObject, defaults to None
+    :type parent: QObject, optional
+    """
+
+    rowsReady = Signal(object)
+    """Emitted with a list of rows as they are fetched"""
+
+    finished = Signal(int)
+    """Emitted when a statement completes, with the number of rows fetched by a query or the
+    rowcount of a DML statement"""
+
+    error = Signal(str)
+    """Emitted with the error message when a statement fails, or "interrupted" when cancelled"""
+
+    _execRequested = Signal(int, str, object)
+    _closeRequested = Signal()
+
+    def __init__(
+        self,
+        database: Any,
+        *args,
+        batch_size: int = 500,
+        parent: Optional[QtCore.QObject] = None,
+        **kwargs,
+    ):
+        super().__init__(parent)
+        self.batch_size = batch_size
+        self._requests = 0
+        self._cancelled = 0
+
+        self._thread = QtCore.QThread(self)
+        self._worker = _Worker(self, database, args, kwargs)
+        self._worker.moveToThread(self._thread)
+
+        self._thread.started.connect(self._worker.open)
+        self._execRequested.connect(self._worker.run)
+        self._closeRequested.connect(self._worker.close)
+        self._worker.rowsReady.connect(self.rowsReady)
+        self._worker.finished.connect(self.finished)
+        self._worker.error.connect(self.error)
+
+        self._thread.start()
+
+    def _is_cancelled(self, request: int) -> bool:
+        return request <= self._cancelled
+
+    def execute(self, sql: str, parameters: Any = None) -> int:
+        """Queue a single SQL statement to be executed in the background thread.
+
+        :param sql: A single SQL statement.
+        :type sql: str
+        :param parameters: Python values to bind to placeholders in sql, defaults to None
+        :type parameters: Sequence | Mapping, optional
+        :return: request number, counting from 1
+        :rtype: int
+        """
+        self._requests += 1
+        self._execRequested.emit(self._requests, sql, parameters)
+        return self._requests
+
+    def cancel(self):
+        """Cancel the running statement and all the pending ones.
+
+        A running query stops before its next row, by Connection.interrupt(). Each cancelled
+        statement emits error with "interrupted". The statements queued after the call are not
+        affected."""
+        self._cancelled = self._requests
+        con = self._worker._con
+        if con is not None and self._worker._request:
+            con.interrupt()
+
+    def isRunning(self) -> bool:
+        """True until close() is called"""
+        return self._thread.isRunning()
+
+    def close(self):
+        """Cancel all the statements, close the connection, and stop the background thread."""
+        if self._thread.isRunning():
+            self.cancel()
+            self._closeRequested.emit()
+            self._thread.wait()
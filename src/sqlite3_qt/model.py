@@ -0,0 +1,226 @@
+"""
+Lazy table model over a query, for Qt item views.
+
+A CursorTableModel streams the rows of a query from a forward-only Cursor as the view asks for
+them (canFetchMore/fetchMore), and keeps only a window of recently used blocks of decoded rows.
+A block scrolled out of the window is dropped, and queried again when the view scrolls back to it:
+
+    from sqlite3_qt.model import CursorTableModel
+
+    model = CursorTableModel(
+        con.cursor(), "SELECT id, name, value FROM data ORDER BY id", key="id"
+    )
+    view.setModel(model)  # QTableView
+
+With a key column, whose values increase strictly in the order of the query results (e.g., a
+rowid or INTEGER PRIMARY KEY of the ORDER BY clause), a block is queried again from the key of its
+first row, at the cost of an index lookup. Without it, the block is queried by LIMIT and OFFSET,
+at a cost proportional to the offset.
+
+If rows were deleted meanwhile, a block queried again may be shorter than it was: its missing rows
+have no data, and the model is reset from the event loop to query its rows again (see refresh()).
+
+The statement of the query stays open until its last row is fetched, i.e., until the view is
+scrolled to the end. Meanwhile, it holds a SHARED lock which blocks the writers of other
+connections with a rollback journal, and prevents the checkpoints of a WAL database from
+completing. Call close() to release it when the model is no longer needed, or is not to fetch more
+rows.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from typing_extensions import Any, Dict, List, Mapping, Optional, Sequence
+
+from . import qt_compat
+from .dbapi2 import Cursor, _quote
+from .qt_compat import QtCore
+
+__all__ = ["CursorTableModel"]
+
+_DISPLAY_ROLE = 0  # Qt.ItemDataRole.DisplayRole
+_EDIT_ROLE = 2  # Qt.ItemDataRole.EditRole
+_HORIZONTAL = getattr(QtCore.Qt, "Orientation", QtCore.Qt).Horizontal
+
+
+def _role(role: Any) -> int:
+    return role if isinstance(role, int) else qt_compat._to_int(role)
+
+
+class CursorTableModel(QtCore.QAbstractTableModel):
+    """Read-only table model of the result of a query, fetched lazily through a Cursor.
+
+    :param cursor: The cursor to execute the query with. Its rows are fetched as tuples, whatever
+                   its row_factory.
+    :type cursor: Cursor
+    :param sql: A single SELECT statement.
+    :type sql: str
+    :param parameters: Python values to bind to placeholders in sql, defaults to None
+    :type parameters: Sequence | Mapping, optional
+    :param key: The name of a column of the result whose values increase strictly in the order of
+                the rows, used to query the blocks again, defaults to None to use OFFSET
+    :type key: str, optional
+    :param block_size: The number of rows fetched at a time, defaults to 256
+    :type block_size: int, optional
+    :param max_blocks: The maximum number of blocks of rows kept in memory, defaults to 64
+    :type max_blocks: int, optional
+    :param parent: parent QObject, defaults to None
+    :type parent: QObject, optional
+
+    The statement of the query holds a read lock on the database until all its rows are fetched,
+    or close() is called.
+    """
+
+    def __init__(
+        self,
+        cursor: Cursor,
+        sql: str,
+        parameters: Optional[Sequence | Mapping] = None,
+        *,
+        key: Optional[str] = None,
+        block_size: int = 256,
+        max_blocks: int = 64,
+        parent: Optional[QtCore.QObject] = None,
+    ):
+        super().__init__(parent)
+        self.block_size = max(int(block_size), 1)
+        self.max_blocks = max(int(max_blocks), 1)
+        self._sql = sql
+        self._parameters = parameters
+
+        cursor.row_factory = None
+        cursor.forward_only = True
+        self._cursor = cursor.execute(sql, parameters)
+        if cursor.description is None:
+            raise ValueError("sql must be a query returning rows")
+        self._columns = [d[0] for d in cursor.description]
+        self._key = None
+        if key is not None:
+            if key not in self._columns:
+                raise ValueError(f"no such column in the query result: {key!r}")
+            self._key = self._columns.index(key)
+
+        self._rows = 0  # the number of rows fetched so far
+        self._at_end = False
+        self._first_keys: List[Any] = []  # the key of the first row of each block
+        self._blocks: OrderedDict[int, List[tuple]] = OrderedDict()
+        self.requeries = 0  # the number of blocks queried again
+        self._refresh_pending = False
+
+    def _cache(self, index: int, rows: List[tuple]):
+        blocks = self._blocks
+        blocks[index] = rows
+        blocks.move_to_end(index)
+        while len(blocks) > self.max_blocks:
+            blocks.popitem(last=False)
+
+    def _requery(self, index: int) -> List[tuple]:
+        """Query a block of rows which was dropped from the window again"""
+        self.requeries += 1
+        conn = self._cursor.connection
+        cur = conn.cursor()
+        cur.row_factory = None
+        params = self._parameters
+        if self._key is None:
+            sql = f"SELECT * FROM ({self._sql}) LIMIT {self.block_size} OFFSET {index * self.block_size}"
+        else:
+            key = _quote(self._columns[self._key])
+            if isinstance(params, Mapping):
+                placeholder = ":_sqlite3_qt_key"
+                params = {**params, "_sqlite3_qt_key": self._first_keys[index]}
+            else:
+                placeholder = "?"
+                params = [*(params or ()), self._first_keys[index]]
+            sql = (
+                f"SELECT * FROM ({self._sql}) WHERE {key} >= {placeholder} "
+                f"ORDER BY {key} LIMIT {self.block_size}"
+            )
+        rows = cur.execute(sql, params).fetchall()
+        cur.close()
+        return rows
+
+    def _block(self, index: int) -> List[tuple]:
+        rows = self._blocks.get(index)
+        if rows is None:
+            rows = self._requery(index)
+            self._cache(index, rows)
+            # rows were deleted since the block was fetched: the rows of the model are stale, and
+            # the model cannot be reset while the view is asking for data
+            if len(rows) < min(self.block_size, self._rows - index * self.block_size):
+                if not self._refresh_pending:
+                    self._refresh_pending = True
+                    QtCore.QTimer.singleShot(0, self.refresh)
+        else:
+            self._blocks.move_to_end(index)
+        return rows
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def canFetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        return not parent.isValid() and not self._at_end
+
+    def fetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()):
+        """Fetch the next block of rows from the cursor"""
+        if parent.isValid() or self._at_end:
+            return
+        rows = self._cursor.fetchmany(self.block_size)
+        if len(rows) < self.block_size:
+            self._at_end = True
+            self._cursor.close()  # release the statement and its read lock
+        if not rows:
+            return
+        index = self._rows // self.block_size
+        if self._key is not None:
+            self._first_keys.append(rows[0][self._key])
+        self.beginInsertRows(QtCore.QModelIndex(), self._rows, self._rows + len(rows) - 1)
+        self._cache(index, rows)
+        self._rows += len(rows)
+        self.endInsertRows()
+
+    def data(self, index: QtCore.QModelIndex, role: int = _DISPLAY_ROLE) -> Any:
+        if not index.isValid() or _role(role) not in (_DISPLAY_ROLE, _EDIT_ROLE):
+            return None
+        row = index.row()
+        if row >= self._rows:
+            return None
+        block = self._block(row // self.block_size)
+        row %= self.block_size
+        if row >= len(block):
+            return None
+        return block[row][index.column()]
+
+    def refresh(self):
+        """Execute the query again, and reset the model to fetch its rows from the start."""
+        self.beginResetModel()
+        self._refresh_pending = False
+        self._cursor.execute(self._sql, self._parameters)
+        self._rows = 0
+        self._at_end = False
+        self._first_keys.clear()
+        self._blocks.clear()
+        self.endResetModel()
+
+    def close(self):
+        """Release the statement of the query, and its read lock on the database. The rows not
+        fetched yet are no longer fetched, and those fetched remain available. refresh() executes
+        the query again."""
+        self._at_end = True
+        self._cursor.close()
+
+    def headerData(self, section: int, orientation: Any, role: int = _DISPLAY_ROLE) -> Any:
+        if orientation == _HORIZONTAL and _role(role) == _DISPLAY_ROLE:
+            return self._columns[section]
+        return super().headerData(section, orientation, role)
+
+    def blocks(self) -> Dict[int, int]:
+        """Report the blocks kept in memory, from the least to the most recently used.
+
+        :return: the number of rows of each block, by block number
+        :rtype: dict[int, int]
+        """
+        return {i: len(rows) for i, rows in self._blocks.items()}
@@ -0,0 +1,319 @@
+"""
+Thread-aware pool of sqlite3_qt connections.
+
+A QSqlDatabase connection may only be used from the thread which created it. A ConnectionPool
+keeps the idle connections of each thread apart, keyed by the database and the connect()
+options, and hands a thread back one of its own connections, with its prepared statement cache
+still warm:
+
+    from sqlite3_qt.pool import ConnectionPool
+
+    pool = ConnectionPool(max_size=8, idle_timeout=60.0)
+
+    def task():  # run from any worker thread
+        with pool.connection("data.db", timeout=10.0) as con:
+            return con.execute("SELECT count(*) FROM data").fetchone()
+
+A connection is closed and removed from Qt's registry (QSqlDatabase.removeDatabase) when it has
+been idle longer than idle_timeout, or when its thread exits. As a connection can only be closed
+by its own thread, an expired idle connection of another thread is retired instead: it no longer
+counts against max_size, and is closed the next time its thread uses the pool, or exits.
+"""
+
+from __future__ import annotations
+
+from collections import namedtuple
+from contextlib import contextmanager
+import threading
+import time
+import weakref
+
+from typing_extensions import Any, Dict, Iterator, List, Mapping, Sequence, Tuple
+
+from .dbapi2 import Connection, OperationalError, ProgrammingError, connect
+
+__all__ = ["ConnectionPool", "PoolStats"]
+
+PoolStats = namedtuple(
+    "PoolStats",
+    [
+        "open",
+        "idle",
+        "in_use",
+        "max_size",
+        "checkouts",
+        "checkout_time",
+        "checkins",
+        "checkin_time",
+    ],
+)
+PoolStats.__doc__ = """Connection pool statistics.
+
+open, idle, and in_use are the current connection counts. checkout_time and checkin_time are the
+total seconds spent in checkouts and checkins."""
+
+
+class _ThreadSentinel:
+    """Stored in a threading.local to detect the exit of its thread"""
+
+
+class ConnectionPool:
+    """Pool of connections, with one set of connections per (thread, database, options)
+
+    :param max_size: The maximum number of open connections across all the threads, defaults to 8
+    :type max_size: int, optional
+    :param idle_timeout: The number of seconds after which an idle connection is closed, defaults
+                         to 60 seconds
+    :type idle_timeout: float, optional
+    :param prepare: SQL statements to prepare in the statement cache of every new connection
+    :type prepare: Sequence[str], optional
+    """
+
+    def __init__(
+        self, max_size: int = 8, idle_timeout: float = 60.0, prepare: Sequence[str] = ()
+    ):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.prepare = tuple(prepare)
+
+        self._cond = threading.Condition()
+        # (thread id, database, options) -> idle connections with their release times
+        self._idle: Dict[Tuple, List[Tuple[float, Connection]]] = {}
+        # checked-out connection -> its key
+        self._in_use: Dict[Connection, Tuple] = {}
+        # thread id -> expired idle connections, no longer counted as open, to close in the thread
+        self._retired: Dict[int, List[Connection]] = {}
+        self._open = 0
+        self._waiting = 0
+        self._closed = False
+        self._local = threading.local()
+
+        self._checkouts = 0
+        self._checkout_time = 0.0
+        self._checkins = 0
+        self._checkin_time = 0.0
+
+    def _watch_thread(self):
+        """Close the calling thread's connections when it exits"""
+        if getattr(self._local, "sentinel", None) is None:
+            sentinel = self._local.sentinel = _ThreadSentinel()
+            weakref.finalize(
+                sentinel, _thread_exited, weakref.ref(self), threading.get_ident()
+            )
+
+    def _close_idle(self, thread: int, expired_only: bool):
+        """Close the thread's idle and retired connections. Must be called from that thread with
+        the lock held.
+
+        All of them are closed and their slots freed even if closing some fails, and the first
+        exception is then raised."""
+        retired = self._retired.pop(thread, [])
+        idle = []
+        deadline = time.monotonic() - self.idle_timeout
+        for key in [key for key in self._idle if key[0] == thread]:
+            keep = []
+            for released, con in self._idle[key]:
+                if expired_only and released > deadline:
+                    keep.append((released, con))
+                else:
+                    idle.append(con)
+            if keep:
+                self._idle[key] = keep
+            else:
+                del self._idle[key]
+
+        error = None
+        # the slots of the retired connections were freed when they were retired
+        for connections, slots in ((retired, 0), (idle, 1)):
+            for con in connections:
+                try:
+                    con._remove()
+                except Exception as e:
+                    error = error or e
+                finally:
+                    self._open -= slots
+        self._cond.notify_all()
+        if error is not None:
+            raise error
+
+    def _retire_expired(self, thread: int) -> float | None:
+        """Retire the expired idle connections of the threads other than thread, freeing their
+        slots. Must be called with the lock held.
+
+        :return: the time when the next idle connection of another thread expires, if any
+        """
+        now = time.monotonic()
+        deadline = now - self.idle_timeout
+        next_expiry = None
+        for key in [key for key in self._idle if key[0] != thread]:
+            keep = []
+            for released, con in self._idle[key]:
+                if released <= deadline:
+                    self._retired.setdefault(key[0], []).append(con)
+                    self._open -= 1
+                else:
+                    keep.append((released, con))
+                    expiry = released + self.idle_timeout
+                    next_expiry = expiry if next_expiry is None else min(next_expiry, expiry)
+            if keep:
+                self._idle[key] = keep
+            else:
+                del self._idle[key]
+        return next_expiry
+
+    def acquire(self, database: Any, wait: float | None = None, **kwargs) -> Connection:
+        """Check out a connection to database, opened in the calling thread.
+
+        :param database: The path to the database file
+        :type database: PathLike
+        :param wait: The number of seconds to wait for a free slot when max_size connections are
+                     open, defaults to None to wait indefinitely
+        :type wait: float | None, optional
+        :param **kwargs: connect() options except for check_same_thread
+        :raises OperationalError: If no connection became available within wait seconds
+        :return: connection, to be returned with release()
+        :rtype: Connection
+        """
+        t0 = time.perf_counter()
+        thread = threading.get_ident()
+        options = {k: tuple(v.items()) if isinstance(v, Mapping) else v for k, v in kwargs.items()}
+        key = (thread, str(database), tuple(sorted(options.items())))
+        self._watch_thread()
+
+        with self._cond:
+            if self._closed:
+                raise ProgrammingError("Cannot operate on a closed connection pool.")
+            self._close_idle(thread, expired_only=True)
+
+            entries = self._idle.get(key)
+            if entries:
+                con = entries.pop()[1]
+                if not entries:
+                    del self._idle[key]
+            else:
+                con = None
+                deadline = None if wait is None else time.monotonic() + wait
+                while self._open >= self.max_size:
+                    # free a slot held by another idle connection of this thread
+                    if any(k[0] == thread for k in self._idle):
+                        self._close_idle(thread, expired_only=False)
+                        continue
+                    # or by an expired idle connection of another thread
+                    next_expiry = self._retire_expired(thread)
+                    if self._open < self.max_size:
+                        break
+                    now = time.monotonic()
+                    remaining = None if deadline is None else deadline - now
+                    if remaining is not None and remaining <= 0:
+                        raise OperationalError(
+                            f"no connection available in the pool within {wait} seconds"
+                        )
+                    if next_expiry is not None:
+                        timeout = max(next_expiry - now, 0.0)
+                        remaining = timeout if remaining is None else min(remaining, timeout)
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                self._open += 1
+
+        if con is None:
+            try:
+                con = connect(database, check_same_thread=True, **kwargs)
+                for sql in self.prepare:
+                    con._statements.get(sql)
+            except BaseException:
+                with self._cond:
+                    self._open -= 1
+                    self._cond.notify_all()
+                raise
+
+        with self._cond:
+            self._in_use[con] = key
+            self._checkouts += 1
+            self._checkout_time += time.perf_counter() - t0
+        return con
+
+    def release(self, con: Connection):
+        """Return a connection checked out with acquire() to the pool.
+
+        Any pending transaction is rolled back. Must be called from the thread which checked it
+        out."""
+        t0 = time.perf_counter()
+        con._check_thread()
+        with self._cond:
+            key = self._in_use.pop(con, None)
+        if key is None:
+            raise ProgrammingError("The connection does not belong to this pool.")
+
+        con.rollback()
+
+        with self._cond:
+            self._close_idle(key[0], expired_only=True)
+            self._retire_expired(key[0])
+            if self._closed or self._waiting:
+                # hand the slot over to a waiting thread
+                try:
+                    con._remove()
+                finally:
+                    self._open -= 1
+                    self._cond.notify()
+            else:
+                self._idle.setdefault(key, []).append((time.monotonic(), con))
+            self._checkins += 1
+            self._checkin_time += time.perf_counter() - t0
+
+    @contextmanager
+    def connection(
+        self, database: Any, wait: float | None = None, **kwargs
+    ) -> Iterator[Connection]:
+        """Context manager to check out a connection and release it on exit.
+
+        See acquire() for the arguments."""
+        con = self.acquire(database, wait, **kwargs)
+        try:
+            yield con
+        finally:
+            self.release(con)
+
+    def close(self):
+        """Close the pool.
+
+        The idle connections of the calling thread are closed immediately. Those of the other
+        threads are closed when the threads release a connection or exit."""
+        with self._cond:
+            self._closed = True
+            self._close_idle(threading.get_ident(), expired_only=False)
+
+    def stats(self) -> PoolStats:
+        """Report the connection counts and the checkout/checkin latencies."""
+        with self._cond:
+            idle = sum(len(entries) for entries in self._idle.values())
+            return PoolStats(
+                self._open,
+                idle,
+                len(self._in_use),
+                self.max_size,
+                self._checkouts,
+                self._checkout_time,
+                self._checkins,
+                self._checkin_time,
+            )
+
+
+def _thread_exited(pool_ref: weakref.ref, thread: int):
+    pool = pool_ref()
+    if pool is None:
+        return
+    with pool._cond:
+        pool._close_idle(thread, expired_only=False)  # including the retired connections
+        # connections never released by the exiting thread
+        for con, key in list(pool._in_use.items()):
+            if key[0] == thread:
+                del pool._in_use[con]
+                try:
+                    con._remove()
+                finally:
+                    pool._open -= 1
+        pool._cond.notify_all()
@@ -8,6 +8,9 @@ The selection logic is as follows:
   it to determine which binding to use;
 - otherwise, use whatever the rcParams indicate.
 
+The binding is selected and imported on the first access to any of its attributes (QT_API,
+QtCore, QtSql, ...) through the module __getattr__, so that importing sqlite3_qt does not load Qt.
+
 [taken from matplotlib]
 """
 
@@ -16,102 +19,184 @@ import os
 import platform
 import sys
 
-from packaging.version import parse as parse_version
-
 QT_API_PYQT6 = "PyQt6"
 QT_API_PYSIDE6 = "PySide6"
 QT_API_PYQT5 = "PyQt5"
 QT_API_PYSIDE2 = "PySide2"
-QT_API_ENV = os.environ.get("QT_API")
-if QT_API_ENV is not None:
-    QT_API_ENV = QT_API_ENV.lower()
 _ETS = {  # Mapping of QT_API_ENV to requested binding.
     "pyqt6": QT_API_PYQT6, "pyside6": QT_API_PYSIDE6,
     "pyqt5": QT_API_PYQT5, "pyside2": QT_API_PYSIDE2,
 }
-# First, check if anything is already imported.
-if sys.modules.get("PyQt6.QtSql"):
-    QT_API = QT_API_PYQT6
-elif sys.modules.get("PySide6.QtSql"):
-    QT_API = QT_API_PYSIDE6
-elif sys.modules.get("PyQt5.QtSql"):
-    QT_API = QT_API_PYQT5
-elif sys.modules.get("PySide2.QtSql"):
-    QT_API = QT_API_PYSIDE2
-# A non-Qt backend was selected but we still got there (possible, e.g., when
-# fully manually embedding Matplotlib in a Qt app without using pyplot).
-elif QT_API_ENV is None:
-    QT_API = None
-elif QT_API_ENV in _ETS:
-    QT_API = _ETS[QT_API_ENV]
-else:
-    raise RuntimeError(
-        "The environment variable QT_API has the unrecognized value {!r}; "
-        "valid values are {}".format(QT_API_ENV, ", ".join(_ETS)))
+
+# attributes set once the binding is loaded
+_LAZY_ATTRS = frozenset((
+    "QT_API", "QtCore", "QtSql", "__version__", "Signal", "Slot",
+    "_to_int", "_row_values", "_buffer_to_qbytearray", "_version_info",
+))
+
+
+def _parse_version(version):
+    """Parse the leading numeric components of a dotted version string"""
+    parts = []
+    for s in version.split("."):
+        if not s.isdigit():
+            break
+        parts.append(int(s))
+    return tuple(parts)
+
+
+def _select_api():
+    QT_API_ENV = os.environ.get("QT_API")
+    if QT_API_ENV is not None:
+        QT_API_ENV = QT_API_ENV.lower()
+    # First, check if anything is already imported.
+    if sys.modules.get("PyQt6.QtSql"):
+        return QT_API_PYQT6
+    elif sys.modules.get("PySide6.QtSql"):
+        return QT_API_PYSIDE6
+    elif sys.modules.get("PyQt5.QtSql"):
+        return QT_API_PYQT5
+    elif sys.modules.get("PySide2.QtSql"):
+        return QT_API_PYSIDE2
+    # A non-Qt backend was selected but we still got there (possible, e.g., when
+    # fully manually embedding Matplotlib in a Qt app without using pyplot).
+    elif QT_API_ENV is None:
+        return None
+    elif QT_API_ENV in _ETS:
+        return _ETS[QT_API_ENV]
+    else:
+        raise RuntimeError(
+            "The environment variable QT_API has the unrecognized value {!r}; "
+            "valid values are {}".format(QT_API_ENV, ", ".join(_ETS)))
+
+
+def _map_values(value, index):
+    # sip-wrapped methods are cheapest to call from map()
+    return lambda: tuple(map(value, index))
+
+
+def _listcomp_values(value, index):
+    # shiboken-wrapped methods are cheapest to call from a list comprehension
+    return lambda: tuple([value(i) for i in index])
+
+
+def _copy_buffer(value):
+    return QtCore.QByteArray(bytes(value))
 
 
 def _setup_pyqt5plus():
     global QtCore, QtSql, __version__
-    global _to_int
+    global Signal, Slot
+    global _to_int, _row_values, _buffer_to_qbytearray
 
     if QT_API == QT_API_PYQT6:
         from PyQt6 import QtCore, QtSql
         __version__ = QtCore.PYQT_VERSION_STR
+        Signal, Slot = QtCore.pyqtSignal, QtCore.pyqtSlot
         _to_int = operator.attrgetter('value')
+        _row_values = _map_values
+        # PyQt6 QByteArray copies directly from any buffer
+        _buffer_to_qbytearray = QtCore.QByteArray
     elif QT_API == QT_API_PYSIDE6:
         from PySide6 import QtCore, QtSql, __version__
-        if parse_version(__version__) >= parse_version('6.4'):
+        Signal, Slot = QtCore.Signal, QtCore.Slot
+        if _parse_version(__version__) >= (6, 4):
             _to_int = operator.attrgetter('value')
         else:
             _to_int = int
+        _row_values = _listcomp_values
+        _buffer_to_qbytearray = _copy_buffer
     elif QT_API == QT_API_PYQT5:
         from PyQt5 import QtCore, QtSql
         __version__ = QtCore.PYQT_VERSION_STR
+        Signal, Slot = QtCore.pyqtSignal, QtCore.pyqtSlot
         _to_int = int
+        _row_values = _map_values
+        _buffer_to_qbytearray = _copy_buffer
     elif QT_API == QT_API_PYSIDE2:
         from PySide2 import QtCore, QtSql, __version__
+        Signal, Slot = QtCore.Signal, QtCore.Slot
         _to_int = int
+        _row_values = _listcomp_values
+        _buffer_to_qbytearray = _copy_buffer
         QtSql.QSqlQuery.exec = QtSql.QSqlQuery.exec_
     else:
         raise AssertionError(f"Unexpected QT_API: {QT_API}")
 
 
-if QT_API in [QT_API_PYQT6, QT_API_PYQT5, QT_API_PYSIDE6, QT_API_PYSIDE2]:
-    _setup_pyqt5plus()
-elif QT_API is None:  # See above re: dict.__getitem__.
-    _candidates = [
-        (_setup_pyqt5plus, QT_API_PYQT6),
-        (_setup_pyqt5plus, QT_API_PYSIDE6),
-        (_setup_pyqt5plus, QT_API_PYQT5),
-        (_setup_pyqt5plus, QT_API_PYSIDE2),
-    ]
-    for _setup, QT_API in _candidates:
-        try:
-            _setup()
-        except ImportError:
-            continue
-        break
-    else:
+def _load():
+    """Select and import the Qt binding"""
+    global QT_API, _version_info
+
+    QT_API = _select_api()
+    if QT_API in [QT_API_PYQT6, QT_API_PYQT5, QT_API_PYSIDE6, QT_API_PYSIDE2]:
+        _setup_pyqt5plus()
+    elif QT_API is None:  # See above re: dict.__getitem__.
+        _candidates = [
+            (_setup_pyqt5plus, QT_API_PYQT6),
+            (_setup_pyqt5plus, QT_API_PYSIDE6),
+            (_setup_pyqt5plus, QT_API_PYQT5),
+            (_setup_pyqt5plus, QT_API_PYSIDE2),
+        ]
+        for _setup, QT_API in _candidates:
+            try:
+                _setup()
+            except ImportError:
+                continue
+            break
+        else:
+            del QT_API
+            raise ImportError(
+                "Failed to import any of the following Qt binding modules: {}"
+                .format(", ".join([api for _, api in _candidates]))
+            )
+    else:  # We should not get there.
+        raise AssertionError(f"Unexpected QT_API: {QT_API}")
+    _version_info = tuple(QtCore.QLibraryInfo.version().segments())
+
+    if _version_info < (5, 12):
         raise ImportError(
-            "Failed to import any of the following Qt binding modules: {}"
-            .format(", ".join([QT_API for _, QT_API in _candidates]))
-        )
-else:  # We should not get there.
-    raise AssertionError(f"Unexpected QT_API: {QT_API}")
-_version_info = tuple(QtCore.QLibraryInfo.version().segments())
+            f"The Qt version imported is "
+            f"{QtCore.QLibraryInfo.version().toString()} but Matplotlib requires "
+            f"Qt>=5.12")
+
+    # Fixes issues with Big Sur
+    # https://bugreports.qt.io/browse/QTBUG-87014, fixed in qt 5.15.2
+    if (sys.platform == 'darwin' and
+            _parse_version(platform.mac_ver()[0]) >= (10, 16) and
+            _version_info < (5, 15, 2)):
+        os.environ.setdefault("QT_MAC_WANTS_LAYER", "1")
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        _load()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 
+def _row_decoder(query, ncols):
+    """Return a function which decodes the current row of query to a tuple of Python values.
 
-if _version_info < (5, 12):
-    raise ImportError(
-        f"The Qt version imported is "
-        f"{QtCore.QLibraryInfo.version().toString()} but Matplotlib requires "
-        f"Qt>=5.12")
+    All the bindings return a NULL as an empty string and a BLOB as a QByteArray. Such values are
+    converted to None and bytes, respectively, only if the row contains any of them.
+    """
+    values = _row_values(query.value, range(ncols))
+    is_null = query.isNull
+    QByteArray = QtCore.QByteArray
 
+    def fix(i, v):
+        if type(v) is QByteArray:
+            return v.data()
+        if v == "" and is_null(i):
+            return None
+        return v
 
-# Fixes issues with Big Sur
-# https://bugreports.qt.io/browse/QTBUG-87014, fixed in qt 5.15.2
-if (sys.platform == 'darwin' and
-        parse_version(platform.mac_ver()[0]) >= parse_version("10.16") and
-        _version_info < (5, 15, 2)):
-    os.environ.setdefault("QT_MAC_WANTS_LAYER", "1")
+    def decode():
+        row = values()
+        if QByteArray in map(type, row) or "" in row:
+            row = tuple(map(fix, range(ncols), row))
+        return row
 
+    return decode
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+import weakref
+
+from sqlite3_qt import aio
+
+
+def test_aio():
+    async def main():
+        con = await aio.connect(":memory:")
+        await con.execute("CREATE TABLE test(x)")
+        cur = await con.executemany("INSERT INTO test VALUES(?)", ((i,) for i in range(1000)))
+        assert cur.rowcount == 1000
+
+        cur = await con.execute("SELECT x FROM test")
+        assert cur.description[0][0] == "x"
+        cur.prefetch = 100
+        assert await cur.fetchone() == (0,)
+        assert await cur.fetchmany(2) == [(1,), (2,)]
+        assert [row async for row in cur] == [(i,) for i in range(3, 1000)]
+
+        # concurrent requests are pipelined through the worker thread
+        counts = await asyncio.gather(
+            *[con.execute("SELECT count(*) FROM test WHERE x < ?", (i,)) for i in range(10)]
+        )
+        assert [await c.fetchone() for c in counts] == [(i,) for i in range(10)]
+
+        worker = await con.run(lambda con: threading.get_ident())
+        assert worker != threading.get_ident()
+        await con.close()
+
+    asyncio.run(main())
+
+
+def test_aio_finalize():
+    async def main():
+        con = await aio.connect(":memory:")
+        await con.execute("CREATE TABLE test(x)")
+        await con.executemany("INSERT INTO test VALUES(?)", ((i,) for i in range(10)))
+        worker = await con.run(lambda con: threading.current_thread())
+
+        # an unclosed cursor is closed and freed in the worker thread
+        cur = await con.execute("SELECT x FROM test")
+        assert await cur.fetchone() == (0,)
+        freed = []
+        weakref.finalize(cur._cursor, lambda: freed.append(threading.current_thread()))
+        del cur
+        assert await con.run(lambda con: con._running) == 0
+        assert freed == [worker]
+
+        # an unclosed connection is closed in the worker thread, which stops
+        del con
+        worker.join(5)
+        assert not worker.is_alive()
+
+    asyncio.run(main())
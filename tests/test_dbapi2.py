@@ -0,0 +1,680 @@
+import ctypes
+import datetime
+import io
+import sqlite3
+import subprocess
+import sys
+import threading
+import pytest
+import sqlite3_qt
+from sqlite3_qt import _capi
+
+
+def test_statement_cache():
+    con = sqlite3_qt.connect(":memory:", cached_statements=2)
+    con.execute("CREATE TABLE test(x)")
+    for i in range(5):
+        con.execute("INSERT INTO test VALUES(?)", (i,))
+    info = con.statement_cache_info()
+    assert info.hits == 4
+    assert info.maxsize == 2 and info.currsize == 2
+
+    con.execute("SELECT x FROM test")
+    con.execute("SELECT count(*) FROM test")
+    assert con.statement_cache_info().evictions == 2
+    con.close()
+
+
+def test_statement_cache_in_use():
+    con = sqlite3_qt.connect(":memory:")
+    con.execute("CREATE TABLE test(x)")
+    con.executemany("INSERT INTO test VALUES(?)", [(1,), (2,)])
+    cur1 = con.execute("SELECT x FROM test")
+    cur2 = con.execute("SELECT x FROM test")
+    assert cur1.qt_query is not cur2.qt_query
+    assert cur1.fetchall() == cur2.fetchall() == [(1,), (2,)]
+    con.close()
+
+
+def test_statement_shared_after_exhausted():
+    con = sqlite3_qt.connect(":memory:")
+    con.execute("CREATE TABLE test(x)")
+    con.executemany("INSERT INTO test VALUES(?)", [(1,), (2,)])
+    cur1 = con.execute("SELECT x FROM test")
+    assert cur1.fetchall() == [(1,), (2,)]
+    cur2 = con.execute("SELECT x FROM test")  # reuses the statement finished by cur1
+    assert cur2.fetchone() == (1,)
+    assert cur1.fetchone() is None and cur1.fetchall() == []
+    assert cur2.fetchall() == [(2,)]
+    con.close()
+
+
+def test_forward_only():
+    con = sqlite3_qt.connect(":memory:")
+    con.execute("CREATE TABLE test(x)")
+    con.executemany("INSERT INTO test VALUES(?)", [(i,) for i in range(3)])
+
+    cur = con.execute("SELECT x FROM test")
+    assert cur.qt_query.isForwardOnly()
+    assert cur.fetchall() == [(0,), (1,), (2,)]
+    assert not cur.qt_query.isActive()
+
+    cur = con.cursor(lambda con: sqlite3_qt.Cursor(con, forward_only=False))
+    cur.execute("SELECT x FROM test")
+    assert not cur.qt_query.isForwardOnly()
+    assert cur.fetchall() == [(0,), (1,), (2,)]
+    con.close()
+
+
+def test_fetch_columns():
+    np = pytest.importorskip("numpy")
+
+    con = sqlite3_qt.connect(":memory:")
+    con.execute("CREATE TABLE test(i, f, s, n)")
+    data = [(i, i / 2, str(i), None if i % 2 else i) for i in range(2000)]
+    con.executemany("INSERT INTO test VALUES(?, ?, ?, ?)", data)
+
+    cur = con.execute("SELECT * FROM test")
+    i, f, s, n = cur.fetchmany_columns(10)
+    assert i.dtype == np.int64 and f.dtype == np.float64 and s.dtype == object
+    assert len(i) == 10 and n[1] is None
+
+    cols = cur.fetch_columns(as_dict=True)
+    assert list(cols) == ["i", "f", "s", "n"]
+    assert np.array_equal(cols["i"], np.arange(10, 2000))
+    assert np.array_equal(cols["f"], np.arange(10, 2000) / 2)
+    assert list(cols["s"]) == [str(i) for i in range(10, 2000)]
+    con.close()
+
+
+def test_fetch_columns_detect_types():
+    pytest.importorskip("numpy")
+    sqlite3.register_converter("point", lambda b: tuple(map(float, b.split(b";"))))
+    con = sqlite3_qt.connect(
+        ":memory:", detect_types=sqlite3_qt.PARSE_DECLTYPES | sqlite3_qt.PARSE_COLNAMES
+    )
+    con.execute("CREATE TABLE test(p point, d date, i)")
+    data = [("1;2", "2020-01-02", 1), (None, None, 2), ("3;4", "2021-03-04", 3)]
+    con.executemany("INSERT INTO test VALUES(?, ?, ?)", data)
+
+    sql = 'SELECT p, d, i, i AS "j [point]" FROM test'
+    rows = con.execute(sql).fetchall()
+    cols = con.execute(sql).fetch_columns(as_dict=True)
+    assert list(cols) == ["p", "d", "i", "j"]
+    assert [tuple(row) for row in zip(*cols.values())] == rows
+    assert rows[0] == ((1.0, 2.0), datetime.date(2020, 1, 2), 1, (1.0,))
+    assert cols["d"].dtype == object and cols["i"].dtype.kind == "i"
+    con.close()
+
+
+def test_row():
+    con = sqlite3_qt.connect(":memory:")
+    con.row_factory = sqlite3_qt.Row
+    rows = con.execute("SELECT 1 AS a, 2 AS b UNION ALL SELECT 3, 4").fetchall()
+    assert rows[0]._schema is rows[1]._schema
+    assert hash(rows[0]) == hash(con.execute("SELECT 1 AS a, 2 AS b").fetchone())
+    assert len({*rows, *rows}) == 2
+    con.close()
+
+
+def test_autocommit(tmp_path):
+    path = tmp_path / "test.db"
+    con = sqlite3_qt.connect(path, autocommit=False)
+    other = sqlite3_qt.connect(path, autocommit=True)
+    count = "SELECT count(*) FROM test"
+    assert con.autocommit is False and con.in_transaction
+    con.execute("CREATE TABLE test(x)")
+    con.commit()
+    assert con.in_transaction
+    con.execute("INSERT INTO test VALUES(1)")
+    assert other.execute(count).fetchone() == (0,)
+    con.commit()
+    assert other.execute(count).fetchone() == (1,)
+    con.execute("INSERT INTO test VALUES(2)")
+    con.autocommit = True
+    assert not con.in_transaction and other.execute(count).fetchone() == (2,)
+    con.execute("INSERT INTO test VALUES(3)")
+    con.rollback()  # no effect
+    assert other.execute(count).fetchone() == (3,)
+    with pytest.raises(ValueError):
+        con.autocommit = 2
+    con.autocommit = False
+    con.execute("INSERT INTO test VALUES(4)")
+    con.close()  # rolls back
+    assert other.execute(count).fetchone() == (3,)
+    other.close()
+
+
+def test_savepoint():
+    con = sqlite3_qt.connect(":memory:")
+    con.execute("CREATE TABLE test(x)")
+    with con.savepoint() as outer:
+        assert con.in_transaction
+        con.execute("INSERT INTO test VALUES(1)")
+        with pytest.raises(KeyError):
+            with con.savepoint() as inner:
+                assert inner != outer
+                con.execute("INSERT INTO test VALUES(2)")
+                raise KeyError
+        with con.savepoint("named"):
+            con.execute("INSERT INTO test VALUES(3)")
+    assert not con.in_transaction
+    assert con.execute("SELECT x FROM test").fetchall() == [(1,), (3,)]
+    con.close()
+
+
+def test_split_script():
+    from sqlite3_qt.dbapi2 import _split_script
+
+    statements = [
+        "CREATE TABLE test(x, y);",
+        "\n-- a comment\nINSERT INTO test VALUES(1, 'a;b -- c /* d');",
+        "\nCREATE TRIGGER tr AFTER INSERT ON test BEGIN\n"
+        "    UPDATE test SET y = '[x]' WHERE x = new.x; SELECT 1;\nEND;",
+        ' /* ; */ SELECT "x;" FROM [te;st];',
+        "\nSELECT 2",
+    ]
+    script = "".join(statements)
+    assert list(_split_script(script)) == statements
+    for chunk_size in (1, 2, 7):
+        assert list(_split_script(io.StringIO(script), chunk_size)) == statements
+    assert list(_split_script(" ;; -- only a comment\n")) == []
+
+
+def test_executescript_file(tmp_path):
+    path = tmp_path / "script.sql"
+    with open(path, "w") as f:
+        f.write("CREATE TABLE test(x);\n")
+        for i in range(1000):
+            f.write(f"INSERT INTO test VALUES({i});\n")
+    con = sqlite3_qt.connect(":memory:")
+    with open(path) as f:
+        con.executescript(f)
+    assert not con.in_transaction
+    assert con.execute("SELECT count(*), sum(x) FROM test").fetchone() == (1000, 499500)
+    con.executescript("BEGIN; INSERT INTO test VALUES(0);")
+    assert con.in_transaction
+    con.rollback()
+    con.close()
+
+
+def test_executescript_autocommit(tmp_path):
+    con = sqlite3_qt.connect(tmp_path / "test.db")
+    con.executescript(
+        "PRAGMA journal_mode=WAL; PRAGMA foreign_keys=ON; CREATE TABLE test(x); VACUUM;"
+    )
+    assert con.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert con.execute("PRAGMA foreign_keys").fetchone() == (1,)
+
+    # the statements before a failing one are committed
+    with pytest.raises(sqlite3_qt.DatabaseError):
+        con.executescript("INSERT INTO test VALUES(1); INSERT INTO nosuchtable VALUES(2);")
+    assert not con.in_transaction
+    con.rollback()
+    assert con.execute("SELECT x FROM test").fetchall() == [(1,)]
+    con.close()
+
+
+def test_statement_callback():
+    con = sqlite3_qt.connect(":memory:")
+    events = []
+    con.set_statement_callback(events.append)
+    con.execute("CREATE TABLE test(x)")
+    con.executemany("INSERT INTO test VALUES(?)", [(i,) for i in range(10)])
+    cur = con.execute("SELECT x FROM test WHERE x < ?", (5,))
+    cur.fetchone()
+    assert [e.sql for e in events] == ["CREATE TABLE test(x)", "BEGIN ", events[2].sql]
+    cur.fetchmany(10)
+    cur = con.execute("SELECT x FROM test")
+    cur.fetchmany(3)
+    cur.close()
+    con.set_statement_callback(None)
+    con.commit()
+
+    create, begin, insert, select, partial = events
+    assert insert == (insert.sql, 10, *insert[2:5], 10, sqlite3_qt.QT_API)
+    assert select.sql == "SELECT x FROM test WHERE x < ?"
+    assert (select.nparams, select.rows) == (1, 5)
+    assert partial.rows == 3
+    assert all(t >= 0.0 for e in events for t in e[2:5])
+    assert select.fetch_time > 0.0
+    con.close()
+
+
+def test_lazy_import():
+    code = """if True:
+        import sys, time
+        t0 = time.perf_counter()
+        import sqlite3_qt
+        dt = time.perf_counter() - t0
+        loaded = [m for m in ("PyQt6", "PySide6", "PyQt5", "PySide2", "packaging") if m in sys.modules]
+        print(dt, loaded)
+    """
+    dt, loaded = subprocess.check_output([sys.executable, "-c", code], text=True).split(" ", 1)
+    assert loaded.strip() == "[]"
+    assert float(dt) < 0.5  # import time budget
+
+
+def test_sqlite_version():
+    assert sqlite3_qt.sqlite_version_info >= (3, 7, 15)
+    assert sqlite3_qt.sqlite_version == ".".join(map(str, sqlite3_qt.sqlite_version_info))
+
+
+def test_backup():
+    src = sqlite3_qt.connect(":memory:")
+    src.executescript(
+        """CREATE TABLE test(id INTEGER PRIMARY KEY AUTOINCREMENT, x);
+        CREATE INDEX test_x ON test(x);
+        CREATE TABLE kv(k PRIMARY KEY, v) WITHOUT ROWID;
+        CREATE TABLE kv2(a COLLATE NOCASE, b, v, PRIMARY KEY(a, b DESC)) WITHOUT ROWID;
+        PRAGMA user_version = 3;"""
+    )
+    src.executemany("INSERT INTO test(x) VALUES(?)", [(str(i) * 10,) for i in range(1000)])
+    src.executemany("INSERT INTO kv VALUES(?, ?)", [(i, i) for i in range(100)])
+    src.executemany(
+        "INSERT INTO kv2 VALUES(?, ?, ?)",
+        [(f"{'Ab'[i % 2]}{i % 7}", i if i % 3 else str(i), "x" * 100) for i in range(500)],
+    )
+    src.execute("DELETE FROM test WHERE id % 3 = 0")
+    src.commit()
+
+    dst = sqlite3_qt.connect(":memory:")
+    dst.execute("CREATE TABLE old(x)")
+    steps = []
+    src.backup(dst, pages=1, progress=lambda *args: steps.append(args))
+    assert len(steps) > 1 and steps[-1][:2] == (101, 0)  # SQLITE_DONE
+    schema = "SELECT type, name, sql FROM sqlite_master ORDER BY name"
+    assert dst.execute(schema).fetchall() == src.execute(schema).fetchall()
+    for sql in (
+        "SELECT rowid, * FROM test",
+        "SELECT * FROM kv",
+        "SELECT * FROM kv2",
+        "SELECT * FROM sqlite_sequence",
+    ):
+        assert dst.execute(sql).fetchall() == src.execute(sql).fetchall()
+    assert dst.execute("PRAGMA user_version").fetchone() == (3,)
+
+    with pytest.raises(ValueError):
+        src.backup(src)
+    src.close()
+    dst.close()
+
+
+def test_serialize():
+    con = sqlite3_qt.connect(":memory:")
+    con.execute("CREATE TABLE test(x)")
+    con.executemany("INSERT INTO test VALUES(?)", [(1,), (b"\x00\x01",), (None,)])
+    con.commit()
+    data = con.serialize()
+    assert data.startswith(b"SQLite format 3\x00")
+
+    con2 = sqlite3_qt.connect(":memory:")
+    con2.deserialize(data)
+    assert con2.execute("SELECT x FROM test").fetchall() == [(1,), (b"\x00\x01",), (None,)]
+    with pytest.raises(sqlite3_qt.DatabaseError):
+        con2.deserialize(b"not a database" * 100)
+    assert con2.execute("SELECT count(*) FROM test").fetchone() == (3,)
+    con.close()
+    con2.close()
+
+
+def test_blob_buffered_write():
+    con = sqlite3_qt.connect(":memory:")
+    con.execute("CREATE TABLE test(b)")
+    con.execute("INSERT INTO test VALUES(zeroblob(10))")
+    stored = lambda: con.execute("SELECT b FROM test").fetchone()[0]
+
+    with con.blobopen("test", "b", 1) as blob:
+        blob.write_buffer_size = 4
+        blob.write(b"ab")
+        blob.write(b"c")
+        assert stored() == bytes(10)
+        blob.write(b"d")  # the buffer is full
+        assert stored() == b"abcd" + bytes(6)
+        blob.seek(8)
+        blob.write(b"x")
+        blob[5] = ord("y")  # not contiguous
+        assert stored() == b"abcd" + bytes(4) + b"x" + bytes(1)
+        assert blob[4:10] == b"\0y\0\0x\0"
+        blob.seek(0)
+        blob.write(b"z")
+        blob.flush()
+        assert stored() == b"zbcd\0y\0\0x\0"
+        blob.write(b"Z")
+    assert stored() == b"zZcd\0y\0\0x\0"
+    con.close()
+
+
+def test_iterdump():
+    script = """CREATE TABLE test(id INTEGER PRIMARY KEY AUTOINCREMENT, x, y BLOB);
+        CREATE TABLE other(z);
+        CREATE INDEX test_x ON test(x);
+        INSERT INTO test(x, y) VALUES('it''s', x'0001'), (NULL, NULL), (1.5, 'text');
+        INSERT INTO other VALUES(1), (2), (3);"""
+    ref = sqlite3.connect(":memory:")
+    ref.executescript(script)
+    con = sqlite3_qt.connect(":memory:")
+    con.executescript(script)
+    assert list(con.iterdump()) == list(ref.iterdump())
+
+    dump = list(con.iterdump(filter="oth%", batchsize=2))
+    assert dump == [
+        "BEGIN TRANSACTION;",
+        "CREATE TABLE other(z);",
+        'INSERT INTO "other" VALUES(1),(2);',
+        'INSERT INTO "other" VALUES(3);',
+        "COMMIT;",
+    ]
+
+    copy = sqlite3.connect(":memory:")
+    copy.executescript("\n".join(con.iterdump(batchsize=2)))
+    assert list(copy.iterdump()) == list(ref.iterdump())
+    con.close()
+
+
+def test_pragmas(tmp_path):
+    con = sqlite3_qt.connect(
+        tmp_path / "test.db", profile="read-heavy", pragmas={"cache_size": -1000, "foreign_keys": "ON"}
+    )
+    assert con.profile == "read-heavy"
+    pragmas = con.pragmas
+    assert pragmas["journal_mode"] == "wal"
+    assert pragmas["synchronous"] == 1 and pragmas["temp_store"] == 2
+    assert pragmas["cache_size"] == -1000 and pragmas["foreign_keys"] == 1
+    con.close()
+
+    with pytest.raises(sqlite3_qt.OperationalError):
+        sqlite3_qt.connect(tmp_path / "test.db", pragmas={"page_size": 1024})  # set in WAL mode
+    with pytest.raises(ValueError):
+        sqlite3_qt.connect(":memory:", profile="unknown")
+
+    con = sqlite3_qt.connect(":memory:", profile="bulk-load")
+    assert con.pragmas["journal_mode"] == "memory"
+    con.close()
+
+
+def test_connect_failure_removes_connection(tmp_path):
+    names = set(sqlite3_qt.QtSql.QSqlDatabase.connectionNames())
+    with pytest.raises(sqlite3_qt.OperationalError):
+        sqlite3_qt.connect(tmp_path / "test.db", pragmas={"journal_mode": "wal", "page_size": 1024})
+    with pytest.raises(ValueError):
+        sqlite3_qt.connect(":memory:", profile="unknown")
+    with pytest.raises(sqlite3_qt.DatabaseError):
+        sqlite3_qt.connect(tmp_path / "missing" / "test.db")
+    assert set(sqlite3_qt.QtSql.QSqlDatabase.connectionNames()) == names
+
+
+def test_progress_handler():
+    con = sqlite3_qt.connect(":memory:")
+    con.execute("CREATE TABLE test(x)")
+    con.executemany("INSERT INTO test VALUES(?)", [(i,) for i in range(100)])
+    calls = []
+    con.set_progress_handler(lambda: calls.append(1), 10)
+    assert len(con.execute("SELECT x FROM test").fetchall()) == 100
+    assert len(calls) >= 10  # per row fetched, or per SQLite instructions with the C API
+
+    con.set_progress_handler(lambda: calls.append(1) or len(calls) > 20, 1)
+    cur = con.execute("SELECT x FROM test")
+    with pytest.raises(sqlite3_qt.OperationalError, match="interrupted"):
+        cur.fetchall()
+    con.set_progress_handler(None, 1)
+    assert con.execute("SELECT count(*) FROM test").fetchone() == (100,)
+    con.close()
+
+
+def test_interrupt():
+    con = sqlite3_qt.connect(":memory:", check_same_thread=False)
+    con.execute("CREATE TABLE test(x)")
+    con.executemany("INSERT INTO test VALUES(?)", [(i,) for i in range(100)])
+    cur = con.execute("SELECT x FROM test")
+    assert cur.fetchmany(10) == [(i,) for i in range(10)]
+    thread = threading.Thread(target=con.interrupt)
+    thread.start()
+    thread.join()
+    with pytest.raises(sqlite3_qt.OperationalError, match="interrupted"):
+        cur.fetchall()
+    # statements executed after the interruption are not affected
+    assert con.execute("SELECT count(*) FROM test").fetchone() == (100,)
+
+    # an interruption requested while no statement is in progress has no effect
+    con.interrupt()
+    con.execute("UPDATE test SET x = 0")
+    assert con.execute("SELECT count(*) FROM test WHERE x = 0").fetchone() == (100,)
+
+    # a statement started while another one is in progress is aborted with it
+    cur = con.execute("SELECT x FROM test")
+    con.interrupt()
+    with pytest.raises(sqlite3_qt.OperationalError, match="interrupted"):
+        con.execute("UPDATE test SET x = 1")
+    cur.close()
+    assert con.execute("SELECT count(*) FROM test WHERE x = 1").fetchone() == (0,)
+    con.close()
+
+
+def test_create_function():
+    con = sqlite3_qt.connect(":memory:")
+    try:
+        con.create_function("double", 1, lambda x: x * 2, deterministic=True)
+    except sqlite3_qt.NotSupportedError:
+        pytest.skip("the SQLite C API of the QSQLITE driver is not accessible")
+
+    class Sum:
+        def __init__(self):
+            self.total = 0
+
+        def step(self, value):
+            self.total += value
+
+        def finalize(self):
+            return self.total
+
+    con.create_aggregate("mysum", 1, Sum)
+    con.create_collation("reverse", lambda a, b: (a < b) - (a > b))
+    con.execute("CREATE TABLE test(x)")
+    con.executemany("INSERT INTO test VALUES(?)", [(1,), (2,), (3,)])
+    assert con.execute("SELECT double(x) FROM test").fetchall() == [(2,), (4,), (6,)]
+    assert con.execute("SELECT mysum(x) FROM test").fetchone() == (6,)
+    assert con.execute(
+        "SELECT x FROM test ORDER BY CAST(x AS TEXT) COLLATE reverse"
+    ).fetchall() == [(3,), (2,), (1,)]
+
+    con.create_function("double", 1, None)
+    with pytest.raises(sqlite3_qt.DatabaseError):
+        con.execute("SELECT double(1)")
+    con.close()
+
+
+def test_create_function_not_supported(monkeypatch):
+    # as with the Qt of the PyQt/PySide wheels, which link SQLite statically
+    monkeypatch.setattr(_capi, "api", lambda: None)
+    con = sqlite3_qt.connect(":memory:")
+    for func in (
+        lambda: con.create_function("f", 1, abs),
+        lambda: con.create_aggregate("f", 1, object),
+        lambda: con.create_window_function("f", 1, object),
+        lambda: con.create_collation("c", lambda a, b: 0),
+    ):
+        with pytest.raises(sqlite3_qt.NotSupportedError, match="C API of the QSQLITE driver"):
+            func()
+    con.close()
+
+
+def test_capi_shared_sqlite():
+    # the bindings of the SQLite C API, through the SQLite library of the sqlite3 module
+    import _sqlite3
+
+    lib = ctypes.CDLL(_sqlite3.__file__)
+    if not hasattr(lib, "sqlite3_create_function_v2"):
+        pytest.skip("the sqlite3 module does not link a shared SQLite library")
+    api = _capi.SQLiteAPI(lib)
+    db = ctypes.c_void_p()
+    lib.sqlite3_open.argtypes = [ctypes.c_char_p, ctypes.POINTER(ctypes.c_void_p)]
+    assert lib.sqlite3_open(b":memory:", ctypes.byref(db)) == 0
+    handle = db.value
+
+    row = ctypes.CFUNCTYPE(
+        ctypes.c_int,
+        ctypes.c_void_p,
+        ctypes.c_int,
+        ctypes.POINTER(ctypes.c_char_p),
+        ctypes.POINTER(ctypes.c_char_p),
+    )
+    lib.sqlite3_exec.argtypes = [
+        ctypes.c_void_p, ctypes.c_char_p, row, ctypes.c_void_p, ctypes.c_void_p
+    ]
+
+    def run(sql):
+        rows = []
+        callback = row(lambda _, n, values, names: rows.append([values[i] for i in range(n)]) or 0)
+        assert lib.sqlite3_exec(handle, sql.encode(), callback, None, None) == 0
+        return rows
+
+    class Sum:
+        def __init__(self):
+            self.total = 0
+
+        def step(self, value):
+            self.total += value
+
+        def inverse(self, value):
+            self.total -= value
+
+        def value(self):
+            return self.total
+
+        def finalize(self):
+            return self.total
+
+    errors = []
+    keep = [
+        api.create_function(handle, "double", 1, lambda x: x * 2, True, errors.append),
+        api.create_aggregate(handle, "mysum", 1, Sum, False, errors.append),
+        api.create_window_function(handle, "wsum", 1, Sum, False, errors.append),
+        api.create_collation(handle, "reverse", lambda a, b: (a < b) - (a > b), errors.append),
+    ]
+    run("CREATE TABLE test(x); INSERT INTO test VALUES (1), (2), (3)")
+    assert run("SELECT double(x) FROM test") == [[b"2"], [b"4"], [b"6"]]
+    assert run("SELECT mysum(x) FROM test") == [[b"6"]]
+    assert run(
+        "SELECT wsum(x) OVER (ORDER BY x ROWS BETWEEN 1 PRECEDING AND CURRENT ROW) FROM test"
+    ) == [[b"1"], [b"3"], [b"5"]]
+    assert run("SELECT x FROM test ORDER BY CAST(x AS TEXT) COLLATE reverse") == [
+        [b"3"], [b"2"], [b"1"]
+    ]
+    assert errors == []
+    del keep
+    lib.sqlite3_close(ctypes.c_void_p(handle))
+
+
+def test_detect_types():
+    sqlite3.register_converter("point", lambda b: tuple(map(float, b.split(b";"))))
+    con = sqlite3_qt.connect(
+        ":memory:", detect_types=sqlite3_qt.PARSE_DECLTYPES | sqlite3_qt.PARSE_COLNAMES
+    )
+    con.execute("CREATE TABLE test(p point, d date, x)")
+    con.execute("INSERT INTO test VALUES('1;2', '2020-01-02', '3;4')")
+    con.execute("INSERT INTO test VALUES(NULL, NULL, NULL)")
+    cur = con.execute('SELECT p, d, x AS "x [point]", x FROM test')
+    assert cur.fetchall() == [
+        ((1.0, 2.0), datetime.date(2020, 1, 2), (3.0, 4.0), "3;4"),
+        (None, None, None, None),
+    ]
+    assert [d[:2] for d in cur.description] == [
+        ("p", "point"), ("d", "date"), ("x", None), ("x", None)
+    ]
+
+    # renamed columns are not converted by the declared type of another column
+    con.execute("CREATE TABLE swap(d date, n integer)")
+    con.execute("INSERT INTO swap VALUES('2020-01-02', 5)")
+    row = con.execute("SELECT n AS d, d AS n FROM swap").fetchone()
+    # the date is converted only if sqlite3_column_decltype() is accessible
+    assert row in [(5, "2020-01-02"), (5, datetime.date(2020, 1, 2))]
+
+    # the declared types are looked up again after a schema change
+    con.execute("ALTER TABLE test RENAME COLUMN x TO y")
+    con.execute("ALTER TABLE test ADD COLUMN x point")
+    con.execute("UPDATE test SET x = '5;6' WHERE p IS NULL")
+    assert con.execute("SELECT x FROM test").fetchall() == [(None,), ((5.0, 6.0),)]
+    con.close()
+
+
+def test_placeholders():
+    con = sqlite3_qt.connect(":memory:")
+    assert con.execute("SELECT ?2, ?1, ?2", (1, 2)).fetchone() == (2, 1, 2)
+    assert con.execute("SELECT :a, @b, $c, :a", {"a": 1, "b": 2, "c": 3, "d": 4}).fetchone() == (
+        1, 2, 3, 1
+    )
+    assert con.execute("SELECT ':a', ?, :b", (1, 2)).fetchone() == (":a", 1, 2)
+    with pytest.raises(sqlite3_qt.ProgrammingError, match="binding parameter :b"):
+        con.execute("SELECT :a, :b", {"a": 1})
+    with pytest.raises(sqlite3_qt.ProgrammingError, match="Binding 1 has no name"):
+        con.execute("SELECT ?", {"a": 1})
+    with pytest.raises(sqlite3_qt.ProgrammingError, match="uses 2, and there are 1 supplied"):
+        con.execute("SELECT ?, ?", (1,))
+
+    con.execute("CREATE TABLE test(x, y)")
+    con.executemany(
+        "INSERT INTO test VALUES(:x, :y + :x)", [{"x": 1, "y": 2}, {"y": 3, "x": 4}]
+    )
+    assert con.execute("SELECT * FROM test").fetchall() == [(1, 3), (4, 7)]
+    with pytest.raises(sqlite3_qt.ProgrammingError):
+        con.executemany("INSERT INTO test VALUES(?, ?)", [(1, 2), (3,)])
+    con.close()
+
+
+def test_executemany_rowcount():
+    con = sqlite3_qt.connect(":memory:")
+    con.execute("CREATE TABLE test(x)")
+    con.execute("CREATE TABLE log(x)")
+    con.execute(
+        "CREATE TRIGGER t AFTER UPDATE ON test BEGIN INSERT INTO log VALUES(new.x); END"
+    )
+    cur = con.cursor()
+    cur.batchsize = 2
+    cur.executemany("INSERT INTO test VALUES(?)", ((i % 2,) for i in range(5)))
+    assert cur.rowcount == 5
+    cur.executemany("UPDATE test SET x = x + 10 WHERE x = ?", [(0,), (1,), (2,)])
+    assert cur.rowcount == 5
+    assert con.execute("SELECT count(*) FROM log").fetchone() == (5,)
+
+    for sql in ("SELECT ?", "INSERT INTO test VALUES(?) RETURNING x", "PRAGMA user_version"):
+        with pytest.raises(sqlite3_qt.ProgrammingError, match="only execute DML"):
+            cur.executemany(sql, [(1,)] if "?" in sql else [()])
+    cur.executemany("INSERT INTO test VALUES('returning')", [()])
+    assert cur.rowcount == 1
+    con.close()
+
+
+def test_scroll():
+    con = sqlite3_qt.connect(":memory:")
+    con.execute("CREATE TABLE test(x)")
+    con.executemany("INSERT INTO test VALUES(?)", [(i,) for i in range(10)])
+
+    cur = con.cursor()
+    cur.forward_only = False
+    cur.execute("SELECT x FROM test ORDER BY x")
+    assert cur.rownumber == 0
+    assert cur.fetch_window(6, 2) == [(6,), (7,)]
+    assert cur.rownumber == 8
+    assert cur.fetch_window(2, 3) == [(2,), (3,), (4,)]
+    assert cur.fetch_window(8, 5) == [(8,), (9,)] and cur.fetch_window(12, 5) == []
+    cur.scroll(-4)
+    assert cur.rownumber == 6 and cur.fetchone() == (6,)
+    cur.scroll(0, "absolute")
+    assert cur.fetchone() == (0,)
+    with pytest.raises(IndexError):
+        cur.scroll(11, "absolute")
+    assert cur.rownumber == 1
+    cur.scroll(10, "absolute")
+    assert cur.fetchone() is None and cur.rownumber == 10
+
+    cur = con.execute("SELECT x FROM test ORDER BY x")
+    cur.scroll(3)
+    assert cur.rownumber == 3 and cur.fetchone() == (3,)
+    with pytest.raises(sqlite3_qt.NotSupportedError):
+        cur.scroll(-1)
+    assert cur.fetch_window(8, 5) == [(8,), (9,)]
+    assert cur.rownumber is None
+    with pytest.raises(IndexError):
+        cur.scroll(1)
+    con.close()
@@ -0,0 +1,64 @@
+from sqlite3_qt.qt_compat import QtCore
+from sqlite3_qt.executor import QueryExecutor
+
+app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def wait_for(*signals):
+    loop = QtCore.QEventLoop()
+    for signal in signals:
+        signal.connect(loop.quit)
+    QtCore.QTimer.singleShot(5000, loop.quit)
+    loop.exec()
+    for signal in signals:
+        signal.disconnect(loop.quit)
+
+
+def test_executor():
+    executor = QueryExecutor(":memory:", batch_size=100)
+    batches, finished, errors = [], [], []
+    executor.rowsReady.connect(batches.append)
+    executor.finished.connect(finished.append)
+    executor.error.connect(errors.append)
+
+    executor.execute("CREATE TABLE test(x)")
+    wait_for(executor.finished)
+    executor.execute(
+        "INSERT INTO test "
+        "WITH RECURSIVE r(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM r WHERE i < 249) "
+        "SELECT i FROM r"
+    )
+    wait_for(executor.finished)
+    executor.execute("SELECT x FROM test")
+    wait_for(executor.finished)
+
+    assert finished == [-1, 250, 250]
+    assert [len(b) for b in batches] == [100, 100, 50]
+    assert [row for b in batches for row in b] == [(i,) for i in range(250)]
+
+    executor.execute("SELECT * FROM missing")
+    wait_for(executor.error)
+    assert len(errors) == 1
+
+    executor.cancel()
+    executor.execute("SELECT x FROM test")
+    wait_for(executor.finished, executor.error)
+    assert finished[-1] == 250
+
+    executor.close()
+    assert not executor.isRunning()
+
+
+def test_cancel_idle():
+    executor = QueryExecutor(":memory:")
+    events = []
+    executor.finished.connect(lambda n: events.append(("finished", n)))
+    executor.error.connect(lambda e: events.append(("error", e)))
+
+    executor.execute("SELECT 1")
+    wait_for(executor.finished)
+    executor.cancel()
+    executor.execute("SELECT 1 UNION ALL SELECT 2")
+    wait_for(executor.finished, executor.error)
+    assert events == [("finished", 1), ("finished", 2)]
+    executor.close()
@@ -1,3 +1,4 @@
+import os
 import sqlite3
 import sqlite3_qt
 
@@ -175,3 +176,312 @@ def test_9():
         return res
 
     return op()
+
+
+def test_10():
+    @compare_modules
+    def op(module=None):
+        con = module.connect(":memory:")
+        cur = con.cursor()
+        res = [cur.description]
+        cur.execute("CREATE TABLE movie(title, year, score)")
+        res.append(cur.description)
+        cur.execute("SELECT title, year AS y FROM movie")
+        res.append(cur.description)
+        con.close()
+        return res
+
+    return op()
+
+
+def test_11():
+    @compare_modules
+    def op(module=None):
+        con = module.connect(":memory:")
+        cur = con.cursor()
+        cur.execute("CREATE TABLE test(x)")
+        cur.executemany("INSERT INTO test VALUES(?)", [(i,) for i in range(5)])
+        cur.execute("SELECT x FROM test")
+        res = [cur.fetchmany(2), cur.fetchone(), cur.fetchmany(5), cur.fetchone()]
+        res.append(cur.description)
+        con.close()
+        return res
+
+    return op()
+
+
+def test_12():
+    @compare_modules
+    def op(module=None):
+        con = module.connect(":memory:")
+        con.row_factory = module.Row
+        cur = con.cursor()
+        cur.execute("CREATE TABLE movie(title, year, score)")
+        cur.execute("INSERT INTO movie VALUES('Monty Python', 1975, 8.2)")
+        row = cur.execute("SELECT title, year AS Year, score FROM movie").fetchone()
+        res = [
+            row.keys(),
+            tuple(row),
+            len(row),
+            row[0],
+            row["YEAR"],
+            row["Score"],
+            row[1:],
+            row == cur.execute("SELECT title, year AS Year, score FROM movie").fetchone(),
+            row == cur.execute("SELECT title, year, score FROM movie").fetchone(),
+            dict(zip(row.keys(), row)),
+        ]
+        try:
+            row["missing"]
+        except IndexError as e:
+            res.append(str(e))
+        con.close()
+        return res
+
+    return op()
+
+
+@mark.skipif(QT_API=='PySide2', reason='PySide2 does not support value binding.')
+def test_13():
+    @compare_modules
+    def op(module=None):
+        con = module.connect(":memory:")
+        cur = con.cursor()
+        cur.execute("CREATE TABLE test(a, b, c)")
+        data = [(None, "", b"\x00\x01"), (1, None, 2.5), ("x", b"", None)]
+        for params in data:
+            cur.execute("INSERT INTO test VALUES(?, ?, ?)", params)
+        res = [cur.execute("SELECT * FROM test").fetchone()]
+        res.append(cur.fetchmany(1))
+        res.append(cur.fetchall())
+        res.append([row for row in cur.execute("SELECT * FROM test")])
+        con.close()
+        return res
+
+    return op()
+
+
+def test_14():
+    @compare_modules
+    def op(module=None):
+        con = module.connect(":memory:")
+        cur = con.cursor()
+        if module is sqlite3_qt:
+            cur.batchsize = 3
+        cur.execute("CREATE TABLE test(x, y)")
+        cur.executemany("INSERT INTO test VALUES(?, ?)", ((i, -i) for i in range(10)))
+        res = [cur.rowcount]
+        cur.executemany("INSERT INTO test VALUES(:a, :b)", iter([{"a": 1, "b": 2}]))
+        res.append(cur.rowcount)
+        cur.executemany("UPDATE test SET y = ? WHERE x < ?", [(0, 5), (1, 2)])
+        res.append(cur.rowcount)
+        cur.executemany("INSERT INTO test VALUES(?, ?)", [])
+        res.append(cur.rowcount)
+        res.append(cur.execute("SELECT * FROM test").fetchall())
+        res.append(con.total_changes)
+        con.close()
+        return res
+
+    return op()
+
+
+@mark.skipif(QT_API=='PySide2', reason='PySide2 does not support value binding.')
+def test_15():
+    class Point:
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+
+    class Conforming:
+        def __conform__(self, protocol):
+            return "conformed"
+
+    sqlite3.register_adapter(Point, lambda p: f"{p.x};{p.y}")
+    try:
+
+        @compare_modules
+        def op(module=None):
+            con = module.connect(":memory:")
+            cur = con.cursor()
+            cur.execute("CREATE TABLE test(a, b)")
+            data = [
+                (b"\x00\x01", bytearray(b"\x02")),
+                (memoryview(b"\x03\x04"), None),
+                (Point(1, 2), Conforming()),
+                (True, 1.5),
+            ]
+            cur.executemany("INSERT INTO test VALUES(?, ?)", data)
+            cur.execute("INSERT INTO test VALUES(?, ?)", (Point(3, 4), b""))
+            res = cur.execute("SELECT a, b, typeof(a), typeof(b) FROM test").fetchall()
+            try:
+                cur.execute("INSERT INTO test VALUES(?, ?)", (1, object()))
+            except module.ProgrammingError:
+                res.append("unsupported")
+            con.close()
+            return res
+
+        op()
+    finally:
+        del sqlite3.adapters[(Point, sqlite3.PrepareProtocol)]
+
+
+@mark.skipif(QT_API=='PySide2', reason='PySide2 does not support value binding.')
+def test_16():
+    @compare_modules
+    def op(module=None):
+        con = module.connect(":memory:")
+        con.execute("CREATE TABLE test(b)")
+        con.execute("INSERT INTO test VALUES(?)", (bytes(range(10)),))
+        res = []
+        with con.blobopen("test", "b", 1) as blob:
+            res.append(len(blob))
+            res.append(blob.read(3))
+            blob.seek(-2, os.SEEK_END)
+            res.append((blob.tell(), blob.read(), blob.read()))
+            blob.seek(1)
+            blob.write(b"\xff\xfe")
+            res.append((blob[0], blob[-1], blob[2:5], blob[::3], blob[1:9:3]))
+            blob[0] = 100
+            blob[7:10] = b"abc"
+            blob[::4] = b"xyz"
+            for exc, func in [
+                (ValueError, lambda: blob.write(bytes(20))),
+                (ValueError, lambda: blob.seek(11)),
+                (IndexError, lambda: blob[10]),
+                (IndexError, lambda: blob.__setitem__(slice(0, 2), b"a")),
+            ]:
+                try:
+                    func()
+                except exc as e:
+                    res.append(str(e))
+        res.append(con.execute("SELECT b FROM test").fetchone())
+        try:
+            con.blobopen("test", "b", 2)
+        except module.OperationalError as e:
+            res.append(str(e))
+        with con.blobopen("test", "b", 1, readonly=True) as blob:
+            try:
+                blob.write(b"a")
+            except module.OperationalError as e:
+                res.append(str(e))
+        con.close()
+        return res
+
+    return op()
+
+
+def test_17(tmp_path):
+    @compare_modules
+    def op(module=None):
+        path = tmp_path / f"{module.__name__}.db"
+        con = module.connect(path)
+        other = module.connect(path)
+        count = "SELECT count(*) FROM test"
+        res = [con.isolation_level, con.in_transaction]
+        con.execute("CREATE TABLE test(x)")
+        res.append(con.in_transaction)
+        con.execute("INSERT INTO test VALUES(1)")
+        res.append((con.in_transaction, other.execute(count).fetchone()))
+        con.commit()
+        res.append((con.in_transaction, other.execute(count).fetchone()))
+        con.execute("INSERT INTO test VALUES(2)")
+        con.rollback()
+        res.append((con.in_transaction, con.execute(count).fetchone()))
+        try:
+            with con:
+                con.execute("INSERT INTO test VALUES(3)")
+                raise KeyError
+        except KeyError:
+            pass
+        with con:
+            con.execute("INSERT INTO test VALUES(4)")
+        res.append((con.in_transaction, other.execute(count).fetchone()))
+        con.execute("SAVEPOINT a")
+        con.execute("INSERT INTO test VALUES(5)")
+        con.execute('SAVEPOINT "B"')
+        con.execute("INSERT INTO test VALUES(6)")
+        con.execute("ROLLBACK TO b")
+        res.append(con.in_transaction)
+        con.execute("RELEASE SAVEPOINT a")
+        res.append((con.in_transaction, other.execute(count).fetchone()))
+        con.execute("INSERT INTO test VALUES(7)")
+        con.isolation_level = None
+        res.append((con.in_transaction, other.execute(count).fetchone()))
+        con.execute("BEGIN IMMEDIATE")
+        res.append(con.in_transaction)
+        con.execute("INSERT INTO test VALUES(8)")
+        con.execute("END")
+        res.append((con.in_transaction, other.execute(count).fetchone()))
+        for value in ("immediate", "bogus", 1):
+            try:
+                con.isolation_level = value
+            except (TypeError, ValueError) as e:
+                res.append(str(e))
+        res.append(con.isolation_level)
+        other.close()
+        con.close()
+        return res
+
+    return op()
+
+
+def test_18():
+    script = """
+        -- comment; with a semicolon
+        CREATE TABLE test(x, "y;z" TEXT);
+        CREATE TABLE log(x);
+        /* block; comment
+           DROP TABLE test; */
+        CREATE TRIGGER tr AFTER INSERT ON test BEGIN
+            INSERT INTO log VALUES(new.x); INSERT INTO log VALUES(new.x * 10);
+        END;
+        INSERT INTO test VALUES(1, 'a -- b; c');;
+        INSERT INTO test VALUES(2, 'it''s; [not] "quoted"');
+        CREATE TABLE dropped(x);
+        DROP TABLE dropped;
+        INSERT INTO test VALUES(3, NULL) -- no semicolon
+    """
+
+    @compare_modules
+    def op(module=None):
+        con = module.connect(":memory:")
+        con.executescript(script)
+        res = [
+            con.execute("SELECT * FROM test").fetchall(),
+            con.execute("SELECT * FROM log").fetchall(),
+            con.execute("SELECT name FROM sqlite_master").fetchall(),
+        ]
+        try:
+            con.executescript("INSERT INTO log VALUES(4); INSERT INTO nowhere VALUES(5);")
+        except module.DatabaseError:
+            res.append("error")
+        res.append(con.execute("SELECT count(*) FROM log").fetchone())
+        con.close()
+        return res
+
+    return op()
+
+
+def test_19():
+    @compare_modules
+    def op(module=None):
+        con = module.connect(":memory:")
+        res = []
+        con.set_trace_callback(res.append)
+        con.execute("CREATE TABLE test(x, y)")
+        con.execute("INSERT INTO test VALUES(?, ?)", (1, "it's"))
+        con.execute("INSERT INTO test VALUES(:x, :y)", {"x": 2.5, "y": b"\x01\xff"})
+        con.executemany("INSERT INTO test VALUES(?, '?')", [(3,), (None,)])
+        con.commit()
+        con.execute("SELECT * FROM test WHERE x > ? -- ?", (0,)).fetchall()
+
+        def fail(sql):
+            raise ValueError
+
+        con.set_trace_callback(fail)
+        res.append(con.execute("SELECT 1").fetchone())
+        con.set_trace_callback(None)
+        con.execute("SELECT 2")
+        con.close()
+        return res
+
+    return op()
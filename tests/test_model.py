@@ -0,0 +1,123 @@
+import pytest
+
+import sqlite3_qt
+from sqlite3_qt.qt_compat import QtCore
+from sqlite3_qt.model import CursorTableModel
+
+app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+@pytest.fixture
+def con():
+    con = sqlite3_qt.connect(":memory:")
+    con.execute("CREATE TABLE test(id INTEGER PRIMARY KEY, name TEXT)")
+    con.executemany("INSERT INTO test VALUES (?, ?)", ((i, f"row {i}") for i in range(1, 1001)))
+    yield con
+    con.close()
+
+
+def fetch_all(model):
+    while model.canFetchMore():
+        model.fetchMore()
+
+
+@pytest.mark.parametrize("key", ["id", None])
+def test_model(con, key):
+    model = CursorTableModel(
+        con.cursor(),
+        "SELECT id, name FROM test WHERE id > ? ORDER BY id",
+        (10,),
+        key=key,
+        block_size=100,
+        max_blocks=3,
+    )
+    assert model.rowCount() == 0 and model.columnCount() == 2
+    assert model.headerData(1, QtCore.Qt.Orientation.Horizontal) == "name"
+    model.fetchMore()
+    assert model.rowCount() == 100
+    assert model.data(model.index(0, 1)) == "row 11"
+
+    fetch_all(model)
+    assert model.rowCount() == 990
+    assert len(model.blocks()) == 3
+    assert model.data(model.index(989, 0)) == 1000
+    assert model.requeries == 0
+
+    # scroll back to the start: the first block was dropped and is queried again
+    assert model.data(model.index(150, 0)) == 161
+    assert model.requeries == 1
+    assert model.data(model.index(199, 1)) == "row 210"
+    assert model.requeries == 1
+    assert list(model.blocks()) == [8, 9, 1]
+
+
+def test_model_named(con):
+    model = CursorTableModel(
+        con.cursor(),
+        "SELECT id, name FROM test WHERE id <= :n ORDER BY id",
+        {"n": 250},
+        key="id",
+        block_size=50,
+        max_blocks=2,
+    )
+    fetch_all(model)
+    assert model.rowCount() == 250
+    assert [model.data(model.index(r, 0)) for r in (0, 120, 249)] == [1, 121, 250]
+
+    with pytest.raises(ValueError):
+        CursorTableModel(con.cursor(), "SELECT id FROM test", key="name")
+
+
+@pytest.mark.parametrize("key", ["id", None])
+def test_model_rows_deleted(con, key):
+    model = CursorTableModel(
+        con.cursor(), "SELECT id, name FROM test ORDER BY id", key=key, block_size=100, max_blocks=1
+    )
+    resets = []
+    model.modelReset.connect(lambda: resets.append(model.rowCount()))
+    fetch_all(model)
+    assert model.rowCount() == 1000
+
+    # a block queried again is shorter than the rows of the model
+    con.execute("DELETE FROM test WHERE id > 850")
+    assert model.data(model.index(840, 0)) == 841
+    assert model.data(model.index(860, 0)) is None
+    assert model.data(model.index(899, 1)) is None
+    assert resets == []
+
+    app.processEvents()
+    assert resets == [0]
+    fetch_all(model)
+    assert model.rowCount() == 850
+    assert model.data(model.index(849, 0)) == 850
+
+
+def test_model_lock(tmp_path):
+    path = tmp_path / "test.db"
+    con = sqlite3_qt.connect(path, timeout=0)
+    con.execute("CREATE TABLE test(id INTEGER PRIMARY KEY)")
+    con.executemany("INSERT INTO test VALUES (?)", ((i,) for i in range(1, 301)))
+    con.commit()
+    writer = sqlite3_qt.connect(path, timeout=0)
+    insert = "INSERT INTO test VALUES (NULL)"
+
+    model = CursorTableModel(con.cursor(), "SELECT id FROM test ORDER BY id", block_size=100)
+    model.fetchMore()
+    writer.execute(insert)
+    with pytest.raises(sqlite3_qt.OperationalError, match="locked"):
+        writer.commit()  # the pending statement holds a read lock
+    writer.rollback()
+    fetch_all(model)
+    assert model.rowCount() == 300
+    writer.execute(insert)
+    writer.commit()
+
+    model.refresh()
+    model.fetchMore()
+    model.close()
+    assert model.rowCount() == 100 and not model.canFetchMore()
+    writer.execute(insert)
+    writer.commit()
+    assert model.data(model.index(99, 0)) == 100
+    writer.close()
+    con.close()
@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+from sqlite3_qt import OperationalError
+from sqlite3_qt.pool import ConnectionPool
+
+
+def test_reuse():
+    pool = ConnectionPool(prepare=["SELECT 1"])
+    with pool.connection(":memory:") as con:
+        assert con.statement_cache_info().currsize == 1
+        con.execute("SELECT 1")
+    with pool.connection(":memory:") as con2:
+        assert con2 is con
+        assert con2.statement_cache_info().hits == 1
+    with pool.connection(":memory:", timeout=1.0) as con3:  # connect() option
+        assert con3 is not con
+
+    stats = pool.stats()
+    assert (stats.open, stats.idle, stats.in_use) == (2, 2, 0)
+    assert stats.checkouts == stats.checkins == 3
+    pool.close()
+    assert pool.stats().open == 0
+
+
+def test_threads():
+    pool = ConnectionPool(max_size=2)
+    owners = {}
+
+    def task(i):
+        with pool.connection(":memory:") as con:
+            owners[i] = con.qt_name
+            con.execute("SELECT 1").fetchall()
+            assert pool.stats().open >= 1
+
+    threads = [threading.Thread(target=task, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # each thread opened its own connection, which was closed at thread exit
+    assert len(set(owners.values())) == 4
+    assert pool.stats().open == 0
+    assert pool.stats().checkouts == 4
+
+
+def test_max_size():
+    pool = ConnectionPool(max_size=1)
+    con = pool.acquire(":memory:")
+    with pytest.raises(OperationalError):
+        pool.acquire(":memory:", wait=0.01)
+    pool.release(con)
+    pool.close()
+
+
+
+def test_close_failure():
+    pool = ConnectionPool(max_size=2)
+    con = pool.acquire(":memory:")
+    con2 = pool.acquire(":memory:")
+    pool.release(con)
+    pool.release(con2)
+
+    def fail():
+        raise OperationalError("cannot close")
+
+    con._remove = fail
+    with pytest.raises(OperationalError, match="cannot close"):
+        pool.close()
+    # the slot of the failed connection is freed, and the other connection is closed
+    assert pool.stats().open == pool.stats().idle == 0
+    assert not con2.qt_database.isOpen()
+
+def test_idle_timeout_other_thread():
+    pool = ConnectionPool(max_size=1, idle_timeout=0.1)
+    released, done = threading.Event(), threading.Event()
+
+    def worker():
+        with pool.connection(":memory:"):
+            pass
+        released.set()
+        done.wait(5)  # stays alive with an idle connection
+
+    t = threading.Thread(target=worker)
+    t.start()
+    released.wait(5)
+    # the idle connection of the worker expires and frees its slot
+    con = pool.acquire(":memory:", wait=2.0)
+    assert pool.stats().open == 1
+    pool.release(con)
+    done.set()
+    t.join()
+    pool.close()
+    assert pool.stats().open == 0